@@ -13,10 +13,18 @@ import plotly.graph_objects as go
 import plotly.express as px
 from plotly.subplots import make_subplots
 import numpy as np
-import yfinance as yf
 from datetime import datetime, timedelta
 import requests
+import io
 import json
+from concurrent.futures import ProcessPoolExecutor
+
+from indicators import TALIB_AVAILABLE, IndicatorCache
+from signals import evaluate_rules, signal_frame, signal_stats
+from screener import SCREEN_RULES, scan_universe
+from backtest import (STRATEGIES, heatmap, parameter_sets, run_backtest, run_event_backtest, search_parameters,
+                      stitch_walk_forward, walk_forward)
+from market_data import HealthMonitor, HistoryCache, OHLCVStore, get_provider
 
 # Try to import scipy, fallback if not available
 try:
@@ -26,13 +34,9 @@ except ImportError:
     SCIPY_AVAILABLE = False
     st.warning("SciPy not available. Some advanced features may be limited.")
 
-# Try to import TA-Lib, fallback to manual implementation if not available
-try:
-    import talib
-    TALIB_AVAILABLE = True
-except ImportError:
-    TALIB_AVAILABLE = False
-    st.warning("TA-Lib not available. Using simplified technical indicators.")
+# The shared indicator library uses TA-Lib when it is installed
+if not TALIB_AVAILABLE:
+    st.warning("TA-Lib not available. Using NumPy technical indicators.")
 
 # Custom CSS for advanced styling
 st.markdown("""
@@ -155,225 +159,141 @@ if 'watchlist' not in st.session_state:
     st.session_state.watchlist = []
 if 'learning_progress' not in st.session_state:
     st.session_state.learning_progress = {}
+if 'screener_results' not in st.session_state:
+    st.session_state.screener_results = None
 
-# Manual technical indicators implementation (fallback)
-def calculate_rsi(prices, period=14):
-    """Calculate RSI manually"""
-    deltas = np.diff(prices)
-    gains = np.where(deltas > 0, deltas, 0)
-    losses = np.where(deltas < 0, -deltas, 0)
-    
-    avg_gains = pd.Series(gains).rolling(window=period).mean()
-    avg_losses = pd.Series(losses).rolling(window=period).mean()
-    
-    rs = avg_gains / avg_losses
-    rsi = 100 - (100 / (1 + rs))
-    return rsi
-
-def calculate_sma(prices, period):
-    """Calculate Simple Moving Average"""
-    return pd.Series(prices).rolling(window=period).mean()
-
-def calculate_ema(prices, period):
-    """Calculate Exponential Moving Average"""
-    return pd.Series(prices).ewm(span=period).mean()
-
-def calculate_macd(prices, fast=12, slow=26, signal=9):
-    """Calculate MACD manually"""
-    ema_fast = calculate_ema(prices, fast)
-    ema_slow = calculate_ema(prices, slow)
-    macd_line = ema_fast - ema_slow
-    signal_line = calculate_ema(macd_line, signal)
-    histogram = macd_line - signal_line
-    return macd_line, signal_line, histogram
-
-def calculate_bollinger_bands(prices, period=20, std_dev=2):
-    """Calculate Bollinger Bands"""
-    sma = calculate_sma(prices, period)
-    std = pd.Series(prices).rolling(window=period).std()
-    upper_band = sma + (std * std_dev)
-    lower_band = sma - (std * std_dev)
-    return upper_band, sma, lower_band
-
-def calculate_stochastic(high, low, close, k_period=14, d_period=3):
-    """Calculate Stochastic Oscillator"""
-    lowest_low = pd.Series(low).rolling(window=k_period).min()
-    highest_high = pd.Series(high).rolling(window=k_period).max()
-    
-    k_percent = 100 * ((close - lowest_low) / (highest_high - lowest_low))
-    d_percent = calculate_sma(k_percent, d_period)
-    
-    return k_percent, d_percent
-
-def calculate_obv(close, volume):
-    """Calculate On-Balance Volume"""
-    obv = [0]
-    for i in range(1, len(close)):
-        if close[i] > close[i-1]:
-            obv.append(obv[-1] + volume[i])
-        elif close[i] < close[i-1]:
-            obv.append(obv[-1] - volume[i])
-        else:
-            obv.append(obv[-1])
-    return pd.Series(obv)
+# Market data source (Yahoo Finance, or recorded data when STOCKS_DATA_PROVIDER=replay)
+@st.cache_resource
+def get_market_data_provider():
+    return get_provider()
+
+# One max-range series per symbol shared by every session in this server process,
+# backed by the persistent OHLCV store
+@st.cache_resource
+def get_history_cache():
+    return HistoryCache(OHLCVStore(), get_market_data_provider().history, ttl=300)  # Refresh every 5 minutes
 
 # Real-time stock data function
-@st.cache_data(ttl=300)  # Cache for 5 minutes
-def get_stock_data(symbol, period="1y"):
+def get_price_history(symbol, period="1y"):
     try:
         # Clean the symbol
         symbol = symbol.strip().upper()
         
-        # Create ticker object
-        stock = yf.Ticker(symbol)
+        # Every period is a zero-copy slice of the cached full history
+        hist = get_history_cache().get(symbol, period)
+        if hist is None or hist.empty:
+            st.error(f"No data found for {symbol}. Please check the symbol.")
+            return None
         
-        # Get historical data with better error handling
-        try:
-            hist = stock.history(period=period, progress=False)
-            if hist.empty:
-                st.error(f"No data found for {symbol}. Please check the symbol.")
-                return None, None
-        except Exception as e:
-            st.error(f"Error fetching historical data for {symbol}: {str(e)}")
-            return None, None
-        
-        # Get stock info with error handling
-        try:
-            info = stock.info
-            if not info or len(info) < 5:  # Basic validation
-                info = {}
-        except Exception as e:
-            st.warning(f"Could not fetch detailed info for {symbol}: {str(e)}")
-            info = {}
-        
-        return hist, info
+        return hist
     except Exception as e:
-        st.error(f"Error with {symbol}: {str(e)}")
-        return None, None
+        st.error(f"Error fetching historical data for {symbol}: {str(e)}")
+        return None
 
-# Technical indicators calculation
-def calculate_technical_indicators(df):
+# Stock info is the slowest endpoint and rarely changes intraday
+@st.cache_data(ttl=86400)  # Cache for a day
+def get_stock_info(symbol):
+    try:
+        return get_market_data_provider().info(symbol.strip().upper())
+    except Exception as e:
+        st.warning(f"Could not fetch detailed info for {symbol}: {str(e)}")
+        return {}
+
+# Batched quotes for the portfolio valuation
+@st.cache_data(ttl=300)
+def get_last_prices(symbols):
+    try:
+        return get_market_data_provider().last_prices(symbols)
+    except Exception as e:
+        st.error(f"Error fetching quotes: {str(e)}")
+        return {}
+
+# Indicator columns computed once per symbol, bar and parameter set for every session
+@st.cache_resource
+def get_indicator_cache():
+    return IndicatorCache()
+
+# Worker processes for the screener and the strategy optimizer, shared by every session
+@st.cache_resource
+def get_process_pool():
+    return ProcessPoolExecutor()
+
+DEFAULT_UNIVERSE = "AAPL MSFT GOOGL AMZN NVDA META TSLA BRK-B JPM V JNJ WMT PG MA HD XOM CVX KO PEP COST"
+
+def read_ticker_list(uploaded):
+    """Tickers from an uploaded text file, or from the Symbol column of a CSV"""
+    text = uploaded.getvalue().decode("utf-8", errors="ignore")
+    header = [name.strip().lower() for name in text.split("\n", 1)[0].split(",")]
+    if 'symbol' in header:
+        table = pd.read_csv(io.StringIO(text))
+        return table.iloc[:, header.index('symbol')].dropna().astype(str).tolist()
+    return text.replace(",", " ").split()
+
+def screener_view(results, only_matches):
+    """Screener rows to display, optionally only those matching at least one rule"""
+    if only_matches and not results.empty:
+        return results[results['matches'] > 0]
+    return results
+
+# Technical indicators calculation: a separate indicator frame on the price index,
+# so the cached history is shared read-only and never copied or modified
+def calculate_technical_indicators(symbol, df, columns=None):
     if df is None or df.empty:
-        return df
+        return pd.DataFrame()
     
     # Ensure we have the required columns
     required_columns = ['Open', 'High', 'Low', 'Close', 'Volume']
     if not all(col in df.columns for col in required_columns):
         st.error("Missing required price data columns")
-        return df
+        return pd.DataFrame(index=df.index)
     
     # Check if we have enough data points
     if len(df) < 50:
         st.warning(f"Limited data points ({len(df)}). Some indicators may not be accurate.")
     
     try:
-        prices = df['Close'].values
-        high = df['High'].values
-        low = df['Low'].values
-        volume = df['Volume'].values
-        
-        if TALIB_AVAILABLE:
-            # Use TA-Lib if available
-            df['RSI'] = talib.RSI(prices, timeperiod=14)
-            df['SMA_20'] = talib.SMA(prices, timeperiod=20)
-            df['SMA_50'] = talib.SMA(prices, timeperiod=50)
-            df['EMA_12'] = talib.EMA(prices, timeperiod=12)
-            df['EMA_26'] = talib.EMA(prices, timeperiod=26)
-            df['MACD'], df['MACD_Signal'], df['MACD_Hist'] = talib.MACD(prices)
-            df['BB_Upper'], df['BB_Middle'], df['BB_Lower'] = talib.BBANDS(prices)
-            df['STOCH_K'], df['STOCH_D'] = talib.STOCH(high, low, prices)
-            df['OBV'] = talib.OBV(prices, volume)
-        else:
-            # Use manual implementation
-            df['RSI'] = calculate_rsi(prices, 14)
-            df['SMA_20'] = calculate_sma(prices, 20)
-            df['SMA_50'] = calculate_sma(prices, 50)
-            df['EMA_12'] = calculate_ema(prices, 12)
-            df['EMA_26'] = calculate_ema(prices, 26)
-            df['MACD'], df['MACD_Signal'], df['MACD_Hist'] = calculate_macd(prices)
-            df['BB_Upper'], df['BB_Middle'], df['BB_Lower'] = calculate_bollinger_bands(prices)
-            df['STOCH_K'], df['STOCH_D'] = calculate_stochastic(high, low, prices)
-            df['OBV'] = calculate_obv(prices, volume)
-        
-        return df
+        # Shared indicator library (TA-Lib when available, NumPy kernels otherwise)
+        return get_indicator_cache().frame(symbol, df, columns)
     except Exception as e:
         st.error(f"Error calculating technical indicators: {str(e)}")
-        return df
+        return pd.DataFrame(index=df.index)
+
+# Indicator columns each consumer reads, so only those are computed
+CHART_COLUMNS = ['SMA_20', 'SMA_50', 'RSI', 'MACD', 'MACD_Signal', 'MACD_Hist']
+AI_ANALYSIS_COLUMNS = ['RSI', 'SMA_20', 'SMA_50', 'MACD', 'MACD_Signal', 'BB_Upper', 'BB_Lower', 'Volume_Ratio']
+
+# AI-powered analysis: text for the last bar of the full-history signal arrays
+SIGNAL_MESSAGES = {
+    'rsi_overbought': "RSI indicates overbought conditions (>70)",
+    'rsi_oversold': "RSI indicates oversold conditions (<30)",
+    'rsi_neutral': "RSI is neutral at {rsi:.1f}",
+    'strong_uptrend': "Strong uptrend: Price above 20-day and 50-day SMAs",
+    'strong_downtrend': "Strong downtrend: Price below 20-day and 50-day SMAs",
+    'trend_reversal': "Potential trend reversal: Price above 20-day SMA but below 50-day SMA",
+    'macd_bullish': "MACD bullish: MACD line above signal line",
+    'macd_bearish': "MACD bearish: MACD line below signal line",
+    'above_upper_band': "Price above upper Bollinger Band - potential reversal",
+    'below_lower_band': "Price below lower Bollinger Band - potential bounce",
+    'within_bands': "Price within Bollinger Bands - normal volatility",
+    'high_volume': "High volume - strong conviction in current move",
+    'low_volume': "Low volume - weak conviction in current move",
+    'uptrend_5d': "Recent 5-day uptrend",
+    'downtrend_5d': "Recent 5-day downtrend",
+}
 
-# AI-powered analysis function
-def ai_analysis(df, symbol):
+def ai_analysis(df, ind, symbol):
     if df is None or df.empty:
         return ["Insufficient data for analysis"]
     
     signals = []
     
     try:
-        # RSI Analysis
-        if 'RSI' in df.columns and not df['RSI'].isna().all():
-            current_rsi = df['RSI'].iloc[-1]
-            if not pd.isna(current_rsi):
-                if current_rsi > 70:
-                    signals.append("RSI indicates overbought conditions (>70)")
-                elif current_rsi < 30:
-                    signals.append("RSI indicates oversold conditions (<30)")
-                else:
-                    signals.append(f"RSI is neutral at {current_rsi:.1f}")
-        
-        # Moving Average Analysis
-        current_price = df['Close'].iloc[-1]
-        if 'SMA_20' in df.columns and 'SMA_50' in df.columns:
-            sma_20 = df['SMA_20'].iloc[-1]
-            sma_50 = df['SMA_50'].iloc[-1]
-            
-            if not pd.isna(sma_20) and not pd.isna(sma_50):
-                if current_price > sma_20 > sma_50:
-                    signals.append("Strong uptrend: Price above 20-day and 50-day SMAs")
-                elif current_price < sma_20 < sma_50:
-                    signals.append("Strong downtrend: Price below 20-day and 50-day SMAs")
-                elif current_price > sma_20 and sma_20 < sma_50:
-                    signals.append("Potential trend reversal: Price above 20-day SMA but below 50-day SMA")
-        
-        # MACD Analysis
-        if 'MACD' in df.columns and 'MACD_Signal' in df.columns:
-            macd = df['MACD'].iloc[-1]
-            macd_signal = df['MACD_Signal'].iloc[-1]
-            
-            if not pd.isna(macd) and not pd.isna(macd_signal):
-                if macd > macd_signal:
-                    signals.append("MACD bullish: MACD line above signal line")
-                else:
-                    signals.append("MACD bearish: MACD line below signal line")
-        
-        # Bollinger Bands Analysis
-        if 'BB_Upper' in df.columns and 'BB_Lower' in df.columns:
-            bb_upper = df['BB_Upper'].iloc[-1]
-            bb_lower = df['BB_Lower'].iloc[-1]
-            
-            if not pd.isna(bb_upper) and not pd.isna(bb_lower):
-                if current_price > bb_upper:
-                    signals.append("Price above upper Bollinger Band - potential reversal")
-                elif current_price < bb_lower:
-                    signals.append("Price below lower Bollinger Band - potential bounce")
-                else:
-                    signals.append("Price within Bollinger Bands - normal volatility")
-        
-        # Volume Analysis
-        if len(df) >= 20:
-            avg_volume = df['Volume'].rolling(20).mean().iloc[-1]
-            current_volume = df['Volume'].iloc[-1]
-            
-            if current_volume > avg_volume * 1.5:
-                signals.append("High volume - strong conviction in current move")
-            elif current_volume < avg_volume * 0.5:
-                signals.append("Low volume - weak conviction in current move")
-        
-        # Price trend analysis
-        if len(df) >= 5:
-            recent_prices = df['Close'].tail(5)
-            if recent_prices.iloc[-1] > recent_prices.iloc[0]:
-                signals.append("Recent 5-day uptrend")
-            else:
-                signals.append("Recent 5-day downtrend")
+        # Every rule is evaluated over the whole history; the text describes the last bar
+        last = signal_frame(df, ind).iloc[-1]
+        rsi = ind['RSI'].iloc[-1] if 'RSI' in ind.columns else None
+        for name, message in SIGNAL_MESSAGES.items():
+            if last.get(name, False):
+                signals.append(message.format(rsi=rsi))
         
         if not signals:
             signals.append("No clear signals detected. Consider longer timeframe analysis.")
@@ -383,26 +303,42 @@ def ai_analysis(df, symbol):
     
     return signals
 
-# Test yfinance connectivity
-def test_yfinance_connection():
-    try:
-        # Test with a well-known stock
-        test_stock = yf.Ticker("AAPL")
-        test_data = test_stock.history(period="5d", progress=False)
-        if not test_data.empty:
-            return True, "✅ Yahoo Finance connection successful"
-        else:
-            return False, "❌ No data received from Yahoo Finance"
-    except Exception as e:
-        return False, f"❌ Yahoo Finance connection failed: {str(e)}"
+# Strategy Tester: price with trade markers over the strategy's equity against buy & hold
+def backtest_chart(result, df):
+    fig = make_subplots(
+        rows=2, cols=1,
+        shared_xaxes=True,
+        vertical_spacing=0.08,
+        subplot_titles=('Price & Trades', 'Equity'),
+        row_heights=[0.55, 0.45]
+    )
+    
+    fig.add_trace(go.Scatter(x=df.index, y=df['Close'], name='Close', line=dict(color='gray')), row=1, col=1)
+    trades = result.trades
+    fig.add_trace(go.Scatter(x=trades['entry_date'], y=trades['entry_price'], mode='markers', name='Buy',
+                             marker=dict(symbol='triangle-up', color='green', size=10)), row=1, col=1)
+    closed = trades[~trades['open']]
+    fig.add_trace(go.Scatter(x=closed['exit_date'], y=closed['exit_price'], mode='markers', name='Sell',
+                             marker=dict(symbol='triangle-down', color='red', size=10)), row=1, col=1)
+    
+    fig.add_trace(go.Scatter(x=result.equity.index, y=result.equity, name=result.strategy,
+                             line=dict(color='blue')), row=2, col=1)
+    fig.add_trace(go.Scatter(x=result.benchmark.index, y=result.benchmark, name='Buy & Hold',
+                             line=dict(color='gray', dash='dash')), row=2, col=1)
+    
+    fig.update_layout(height=700, title=f"{result.strategy} Backtest")
+    return fig
+
+# Shared background health monitor; renders only read its cached status
+@st.cache_resource
+def get_health_monitor():
+    return HealthMonitor(get_market_data_provider()).start()
 
-# Test connection on app startup
-if 'yfinance_test' not in st.session_state:
-    st.session_state.yfinance_test = test_yfinance_connection()
+health = get_health_monitor().status()
 
 # Display connection status
-if not st.session_state.yfinance_test[0]:
-    st.error(st.session_state.yfinance_test[1])
+if health.ok is False:
+    st.error(health.message)
     st.info("The app will work with limited functionality. Please check your internet connection.")
 
 # Sidebar navigation
@@ -412,6 +348,7 @@ page = st.sidebar.selectbox(
     [
         "🏠 Dashboard",
         "📊 Real-Time Analysis",
+        "🔎 Market Screener",
         "🎯 Options Masterclass",
         "📈 Technical Analysis",
         "💰 Strategy Builder",
@@ -422,6 +359,12 @@ page = st.sidebar.selectbox(
     ]
 )
 
+if health.ok is not None:
+    st.sidebar.caption(
+        f"{health.message} · {health.latency_ms:.0f} ms "
+        f"(avg {health.avg_latency_ms:.0f} ms, {health.error_rate:.0%} errors over {health.probes} checks)"
+    )
+
 # Dashboard
 if page == "🏠 Dashboard":
     st.markdown('<h1 class="main-header">📈 Advanced Stock Trading Education Hub</h1>', unsafe_allow_html=True)
@@ -476,12 +419,11 @@ if page == "🏠 Dashboard":
         if st.button("Analyze"):
             if symbol:
                 with st.spinner("Fetching data..."):
-                    hist, info = get_stock_data(symbol)
+                    hist = get_price_history(symbol)
                     if hist is not None and not hist.empty:
                         st.session_state.current_stock = {
                             'symbol': symbol,
-                            'data': hist,
-                            'info': info
+                            'data': hist
                         }
                         st.success(f"✅ {symbol} data loaded successfully!")
                     else:
@@ -507,10 +449,9 @@ elif page == "📊 Real-Time Analysis":
     if 'current_stock' in st.session_state:
         symbol = st.session_state.current_stock['symbol']
         df = st.session_state.current_stock['data']
-        info = st.session_state.current_stock['info']
         
-        # Calculate technical indicators
-        df = calculate_technical_indicators(df)
+        # Calculate the technical indicators the chart and AI analysis use
+        ind = calculate_technical_indicators(symbol, df, list(dict.fromkeys(CHART_COLUMNS + AI_ANALYSIS_COLUMNS)))
         
         # Stock overview
         col1, col2, col3, col4 = st.columns(4)
@@ -528,6 +469,9 @@ elif page == "📊 Real-Time Analysis":
             </div>
             """, unsafe_allow_html=True)
         
+        # Fundamentals are only requested here, where the metric cards render them
+        info = get_stock_info(symbol)
+        
         with col2:
             if info and 'marketCap' in info:
                 market_cap = info['marketCap'] / 1e9  # Convert to billions
@@ -579,23 +523,23 @@ elif page == "📊 Real-Time Analysis":
             name='Price'
         ), row=1, col=1)
         
-        if 'SMA_20' in df.columns:
-            fig.add_trace(go.Scatter(x=df.index, y=df['SMA_20'], name='SMA 20', line=dict(color='orange')), row=1, col=1)
-        if 'SMA_50' in df.columns:
-            fig.add_trace(go.Scatter(x=df.index, y=df['SMA_50'], name='SMA 50', line=dict(color='red')), row=1, col=1)
+        if 'SMA_20' in ind.columns:
+            fig.add_trace(go.Scatter(x=df.index, y=ind['SMA_20'], name='SMA 20', line=dict(color='orange')), row=1, col=1)
+        if 'SMA_50' in ind.columns:
+            fig.add_trace(go.Scatter(x=df.index, y=ind['SMA_50'], name='SMA 50', line=dict(color='red')), row=1, col=1)
         
         # RSI
-        if 'RSI' in df.columns:
-            fig.add_trace(go.Scatter(x=df.index, y=df['RSI'], name='RSI', line=dict(color='purple')), row=2, col=1)
+        if 'RSI' in ind.columns:
+            fig.add_trace(go.Scatter(x=df.index, y=ind['RSI'], name='RSI', line=dict(color='purple')), row=2, col=1)
             fig.add_hline(y=70, line_dash="dash", line_color="red", row=2, col=1)
             fig.add_hline(y=30, line_dash="dash", line_color="green", row=2, col=1)
         
         # MACD
-        if 'MACD' in df.columns and 'MACD_Signal' in df.columns:
-            fig.add_trace(go.Scatter(x=df.index, y=df['MACD'], name='MACD', line=dict(color='blue')), row=3, col=1)
-            fig.add_trace(go.Scatter(x=df.index, y=df['MACD_Signal'], name='Signal', line=dict(color='red')), row=3, col=1)
-            if 'MACD_Hist' in df.columns:
-                fig.add_trace(go.Bar(x=df.index, y=df['MACD_Hist'], name='Histogram'), row=3, col=1)
+        if 'MACD' in ind.columns and 'MACD_Signal' in ind.columns:
+            fig.add_trace(go.Scatter(x=df.index, y=ind['MACD'], name='MACD', line=dict(color='blue')), row=3, col=1)
+            fig.add_trace(go.Scatter(x=df.index, y=ind['MACD_Signal'], name='Signal', line=dict(color='red')), row=3, col=1)
+            if 'MACD_Hist' in ind.columns:
+                fig.add_trace(go.Bar(x=df.index, y=ind['MACD_Hist'], name='Histogram'), row=3, col=1)
         
         # Volume
         fig.add_trace(go.Bar(x=df.index, y=df['Volume'], name='Volume'), row=4, col=1)
@@ -606,7 +550,7 @@ elif page == "📊 Real-Time Analysis":
         # AI Analysis
         st.markdown('<h3 class="subsection-header">🤖 AI-Powered Analysis</h3>', unsafe_allow_html=True)
         
-        signals = ai_analysis(df, symbol)
+        signals = ai_analysis(df, ind, symbol)
         
         st.markdown("""
         <div class="ai-analysis-box">
@@ -616,10 +560,102 @@ elif page == "📊 Real-Time Analysis":
         
         for signal in signals:
             st.markdown(f"• {signal}")
+        
+        # When each signal fired over the loaded history, and how the next 5 days went
+        with st.expander("📅 Signal History"):
+            history = signal_frame(df, ind)
+            custom_rule = st.text_input("Custom rule:", placeholder="RSI(14) < 30 and Close > SMA(50)")
+            if custom_rule:
+                try:
+                    history[custom_rule] = evaluate_rules(df, [custom_rule], known=ind)[custom_rule]
+                except ValueError as e:
+                    st.error(f"Invalid rule: {e}")
+            chosen = st.selectbox("Signal:", list(history.columns),
+                                  index=len(history.columns) - 1 if custom_rule in history else 0)
+            fired = history[chosen].to_numpy()
+            
+            signal_fig = go.Figure()
+            signal_fig.add_trace(go.Scatter(x=df.index, y=df['Close'], name='Close', line=dict(color='gray')))
+            signal_fig.add_trace(go.Scatter(x=df.index[fired], y=df['Close'].to_numpy()[fired], mode='markers',
+                                            name=chosen, marker=dict(color='orange', size=6)))
+            signal_fig.update_layout(height=350, title=f"{chosen} over the last {len(df)} sessions")
+            st.plotly_chart(signal_fig, use_container_width=True)
+            
+            stats = signal_stats(history, df['Close'])
+            st.dataframe(stats.style.format({'avg_forward_return': '{:.2%}', 'hit_rate': '{:.0%}'}, na_rep='-'),
+                         use_container_width=True)
     
     else:
         st.info("Please load a stock from the Dashboard first!")
 
+# Market Screener
+elif page == "🔎 Market Screener":
+    st.markdown('<h1 class="section-header">🔎 Market Screener</h1>', unsafe_allow_html=True)
+    st.markdown("Scan a whole list of tickers for RSI extremes, SMA-stack trends and volume spikes.")
+    
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        tickers = st.text_area("Tickers (separated by commas, spaces or new lines):", value=DEFAULT_UNIVERSE, height=120)
+        uploaded = st.file_uploader("Or upload a ticker list (one per line, or a CSV with a Symbol column):", type=["csv", "txt"])
+    with col2:
+        period = st.selectbox("History:", ["6mo", "1y", "2y"], index=1)
+        only_matches = st.checkbox("Only show matches", value=False)
+        extra_rule = st.text_input("Extra rule:", placeholder="RSI(14) < 30 and Close > SMA(50)")
+    
+    symbols = tickers.replace(",", " ").split()
+    if uploaded is not None:
+        symbols += read_ticker_list(uploaded)
+    
+    run_screen = st.button("Run Screen", type="primary")
+    if run_screen and not symbols:
+        st.warning("Enter at least one ticker to screen")
+    elif run_screen:
+        rules = dict(SCREEN_RULES)
+        if extra_rule:
+            rules['extra_rule'] = extra_rule
+        
+        # Resolved here: the loader runs on worker threads, outside the Streamlit script. It reads the
+        # store directly so a large scan does not evict the history cache; the store refreshes each
+        # symbol once at a time, shared with the cache's loads
+        store, fetch = get_history_cache().store, get_market_data_provider().history
+        load = lambda s: store.get_history(s, period, fetch)
+        
+        progress_bar = st.progress(0.0)
+        status = st.empty()
+        table = st.empty()
+        shown = -1
+        try:
+            for progress in scan_universe(symbols, load, rules, workers=get_process_pool()):
+                progress_bar.progress(progress.done / max(progress.total, 1))
+                status.text(f"Loaded {progress.loaded}/{progress.total} · screened {len(progress.rows)} · "
+                            f"failed {len(progress.failed)}")
+                # Partial results, redrawn only when a chunk has come back
+                if len(progress.rows) != shown:
+                    shown = len(progress.rows)
+                    table.dataframe(screener_view(progress.frame(), only_matches), use_container_width=True, hide_index=True)
+            st.session_state.screener_results = (progress.frame(), progress.failed)
+            table.empty()
+        except ValueError as e:
+            st.error(f"Invalid rule: {e}")
+    
+    if st.session_state.screener_results is not None:
+        results, failed = st.session_state.screener_results
+        st.dataframe(screener_view(results, only_matches), use_container_width=True, hide_index=True)
+        if failed:
+            with st.expander(f"⚠️ {len(failed)} symbols could not be screened"):
+                st.dataframe(pd.DataFrame(list(failed.items()), columns=['symbol', 'reason']), hide_index=True)
+        
+        if not results.empty:
+            chosen = st.selectbox("Open in Real-Time Analysis:", list(results['symbol']))
+            if st.button("Analyze"):
+                hist = get_price_history(chosen)
+                if hist is not None and not hist.empty:
+                    st.session_state.current_stock = {
+                        'symbol': chosen,
+                        'data': hist
+                    }
+                    st.success(f"✅ {chosen} loaded - open Real-Time Analysis")
+
 # Options Masterclass
 elif page == "🎯 Options Masterclass":
     st.markdown('<h1 class="section-header">🎯 Advanced Options Trading</h1>', unsafe_allow_html=True)
@@ -723,7 +759,7 @@ elif page == "📋 Portfolio Simulator":
         col1, col2 = st.columns(2)
         
         with col1:
-            symbol = st.text_input("Stock Symbol:", value="AAPL").upper()
+            symbol = st.text_input("Stock Symbol:", value="AAPL").strip().upper()
             shares = st.number_input("Number of Shares:", min_value=1, value=100)
             price = st.number_input("Purchase Price:", min_value=0.01, value=150.0)
             
@@ -767,10 +803,14 @@ elif page == "📋 Portfolio Simulator":
             total_current_value = 0
             total_cost = 0
             
+            # One request for every holding instead of one per position
+            last_prices = get_last_prices(tuple(sorted(st.session_state.portfolio)))
+            
             for symbol, position in st.session_state.portfolio.items():
-                hist, info = get_stock_data(symbol, "1d")
-                if hist is not None and not hist.empty:
-                    current_price = hist['Close'].iloc[-1]
+                # Quotes come back keyed by the normalized ticker
+                ticker = symbol.strip().upper()
+                if ticker in last_prices:
+                    current_price = last_prices[ticker]
                     current_value = position['shares'] * current_price
                     gain_loss = current_value - position['total_cost']
                     gain_loss_pct = (gain_loss / position['total_cost']) * 100
@@ -921,8 +961,192 @@ elif page == "🎮 Interactive Tools":
             "Volume Breakout"
         ])
         
+        st.caption(STRATEGIES[strategy].description)
+        
+        col1, col2, col3 = st.columns(3)
+        
+        with col1:
+            current = st.session_state.get('current_stock')
+            default_symbol = current['symbol'] if current else "AAPL"
+            backtest_symbol = st.text_input("Symbol", value=default_symbol, key="backtest_symbol").upper()
+            backtest_period = st.selectbox("History", ["1y", "2y", "5y", "10y", "max"], index=2)
+        
+        with col2:
+            initial_capital = st.number_input("Initial Capital ($)", min_value=100.0, value=10000.0, step=1000.0)
+            cost_bps = st.number_input("Trading Cost (bps per trade)", min_value=0.0, value=5.0, step=1.0)
+        
+        with col3:
+            strategy_params = {}
+            for name, default in STRATEGIES[strategy].params.items():
+                strategy_params[name] = st.number_input(name.replace('_', ' ').title(), value=default,
+                                                        key=f"param_{strategy}_{name}")
+        
+        with st.expander("⚙️ Order Settings"):
+            st.caption("Set a stop-loss, take-profit or limit entry to simulate orders bar by bar "
+                       "(fills at the next open or intrabar at the bar's high/low); otherwise trades happen at the signal close.")
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                entry_order = st.selectbox("Entry Order", ["Market", "Limit"])
+                limit_offset = st.number_input("Limit Below Signal Close (%)", min_value=0.0, value=1.0, step=0.5)
+                limit_bars = st.number_input("Limit Valid For (bars)", min_value=1, value=3, step=1)
+            with col2:
+                stop_loss = st.number_input("Stop Loss (%, 0 = off)", min_value=0.0, value=0.0, step=0.5)
+            with col3:
+                take_profit = st.number_input("Take Profit (%, 0 = off)", min_value=0.0, value=0.0, step=0.5)
+        use_orders = entry_order == "Limit" or stop_loss > 0 or take_profit > 0
+        
         if st.button("Run Backtest"):
-            st.info("Backtesting feature coming soon! This will simulate trading strategies on historical data.")
+            hist = get_price_history(backtest_symbol, backtest_period)
+            if hist is not None and not hist.empty:
+                try:
+                    if use_orders:
+                        result = run_event_backtest(hist, STRATEGIES[strategy], strategy_params,
+                                                    order_type=entry_order.lower(), limit_offset=limit_offset / 100,
+                                                    limit_bars=limit_bars, stop_loss=stop_loss / 100,
+                                                    take_profit=take_profit / 100,
+                                                    initial_capital=initial_capital, cost=cost_bps / 10000)
+                    else:
+                        result = run_backtest(hist, STRATEGIES[strategy], strategy_params,
+                                              initial_capital=initial_capital, cost=cost_bps / 10000)
+                except ValueError as e:
+                    st.error(f"Invalid strategy parameters: {str(e)}")
+                else:
+                    stats = result.stats
+                    col1, col2, col3, col4, col5 = st.columns(5)
+                    col1.metric("Total Return", f"{stats['total_return']:.1%}",
+                                f"{stats['total_return'] - stats['buy_hold_return']:+.1%} vs buy & hold")
+                    col2.metric("CAGR", f"{stats['cagr']:.1%}")
+                    col3.metric("Sharpe Ratio", f"{stats['sharpe']:.2f}")
+                    col4.metric("Max Drawdown", f"{stats['max_drawdown']:.1%}")
+                    col5.metric("Trades", f"{stats['trades']}",
+                                None if np.isnan(stats['win_rate']) else f"{stats['win_rate']:.0%} winners")
+                    
+                    st.plotly_chart(backtest_chart(result, hist), use_container_width=True)
+                    st.code(f"Entry: {result.entry}\nExit:  {result.exit}")
+                    
+                    st.dataframe(result.trades.style.format({
+                        'entry_price': '${:.2f}',
+                        'exit_price': '${:.2f}',
+                        'return': '{:.2%}'
+                    }), use_container_width=True)
+        
+        with st.expander("🔧 Optimize Parameters"):
+            st.caption("Backtest every combination of the values below (or a random sample of them) on all CPU cores "
+                       "and compare Sharpe ratio and return by parameter pair.")
+            grid = {}
+            cols = st.columns(len(STRATEGIES[strategy].params))
+            for col, name in zip(cols, STRATEGIES[strategy].params):
+                values = STRATEGIES[strategy].grid.get(name, [STRATEGIES[strategy].params[name]])
+                text = col.text_input(f"{name.replace('_', ' ').title()} values", value=", ".join(str(v) for v in values),
+                                      key=f"grid_{strategy}_{name}")
+                try:
+                    grid[name] = [float(v) for v in text.replace(",", " ").split()]
+                except ValueError:
+                    st.error(f"Values for {name} must be numbers separated by commas")
+                    grid = None
+                    break
+            
+            col1, col2 = st.columns(2)
+            with col1:
+                search_mode = st.radio("Search", ["Grid", "Random"], horizontal=True)
+            with col2:
+                samples = st.number_input("Random Samples", min_value=1, value=50, step=10, disabled=search_mode == "Grid")
+            
+            if grid is not None:
+                sets = parameter_sets(STRATEGIES[strategy], grid, samples if search_mode == "Random" else None)
+                st.caption(f"{len(sets)} parameter sets")
+                if st.button("Run Optimization", disabled=not sets):
+                    hist = get_price_history(backtest_symbol, backtest_period)
+                    if hist is not None and not hist.empty:
+                        progress_bar = st.progress(0.0)
+                        try:
+                            for progress in search_parameters(hist, STRATEGIES[strategy], sets, cost=cost_bps / 10000,
+                                                              initial_capital=initial_capital, workers=get_process_pool()):
+                                progress_bar.progress(progress.done / max(progress.total, 1))
+                        except ValueError as e:
+                            st.error(f"Invalid strategy parameters: {str(e)}")
+                        else:
+                            st.session_state.optimizer_results = (strategy, backtest_symbol, progress.frame())
+            
+            optimized = st.session_state.get('optimizer_results')
+            if optimized and optimized[0] == strategy and not optimized[2].empty:
+                _, optimized_symbol, results = optimized
+                names = list(STRATEGIES[strategy].params)
+                st.markdown(f"**{optimized_symbol}: best parameters** — "
+                            + ", ".join(f"{name} = {results.iloc[0][name]:g}" for name in names))
+                
+                if len(names) > 1:
+                    col1, col2, col3 = st.columns(3)
+                    x_param = col1.selectbox("Heatmap X", names, index=0)
+                    y_param = col2.selectbox("Heatmap Y", names, index=1)
+                    metric = col3.selectbox("Heatmap Metric", ["sharpe", "total_return"],
+                                            format_func=lambda m: "Sharpe Ratio" if m == "sharpe" else "Total Return")
+                    if x_param != y_param:
+                        grid_map = heatmap(results, x_param, y_param, metric)
+                        fig = px.imshow(grid_map, text_auto='.2f' if metric == 'sharpe' else '.1%', aspect='auto',
+                                        color_continuous_scale='RdYlGn', origin='lower',
+                                        labels=dict(x=x_param, y=y_param, color=metric))
+                        fig.update_layout(title=f"Best {'Sharpe Ratio' if metric == 'sharpe' else 'Total Return'} "
+                                                f"by {x_param} and {y_param}")
+                        st.plotly_chart(fig, use_container_width=True)
+                
+                st.dataframe(results.style.format({
+                    'sharpe': '{:.2f}',
+                    'total_return': '{:.1%}',
+                    'cagr': '{:.1%}',
+                    'max_drawdown': '{:.1%}',
+                    'exposure': '{:.0%}'
+                }), use_container_width=True)
+        
+        with st.expander("🔁 Walk-Forward Test"):
+            st.caption("Re-optimizes on a rolling training window, trades the best parameters on the following "
+                       "test window, and stitches the test windows into one out-of-sample equity curve. "
+                       "Uses the parameter values and search mode set under Optimize Parameters.")
+            col1, col2, col3, col4 = st.columns(4)
+            with col1:
+                train_years = st.number_input("Train Window (years)", min_value=0.25, value=2.0, step=0.25)
+            with col2:
+                test_months = st.number_input("Test Window (months)", min_value=1, value=6, step=1)
+            with col3:
+                wf_metric = st.selectbox("Optimize For", ["sharpe", "total_return"],
+                                         format_func=lambda m: "Sharpe Ratio" if m == "sharpe" else "Total Return")
+            with col4:
+                anchored = st.checkbox("Anchored (expanding) training window")
+            
+            if grid is None:
+                st.info("Fix the parameter values under Optimize Parameters first")
+            elif st.button("Run Walk-Forward"):
+                hist = get_price_history(backtest_symbol, backtest_period)
+                if hist is not None and not hist.empty:
+                    progress_bar = st.progress(0.0)
+                    try:
+                        for progress in walk_forward(hist, STRATEGIES[strategy], sets, int(train_years * 252),
+                                                     int(test_months * 21), anchored=anchored, metric=wf_metric,
+                                                     cost=cost_bps / 10000, initial_capital=initial_capital,
+                                                     workers=get_process_pool()):
+                            progress_bar.progress(progress.done / max(progress.total, 1))
+                    except ValueError as e:
+                        st.error(f"Walk-forward failed: {str(e)}")
+                    else:
+                        wf = stitch_walk_forward(hist, STRATEGIES[strategy], progress, initial_capital)
+                        stats = wf.stats
+                        col1, col2, col3, col4, col5 = st.columns(5)
+                        col1.metric("Out-of-Sample Return", f"{stats['total_return']:.1%}",
+                                    f"{stats['total_return'] - stats['buy_hold_return']:+.1%} vs buy & hold")
+                        col2.metric("CAGR", f"{stats['cagr']:.1%}")
+                        col3.metric("Out-of-Sample Sharpe", f"{stats['sharpe']:.2f}",
+                                    f"{wf.windows['test_sharpe'].mean() - wf.windows['train_sharpe'].mean():+.2f} vs in-sample"
+                                    if wf_metric == 'sharpe' else None)
+                        col4.metric("Max Drawdown", f"{stats['max_drawdown']:.1%}")
+                        col5.metric("Windows", f"{len(wf.windows)}", f"{stats['trades']} trades")
+                        
+                        st.plotly_chart(backtest_chart(wf, hist.loc[wf.equity.index]), use_container_width=True)
+                        st.dataframe(wf.windows.style.format({
+                            'train_sharpe': '{:.2f}',
+                            'train_total_return': '{:.1%}',
+                            'test_sharpe': '{:.2f}',
+                            'test_return': '{:.1%}'
+                        }), use_container_width=True)
 
 # Footer
 st.markdown("---")
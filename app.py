@@ -5,6 +5,8 @@ import plotly.express as px
 from plotly.subplots import make_subplots
 import numpy as np
 
+from indicators import sma
+
 # Page configuration
 st.set_page_config(
     page_title="Stock Trading Education Hub",
@@ -357,8 +359,8 @@ elif page == "📈 Technical Indicators":
         dates = pd.date_range('2023-01-01', periods=100, freq='D')
         prices = 100 + np.cumsum(np.random.randn(100) * 0.5)
         df = pd.DataFrame({'Date': dates, 'Price': prices})
-        df['SMA_20'] = df['Price'].rolling(window=20).mean()
-        df['SMA_50'] = df['Price'].rolling(window=50).mean()
+        df['SMA_20'] = sma(df['Price'].values, 20)
+        df['SMA_50'] = sma(df['Price'].values, 50)
         
         fig = go.Figure()
         fig.add_trace(go.Scatter(x=df['Date'], y=df['Price'], name='Stock Price', line=dict(color='blue')))
@@ -0,0 +1,56 @@
+"""
+Strategy backtesting for the Strategy Tester
+Strategies are rule templates evaluated through the indicator graph; the
+vectorized engine turns their signals into positions, equity and trades,
+the event-driven engine adds limit entries, stop-losses and take-profits,
+the optimizer searches parameter grids on a process pool, and walk-forward
+runs re-optimize on rolling windows for an out-of-sample equity curve
+"""
+
+from backtest.strategies import STRATEGIES, Strategy
+from backtest.events import ORDER_TYPES, run_event_backtest, simulate_orders
+from backtest.optimize import SEARCH_METRICS, SearchProgress, heatmap, optimize, parameter_sets, search_parameters
+from backtest.walkforward import (
+    WalkForwardProgress,
+    WalkForwardResult,
+    run_walk_forward,
+    stitch_walk_forward,
+    walk_forward,
+    walk_forward_windows,
+)
+from backtest.vectorized import (
+    BacktestResult,
+    metrics,
+    run_backtest,
+    simulate,
+    strategy_signals,
+    target_positions,
+    trade_list,
+)
+
+__all__ = [
+    "STRATEGIES",
+    "Strategy",
+    "ORDER_TYPES",
+    "run_event_backtest",
+    "simulate_orders",
+    "SEARCH_METRICS",
+    "SearchProgress",
+    "heatmap",
+    "optimize",
+    "parameter_sets",
+    "search_parameters",
+    "BacktestResult",
+    "metrics",
+    "run_backtest",
+    "simulate",
+    "strategy_signals",
+    "target_positions",
+    "trade_list",
+    "WalkForwardProgress",
+    "WalkForwardResult",
+    "run_walk_forward",
+    "stitch_walk_forward",
+    "walk_forward",
+    "walk_forward_windows",
+]
@@ -0,0 +1,166 @@
+"""
+Event-driven backtester
+Simulates orders rather than target positions: entries are market orders
+filled at the next bar's open or limit orders resting for a few bars, and
+open positions carry a stop-loss and a take-profit that fill intrabar when
+the bar's low or high reaches them (at the open if the bar gaps through).
+
+Each bar is one event: pending orders are filled against its open/high/low,
+protective exits are checked, then the signals at its close place the next
+order. The whole simulation state is a handful of scalars and fills go into
+a preallocated array, so the loop compiles with Numba when it is installed
+(see indicators.jit) and otherwise runs as plain Python, about 0.25 s per
+million bars.
+"""
+
+from typing import Mapping, Optional
+
+import numpy as np
+import pandas as pd
+
+from backtest.strategies import Strategy
+from backtest.vectorized import TRADING_DAYS, BacktestResult, _result, strategy_signals
+from indicators import jit
+from indicators.graph import IndicatorGraph
+
+ORDER_TYPES = ("market", "limit")
+
+# Exit reason codes in the fills array (0 = no exit)
+EXIT_REASONS = {1: "signal", 2: "stop", 3: "target", 4: "open"}
+
+
+@jit._jit
+def _order_loop(open_, high, low, close, entries, exits, limit_order, limit_offset, limit_bars,
+                stop_loss, take_profit, fills):
+    # fills rows: entry bar, entry price, exit bar, exit price, exit reason code
+    n = len(close)
+    count = 0
+    flat, pending, exit_next = True, False, False
+    limit, expires, watch = 0.0, 0, 0
+    entry_bar, entry_price, stop, target = 0, 0.0, -np.inf, np.inf
+
+    for t in range(n):
+        # Fill the pending entry at this bar's open (market) or when its low reaches the limit
+        if pending:
+            if not limit_order:
+                entry_bar, entry_price, watch = t, open_[t], t
+                flat, pending = False, False
+            elif low[t] <= limit:
+                entry_bar, entry_price, watch = t, min(open_[t], limit), t + 1
+                flat, pending = False, False
+            elif t >= expires:
+                pending = False
+            if not flat:
+                stop = entry_price * (1 - stop_loss) if stop_loss > 0 else -np.inf
+                target = entry_price * (1 + take_profit) if take_profit > 0 else np.inf
+
+        # Exit signal from the previous close first, then stop (the worse case), then target
+        if not flat:
+            reason, price = 0, 0.0
+            if exit_next:
+                reason, price = 1, open_[t]
+            elif t >= watch and low[t] <= stop:
+                reason, price = 2, min(open_[t], stop)
+            elif t >= watch and high[t] >= target:
+                reason, price = 3, max(open_[t], target)
+            if reason > 0:
+                fills[count, 0], fills[count, 1] = entry_bar, entry_price
+                fills[count, 2], fills[count, 3], fills[count, 4] = t, price, reason
+                count += 1
+                flat, exit_next = True, False
+
+        # Signals at the close: an entry while flat (and conflicting signals stay flat),
+        # an exit cancels a resting limit entry
+        if flat and not pending:
+            if entries[t] and not exits[t] and t + 1 < n:
+                pending = True
+                limit = close[t] * (1 - limit_offset)
+                expires = min(n - 1, t + limit_bars)
+        elif pending and exits[t]:
+            pending = False
+        elif not flat and exits[t] and t < n - 1:
+            exit_next = True
+
+    if not flat:
+        fills[count, 0], fills[count, 1] = entry_bar, entry_price
+        fills[count, 2], fills[count, 3], fills[count, 4] = n - 1, close[n - 1], 4
+        count += 1
+    return count
+
+
+def simulate_orders(open_: np.ndarray, high: np.ndarray, low: np.ndarray, close: np.ndarray,
+                    entries: np.ndarray, exits: np.ndarray, order_type: str = "market",
+                    limit_offset: float = 0.0, limit_bars: int = 1,
+                    stop_loss: Optional[float] = None, take_profit: Optional[float] = None) -> np.ndarray:
+    """Fills for a long/flat strategy, one (entry_bar, entry_price, exit_bar, exit_price, reason) row per trade
+
+    Signals are read at a bar's close and acted on from the next bar. Limit
+    entries are placed `limit_offset` below the signal close and rest for
+    `limit_bars` bars, unless an exit signal cancels them first.
+    `stop_loss` and `take_profit` are fractions of the fill price (0.05 =
+    5%), watched from the fill bar for market orders and from the next bar
+    for limit fills; a bar reaching both counts as stopped out. An exit signal fills at the next open. Reasons are EXIT_REASONS
+    codes; a position still open at the end is valued at the last close.
+    """
+    if order_type not in ORDER_TYPES:
+        raise ValueError(f"Unknown order type: {order_type} (expected one of {', '.join(ORDER_TYPES)})")
+    entries, exits = np.asarray(entries, dtype=bool), np.asarray(exits, dtype=bool)
+    fills = np.empty((int(np.count_nonzero(entries)) + 1, 5))  # every trade needs an entry signal
+
+    prices = [np.ascontiguousarray(x, dtype=np.float64) for x in (open_, high, low, close)]
+    # STOCKS_NUMBA=0 runs the Python original of the compiled loop
+    loop = _order_loop if jit.JIT_ENABLED else getattr(_order_loop, "py_func", _order_loop)
+    count = loop(*prices, entries, exits, order_type == "limit", float(limit_offset), int(limit_bars),
+                 float(stop_loss or 0.0), float(take_profit or 0.0), fills)
+    return fills[:count]
+
+
+def run_event_backtest(df: pd.DataFrame, strategy: Strategy, params: Optional[Mapping[str, float]] = None,
+                       order_type: str = "market", limit_offset: float = 0.0, limit_bars: int = 1,
+                       stop_loss: Optional[float] = None, take_profit: Optional[float] = None,
+                       initial_capital: float = 10_000.0, cost: float = 0.0,
+                       periods_per_year: int = TRADING_DAYS,
+                       graph: Optional[IndicatorGraph] = None) -> BacktestResult:
+    """Backtest a Strategy Tester strategy with order-level fills (see simulate_orders)
+
+    Each fill invests (or sells) the whole equity, paying `cost` as a
+    fraction of the traded value. Use periods_per_year=252 * 390 for minute bars.
+    """
+    o, h, l, c = (df[name].to_numpy(dtype=np.float64) for name in ('Open', 'High', 'Low', 'Close'))
+    entries, exits = strategy_signals(df if graph is None else graph, strategy, params)
+    fills = simulate_orders(o, h, l, c, entries, exits, order_type, limit_offset, limit_bars, stop_loss, take_profit)
+
+    entry_bar, exit_bar = fills[:, 0].astype(np.int64), fills[:, 2].astype(np.int64)
+    entry_price, exit_price, reason = fills[:, 1], fills[:, 3], fills[:, 4].astype(np.int64)
+    still_open = reason == 4
+
+    # Cash before and after each trade, then per-bar equity: shares of the
+    # latest trade times the close while it is held, its proceeds afterwards
+    growth = (1 - cost) * exit_price / entry_price * np.where(still_open, 1, 1 - cost)
+    cash_after = initial_capital * np.cumprod(growth)
+    cash_before = np.concatenate(([initial_capital], cash_after[:-1]))
+    shares = cash_before * (1 - cost) / entry_price
+    held_until = np.where(still_open, len(c), exit_bar)
+
+    bars = np.arange(len(c))
+    held = np.zeros(len(c), dtype=bool)
+    equity = np.full(len(c), initial_capital)
+    if len(fills):
+        trade = np.searchsorted(entry_bar, bars, side="right") - 1
+        latest = np.maximum(trade, 0)
+        held = (trade >= 0) & (bars < held_until[latest])
+        equity = np.where(held, shares[latest] * c, np.where(trade >= 0, cash_after[latest], initial_capital))
+
+    returns = np.diff(equity, prepend=initial_capital) / np.concatenate(([initial_capital], equity[:-1]))
+    trades = pd.DataFrame({
+        'entry_date': df.index[entry_bar],
+        'exit_date': df.index[exit_bar],
+        'entry_price': entry_price,
+        'exit_price': exit_price,
+        'bars': exit_bar - entry_bar,
+        'return': cash_after / cash_before - 1,
+        'exit_reason': [EXIT_REASONS[code] for code in reason],
+        'open': still_open,
+    })
+    return _result(df, strategy, params, held.astype(np.float64), returns, equity, trades,
+                   initial_capital, periods_per_year)
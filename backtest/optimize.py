@@ -0,0 +1,190 @@
+"""
+Parameter optimizer
+Grid or random search over a strategy's parameters (Strategy.grid), run on a
+process pool. The price history is copied once into a shared memory block
+that every worker maps read-only, so tasks carry only a chunk of parameter
+sets instead of pickled price arrays. Each worker keeps one IndicatorGraph per
+history, so an indicator shared by many parameter sets (the same SMA or RSI
+period) is computed once per worker, and every chunk is backtested as one
+(time x parameter set) matrix by the vectorized engine.
+"""
+
+import itertools
+from contextlib import contextmanager
+from concurrent.futures import FIRST_COMPLETED, Executor, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from multiprocessing import shared_memory
+from typing import Dict, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from backtest.strategies import Params, Strategy
+from backtest.vectorized import TRADING_DAYS, metrics, simulate, strategy_signals, target_positions
+from indicators.graph import IndicatorGraph
+
+PRICE_FIELDS = ('Open', 'High', 'Low', 'Close', 'Volume')
+
+# Metrics reported per parameter set; the first is the default ranking
+SEARCH_METRICS = ['sharpe', 'total_return', 'cagr', 'max_drawdown', 'exposure', 'trades']
+
+# A worker starts a fresh graph once its memoized indicators pass this size
+GRAPH_BUDGET = 512 * 1024 ** 2
+
+# (shared memory name, array shape, field names) of a history in shared memory
+Handle = Tuple[str, Tuple[int, int], Tuple[str, ...]]
+
+
+def parameter_sets(strategy: Strategy, grid: Optional[Mapping[str, Sequence[float]]] = None,
+                   samples: Optional[int] = None, seed: int = 0) -> List[Params]:
+    """Parameter sets to search: the full grid, or `samples` of them drawn at random
+
+    `grid` overrides the strategy's value ranges per parameter; parameters
+    with no range keep their default. Sets breaking the strategy's
+    constraints are skipped. Random draws keep grid order, so consecutive
+    sets still share indicators.
+    """
+    ranges = {**{name: [value] for name, value in strategy.params.items()}, **strategy.grid, **(grid or {})}
+    names = list(strategy.params)
+    sets = [strategy.resolve(dict(zip(names, values))) for values in itertools.product(*(ranges[n] for n in names))]
+    sets = [params for params in sets if strategy.allows(params)]
+    if samples is not None and samples < len(sets):
+        picked = np.sort(np.random.default_rng(seed).choice(len(sets), size=samples, replace=False))
+        sets = [sets[i] for i in picked]
+    return sets
+
+
+def backtest_parameter_sets(graph: IndicatorGraph, strategy: Strategy, sets: Sequence[Params],
+                            cost: float = 0.0, initial_capital: float = 10_000.0,
+                            periods_per_year: int = TRADING_DAYS, bars: slice = slice(None)) -> List[Dict]:
+    """One row of parameters and metrics per parameter set, backtested side by side
+
+    Signals come from the graph over its whole history; `bars` backtests a
+    window of it, starting flat at the window's first bar.
+    """
+    signals = [strategy_signals(graph, strategy, params) for params in sets]
+    entries = np.column_stack([entry[bars] for entry, _ in signals])
+    exits = np.column_stack([exit[bars] for _, exit in signals])
+    close = graph.evaluate(("input", "Close"))[bars]
+    held, returns, equity = simulate(close, target_positions(entries, exits), cost, initial_capital)
+
+    values = metrics(returns, equity, held, initial_capital, periods_per_year)
+    values['trades'] = np.count_nonzero(np.diff(held, axis=0, prepend=0.0) > 0, axis=0)
+    return [{**params, **{name: values[name][i].item() for name in SEARCH_METRICS}}
+            for i, params in enumerate(sets)]
+
+
+@contextmanager
+def shared_history(df: pd.DataFrame) -> Iterator[Handle]:
+    """Copy a price history into a shared memory block for the duration of the block"""
+    fields = tuple(name for name in PRICE_FIELDS if name in df.columns)
+    prices = np.stack([df[name].to_numpy(dtype=np.float64) for name in fields])
+    block = shared_memory.SharedMemory(create=True, size=max(prices.nbytes, 1))
+    try:
+        shared = np.ndarray(prices.shape, dtype=np.float64, buffer=block.buf)
+        shared[:] = prices
+        del shared
+        yield block.name, prices.shape, fields
+    finally:
+        block.close()
+        block.unlink()
+
+
+# Worker-process state: the attached history and its indicator graph
+_attached: Dict[str, object] = {}
+
+
+def _attach(handle: Handle) -> IndicatorGraph:
+    """Indicator graph over a shared history, mapping the block on first use"""
+    name, shape, fields = handle
+    if _attached.get('name') != name:
+        block = _attached.pop('block', None)
+        _attached.clear()  # drop the graph's views before unmapping
+        if block is not None:
+            try:
+                block.close()
+            except BufferError:
+                pass
+        block = shared_memory.SharedMemory(name=name)
+        prices = np.ndarray(shape, dtype=np.float64, buffer=block.buf)
+        prices.flags.writeable = False
+        _attached.update(name=name, block=block, prices=dict(zip(fields, prices)))
+    if 'graph' not in _attached or _attached['graph'].nbytes > GRAPH_BUDGET:
+        _attached['graph'] = IndicatorGraph(_attached['prices'])
+    return _attached['graph']
+
+
+def _search_chunk(handle: Handle, strategy: Strategy, sets: List[Params], cost: float,
+                  initial_capital: float, periods_per_year: int) -> List[Dict]:
+    """Worker task: backtest a chunk of parameter sets over the shared history"""
+    return backtest_parameter_sets(_attach(handle), strategy, sets, cost, initial_capital, periods_per_year)
+
+
+@dataclass
+class SearchProgress:
+    """Running state of a search; `rows` grows as chunks complete"""
+
+    total: int
+    rows: List[Dict] = field(default_factory=list)
+
+    @property
+    def done(self) -> int:
+        return len(self.rows)
+
+    def frame(self, metric: str = 'sharpe') -> pd.DataFrame:
+        """Rows so far, best `metric` first"""
+        df = pd.DataFrame(self.rows)
+        if df.empty:
+            return df
+        return df.sort_values(metric, ascending=False, na_position='last', ignore_index=True)
+
+
+def search_parameters(df: pd.DataFrame, strategy: Strategy, sets: Sequence[Params],
+                      cost: float = 0.0, initial_capital: float = 10_000.0,
+                      periods_per_year: int = TRADING_DAYS, workers: Optional[Executor] = None,
+                      chunk_size: int = 8) -> Iterator[SearchProgress]:
+    """Backtest every parameter set on `workers`, yielding the progress as chunks complete
+
+    The history goes into shared memory for the duration of the search; the
+    pool is created for the search if not given. Closing the generator early
+    cancels the chunks that have not started.
+    """
+    sets = [strategy.resolve(params) for params in sets]
+    if sets:
+        strategy_signals(df.iloc[:2], strategy, sets[0])  # invalid rules fail here, not in every worker
+    progress = SearchProgress(total=len(sets))
+    own_workers = workers is None
+    workers = ProcessPoolExecutor() if own_workers else workers
+    with shared_history(df) as handle:
+        pending = set()
+        try:
+            pending = {workers.submit(_search_chunk, handle, strategy, sets[i:i + chunk_size], cost,
+                                      initial_capital, periods_per_year)
+                       for i in range(0, len(sets), chunk_size)}
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    progress.rows.extend(future.result())
+                yield progress
+        finally:
+            for future in pending:
+                future.cancel()
+            if own_workers:
+                workers.shutdown(wait=True)
+
+
+def optimize(df: pd.DataFrame, strategy: Strategy, grid: Optional[Mapping[str, Sequence[float]]] = None,
+             samples: Optional[int] = None, seed: int = 0, metric: str = 'sharpe', **kwargs) -> pd.DataFrame:
+    """Grid (or random, with `samples`) search; one row per parameter set, best `metric` first
+
+    Keyword arguments are passed on to search_parameters.
+    """
+    progress = SearchProgress(total=0)
+    for progress in search_parameters(df, strategy, parameter_sets(strategy, grid, samples, seed), **kwargs):
+        pass
+    return progress.frame(metric)
+
+
+def heatmap(results: pd.DataFrame, x: str, y: str, metric: str = 'sharpe') -> pd.DataFrame:
+    """Best `metric` for each (y, x) parameter pair, over the other parameters"""
+    return results.pivot_table(index=y, columns=x, values=metric, aggfunc='max').sort_index().sort_index(axis=1)
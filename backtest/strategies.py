@@ -0,0 +1,93 @@
+"""
+Strategy Tester strategies
+Each strategy is a pair of rule templates (signals.rules syntax) for going
+long and for going flat, plus its default parameters. Filling in the
+parameters gives plain rule expressions, so every backtest engine evaluates
+the same definitions through the indicator graph.
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, Mapping, Optional, Sequence, Tuple
+
+Params = Dict[str, float]
+
+
+@dataclass(frozen=True)
+class Strategy:
+    """Long/flat strategy: enter when `entry` holds at a bar's close, leave when `exit` does
+
+    `grid` holds the values the optimizer tries for each parameter, and
+    `constraints` pairs of parameters (a, b) that must satisfy a < b.
+    """
+    name: str
+    entry: str
+    exit: str
+    params: Mapping[str, float]
+    description: str = ""
+    grid: Mapping[str, Sequence[float]] = field(default_factory=dict)
+    constraints: Tuple[Tuple[str, str], ...] = ()
+
+    def resolve(self, params: Optional[Mapping[str, float]] = None) -> Params:
+        """Defaults overridden by `params`; whole numbers become ints (window lengths)"""
+        unknown = set(params or {}) - set(self.params)
+        if unknown:
+            raise ValueError(f"Unknown parameters for {self.name}: {', '.join(sorted(unknown))}")
+        merged = {**self.params, **(params or {})}
+        return {name: int(value) if float(value).is_integer() else float(value) for name, value in merged.items()}
+
+    def rules(self, params: Optional[Mapping[str, float]] = None) -> Tuple[str, str]:
+        """Entry and exit rule expressions for a parameter set"""
+        values = self.resolve(params)
+        return self.entry.format(**values), self.exit.format(**values)
+
+    def allows(self, params: Mapping[str, float]) -> bool:
+        """Whether a parameter set satisfies the strategy's constraints"""
+        values = self.resolve(params)
+        return all(values[a] < values[b] for a, b in self.constraints)
+
+
+STRATEGIES: Dict[str, Strategy] = {
+    "Moving Average Crossover": Strategy(
+        "Moving Average Crossover",
+        entry="CROSSES_ABOVE(SMA({fast}), SMA({slow}))",
+        exit="CROSSES_BELOW(SMA({fast}), SMA({slow}))",
+        params={'fast': 20, 'slow': 50},
+        description="Long while the fast SMA is above the slow SMA",
+        grid={'fast': range(5, 55, 5), 'slow': range(20, 210, 10)},
+        constraints=(('fast', 'slow'),),
+    ),
+    "RSI Mean Reversion": Strategy(
+        "RSI Mean Reversion",
+        entry="RSI({period}) < {oversold}",
+        exit="RSI({period}) > {overbought}",
+        params={'period': 14, 'oversold': 30, 'overbought': 70},
+        description="Buy oversold, sell once RSI is overbought",
+        grid={'period': (7, 10, 14, 21, 28), 'oversold': range(15, 45, 5), 'overbought': range(55, 90, 5)},
+        constraints=(('oversold', 'overbought'),),
+    ),
+    "MACD Momentum": Strategy(
+        "MACD Momentum",
+        entry="CROSSES_ABOVE(MACD({fast}, {slow}, {signal}), MACD_SIGNAL({fast}, {slow}, {signal}))",
+        exit="CROSSES_BELOW(MACD({fast}, {slow}, {signal}), MACD_SIGNAL({fast}, {slow}, {signal}))",
+        params={'fast': 12, 'slow': 26, 'signal': 9},
+        description="Long from a bullish MACD signal-line cross to the next bearish one",
+        grid={'fast': range(6, 20, 2), 'slow': range(20, 40, 2), 'signal': (5, 7, 9, 12)},
+        constraints=(('fast', 'slow'),),
+    ),
+    "Bollinger Bands Bounce": Strategy(
+        "Bollinger Bands Bounce",
+        entry="Close < BB_LOWER({period}, {num_std})",
+        exit="Close > BB_MIDDLE({period}, {num_std})",
+        params={'period': 20, 'num_std': 2.0},
+        description="Buy a close below the lower band, sell back at the middle band",
+        grid={'period': range(10, 45, 5), 'num_std': (1.0, 1.5, 2.0, 2.5, 3.0)},
+    ),
+    "Volume Breakout": Strategy(
+        "Volume Breakout",
+        entry="Close > PREV(HIGHEST(High, {period})) and VOLUME_RATIO({period}) > {volume_ratio}",
+        exit="Close < PREV(LOWEST(Low, {exit_period}))",
+        params={'period': 20, 'volume_ratio': 1.5, 'exit_period': 10},
+        description="Buy a new high on heavy volume, sell on a break of the recent low",
+        grid={'period': range(10, 60, 10), 'volume_ratio': (1.0, 1.25, 1.5, 2.0, 2.5, 3.0), 'exit_period': (5, 10, 20)},
+    ),
+}
@@ -0,0 +1,177 @@
+"""
+Vectorized backtester
+Turns entry/exit signals into positions, returns, equity and trades with
+whole-array NumPy operations (no per-bar Python loop). Signals are acted on
+at the close of the bar they fire on, so a position earns from the next bar
+onwards. Position, return and metric kernels work along axis 0, so a
+(time x parameter set) matrix of signals is backtested in one pass.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, Mapping, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from backtest.strategies import Strategy
+from indicators.graph import IndicatorGraph
+from signals.rules import evaluate_rules
+
+TRADING_DAYS = 252
+
+
+def _ffill(x: np.ndarray) -> np.ndarray:
+    """Carry the last non-NaN value forward along axis 0"""
+    bars = np.arange(len(x)).reshape((-1,) + (1,) * (x.ndim - 1))
+    last = np.where(np.isnan(x), 0, bars)
+    np.maximum.accumulate(last, axis=0, out=last)
+    return np.take_along_axis(x, last, axis=0)
+
+
+def target_positions(entries: np.ndarray, exits: np.ndarray) -> np.ndarray:
+    """Position wanted after each bar's close: 1 from an entry until the next exit, else 0
+
+    An exit on the same bar as an entry wins, so conflicting signals stay flat.
+    """
+    state = np.where(exits, 0.0, np.where(entries, 1.0, np.nan))
+    return np.nan_to_num(_ffill(state), nan=0.0)
+
+
+def simulate(close: np.ndarray, target: np.ndarray, cost: float = 0.0, initial_capital: float = 10_000.0):
+    """Held position, per-bar strategy returns and equity for target positions
+
+    `cost` is charged as a fraction of the traded value each time the
+    position changes (0.001 = 10 basis points).
+    """
+    c = np.asarray(close, dtype=np.float64)
+    if c.ndim < np.ndim(target):
+        c = c.reshape(c.shape + (1,) * (np.ndim(target) - c.ndim))
+
+    held = np.zeros(np.shape(target))
+    held[1:] = target[:-1]
+    bar_returns = np.zeros(c.shape)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        np.divide(c[1:], c[:-1], out=bar_returns[1:])
+    bar_returns[1:] -= 1
+    bar_returns = np.nan_to_num(bar_returns, nan=0.0, posinf=0.0, neginf=0.0)
+
+    turnover = np.abs(np.diff(held, axis=0, prepend=0.0))
+    returns = held * bar_returns - cost * turnover
+    equity = initial_capital * np.cumprod(1 + returns, axis=0)
+    return held, returns, equity
+
+
+def metrics(returns: np.ndarray, equity: np.ndarray, held: np.ndarray,
+            initial_capital: float = 10_000.0, periods_per_year: int = TRADING_DAYS) -> Dict[str, np.ndarray]:
+    """Total return, CAGR, annualized Sharpe ratio, max drawdown and exposure along axis 0"""
+    years = len(returns) / periods_per_year
+    growth = equity[-1] / initial_capital
+    std = returns.std(axis=0, ddof=1) if len(returns) > 1 else np.zeros(returns.shape[1:])
+    with np.errstate(invalid="ignore", divide="ignore"):
+        sharpe = np.where(std > 0, returns.mean(axis=0) / std * np.sqrt(periods_per_year), np.nan)
+        cagr = np.where(growth > 0, growth ** (1 / years) - 1, -1.0) if years > 0 else np.full(growth.shape, np.nan)
+    drawdown = equity / np.maximum.accumulate(np.maximum(equity, initial_capital), axis=0) - 1
+    return {
+        'total_return': growth - 1,
+        'cagr': cagr,
+        'sharpe': sharpe,
+        'max_drawdown': drawdown.min(axis=0),
+        'exposure': held.mean(axis=0),
+    }
+
+
+def trade_list(index: pd.Index, close: np.ndarray, held: np.ndarray, equity: np.ndarray,
+               initial_capital: float = 10_000.0, ends_flat: bool = False) -> pd.DataFrame:
+    """One row per round trip of a single backtest; a position still open is marked at the last close
+
+    With `ends_flat` the equity already includes selling at the last close,
+    so a position held on the last bar is a closed trade.
+    """
+    change = np.diff(held, prepend=0.0, append=0.0)
+    starts = np.flatnonzero(change[:-1] > 0)  # first bar held; bought at the previous close
+    ends = np.flatnonzero(change < 0)          # first bar flat again; sold at the previous close
+    entry_bar, exit_bar = starts - 1, ends - 1
+    before = np.concatenate(([initial_capital], equity))
+    # Equity after the exit bar's cost over equity before the entry bar's cost
+    after = equity[np.minimum(ends, len(equity) - 1)]
+    return pd.DataFrame({
+        'entry_date': index[entry_bar],
+        'exit_date': index[exit_bar],
+        'entry_price': close[entry_bar],
+        'exit_price': close[exit_bar],
+        'bars': exit_bar - entry_bar,
+        'return': after / before[starts] - 1,
+        'open': (ends == len(held)) & (not ends_flat),
+    })
+
+
+@dataclass
+class BacktestResult:
+    """Outcome of one strategy over one price history"""
+    strategy: str
+    params: Dict[str, float]
+    entry: str
+    exit: str
+    positions: pd.Series
+    returns: pd.Series
+    equity: pd.Series
+    benchmark: pd.Series
+    trades: pd.DataFrame
+    stats: Dict[str, float]
+
+
+def strategy_signals(inputs: Union[pd.DataFrame, Mapping[str, np.ndarray], IndicatorGraph],
+                     strategy: Strategy, params: Optional[Mapping[str, float]] = None):
+    """Entry and exit boolean arrays for a strategy; pass an IndicatorGraph to share indicators across calls"""
+    entry_rule, exit_rule = strategy.rules(params)
+    signals = evaluate_rules(inputs, {'entry': entry_rule, 'exit': exit_rule})
+    return signals['entry'], signals['exit']
+
+
+def run_backtest(df: pd.DataFrame, strategy: Strategy, params: Optional[Mapping[str, float]] = None,
+                 initial_capital: float = 10_000.0, cost: float = 0.0,
+                 graph: Optional[IndicatorGraph] = None) -> BacktestResult:
+    """Backtest a long/flat strategy on a price history
+
+    `graph` (an IndicatorGraph over `df`) lets repeated runs reuse indicators.
+    """
+    close = df['Close'].to_numpy(dtype=np.float64)
+    entries, exits = strategy_signals(df if graph is None else graph, strategy, params)
+    held, returns, equity = simulate(close, target_positions(entries, exits), cost, initial_capital)
+
+    trades = trade_list(df.index, close, held, equity, initial_capital)
+    return _result(df, strategy, params, held, returns, equity, trades, initial_capital)
+
+
+def _stats(close: np.ndarray, held: np.ndarray, returns: np.ndarray, equity: np.ndarray, trades: pd.DataFrame,
+           initial_capital: float, periods_per_year: int = TRADING_DAYS) -> Dict[str, float]:
+    """Metrics of one backtest plus trade count, win rate and the buy & hold return"""
+    stats = {name: float(value) for name, value in
+             metrics(returns, equity, held, initial_capital, periods_per_year).items()}
+    closed = trades[~trades['open']]
+    stats['trades'] = len(trades)
+    stats['win_rate'] = float((closed['return'] > 0).mean()) if len(closed) else np.nan
+    stats['buy_hold_return'] = float(close[-1] / close[0] - 1)
+    return stats
+
+
+def _result(df: pd.DataFrame, strategy: Strategy, params: Optional[Mapping[str, float]],
+            held: np.ndarray, returns: np.ndarray, equity: np.ndarray, trades: pd.DataFrame,
+            initial_capital: float, periods_per_year: int = TRADING_DAYS) -> BacktestResult:
+    """Summary statistics and the result record shared by the backtest engines"""
+    close = df['Close'].to_numpy(dtype=np.float64)
+    stats = _stats(close, held, returns, equity, trades, initial_capital, periods_per_year)
+
+    entry_rule, exit_rule = strategy.rules(params)
+    return BacktestResult(
+        strategy=strategy.name,
+        params=strategy.resolve(params),
+        entry=entry_rule,
+        exit=exit_rule,
+        positions=pd.Series(held, index=df.index),
+        returns=pd.Series(returns, index=df.index),
+        equity=pd.Series(equity, index=df.index),
+        benchmark=pd.Series(initial_capital * close / close[0], index=df.index),
+        trades=trades,
+        stats=stats,
+    )
@@ -0,0 +1,191 @@
+"""
+Walk-forward evaluation
+Splits the history into rolling (or anchored) train/test windows, picks the
+best parameter set on each train window and trades it on the following test
+window, then stitches the test windows into one out-of-sample equity curve.
+
+Windows run in parallel on a process pool over the shared-memory history of
+backtest.optimize. Signals are computed once over the whole history per
+parameter set and sliced per window (indicators only look back, so a window
+sees no later data), so overlapping windows on a worker reuse the same
+indicator arrays instead of recomputing them.
+"""
+
+from concurrent.futures import FIRST_COMPLETED, Executor, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from backtest.optimize import Handle, _attach, backtest_parameter_sets, shared_history
+from backtest.strategies import Params, Strategy
+from backtest.vectorized import (
+    TRADING_DAYS,
+    _stats,
+    metrics,
+    simulate,
+    strategy_signals,
+    target_positions,
+    trade_list,
+)
+from indicators.graph import IndicatorGraph
+
+# (train start, train end, test start, test end) bar indices, ends exclusive
+Window = Tuple[int, int, int, int]
+
+
+def walk_forward_windows(bars: int, train_bars: int, test_bars: int, anchored: bool = False) -> List[Window]:
+    """Consecutive test windows of `test_bars`, each after `train_bars` of training history
+
+    Anchored windows train on everything before the test window instead.
+    The last test window is cut short at the end of the history.
+    """
+    if train_bars < 2 or test_bars < 1:
+        raise ValueError("Walk-forward windows need at least 2 training bars and 1 test bar")
+    if train_bars + test_bars > bars:
+        raise ValueError(f"Not enough history: {bars} bars for {train_bars} training + {test_bars} test bars")
+    return [(0 if anchored else start - train_bars, start, start, min(start + test_bars, bars))
+            for start in range(train_bars, bars, test_bars)]
+
+
+def evaluate_window(graph: IndicatorGraph, strategy: Strategy, sets: Sequence[Params], window: Window,
+                    metric: str = 'sharpe', cost: float = 0.0, initial_capital: float = 10_000.0,
+                    periods_per_year: int = TRADING_DAYS) -> Dict:
+    """Best parameter set by `metric` on the train bars, and its returns over the test bars"""
+    train_start, train_end, test_start, test_end = window
+    rows = backtest_parameter_sets(graph, strategy, sets, cost, initial_capital, periods_per_year,
+                                   bars=slice(train_start, train_end))
+    scores = np.array([row[metric] for row in rows], dtype=np.float64)
+    best = int(np.argmax(np.nan_to_num(scores, nan=-np.inf)))
+
+    entries, exits = strategy_signals(graph, strategy, sets[best])
+    close = graph.evaluate(("input", "Close"))[test_start:test_end]
+    held, returns, equity = simulate(close, target_positions(entries[test_start:test_end], exits[test_start:test_end]),
+                                     cost, initial_capital)
+    returns[-1] = (1 + returns[-1]) * (1 - cost * held[-1]) - 1  # sold at the window's last close
+    equity = initial_capital * np.cumprod(1 + returns)
+    test = metrics(returns, equity, held, initial_capital, periods_per_year)
+    return {
+        'window': window,
+        'params': sets[best],
+        f'train_{metric}': rows[best][metric],
+        'test_sharpe': float(test['sharpe']),
+        'test_return': float(test['total_return']),
+        'held': held,
+        'returns': returns,
+    }
+
+
+def _window_task(handle: Handle, strategy: Strategy, sets: List[Params], window: Window, metric: str,
+                 cost: float, initial_capital: float, periods_per_year: int) -> Dict:
+    """Worker task: one walk-forward window over the shared history"""
+    return evaluate_window(_attach(handle), strategy, sets, window, metric, cost, initial_capital, periods_per_year)
+
+
+@dataclass
+class WalkForwardProgress:
+    """Running state of a walk-forward run; `windows` grows as windows complete"""
+
+    total: int
+    windows: List[Dict] = field(default_factory=list)
+
+    @property
+    def done(self) -> int:
+        return len(self.windows)
+
+
+@dataclass
+class WalkForwardResult:
+    """Stitched out-of-sample performance of a walk-forward run"""
+    strategy: str
+    windows: pd.DataFrame
+    positions: pd.Series
+    returns: pd.Series
+    equity: pd.Series
+    benchmark: pd.Series
+    trades: pd.DataFrame
+    stats: Dict[str, float]
+
+
+def walk_forward(df: pd.DataFrame, strategy: Strategy, sets: Sequence[Params], train_bars: int, test_bars: int,
+                 anchored: bool = False, metric: str = 'sharpe', cost: float = 0.0,
+                 initial_capital: float = 10_000.0, periods_per_year: int = TRADING_DAYS,
+                 workers: Optional[Executor] = None) -> Iterator[WalkForwardProgress]:
+    """Evaluate every walk-forward window on `workers`, yielding the progress as windows complete
+
+    Each test window starts flat and a position still open at its end is
+    sold at its last close. The pool is created for the run if not
+    given; pass the finished progress to stitch_walk_forward.
+    """
+    sets = [strategy.resolve(params) for params in sets]
+    if not sets:
+        raise ValueError("No parameter sets to search")
+    strategy_signals(df.iloc[:2], strategy, sets[0])  # invalid rules fail here, not in every worker
+    windows = walk_forward_windows(len(df), train_bars, test_bars, anchored)
+
+    progress = WalkForwardProgress(total=len(windows))
+    own_workers = workers is None
+    workers = ProcessPoolExecutor() if own_workers else workers
+    with shared_history(df) as handle:
+        pending = set()
+        try:
+            pending = {workers.submit(_window_task, handle, strategy, sets, window, metric, cost,
+                                      initial_capital, periods_per_year)
+                       for window in windows}
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    progress.windows.append(future.result())
+                yield progress
+        finally:
+            for future in pending:
+                future.cancel()
+            if own_workers:
+                workers.shutdown(wait=True)
+
+
+def stitch_walk_forward(df: pd.DataFrame, strategy: Strategy, progress: WalkForwardProgress,
+                        initial_capital: float = 10_000.0,
+                        periods_per_year: int = TRADING_DAYS) -> WalkForwardResult:
+    """Out-of-sample positions, returns, equity, trades and statistics over the completed test windows"""
+    windows = sorted(progress.windows, key=lambda w: w['window'])
+    start, end = windows[0]['window'][2], windows[-1]['window'][3]
+    index = df.index[start:end]
+    close = df['Close'].to_numpy(dtype=np.float64)[start:end]
+    held = np.concatenate([w['held'] for w in windows])
+    returns = np.concatenate([w['returns'] for w in windows])
+    equity = initial_capital * np.cumprod(1 + returns)
+
+    trades = trade_list(index, close, held, equity, initial_capital, ends_flat=True)  # the last window sells at its close
+    stats = _stats(close, held, returns, equity, trades, initial_capital, periods_per_year)
+
+    table = pd.DataFrame([{
+        'train_start': df.index[w['window'][0]],
+        'train_end': df.index[w['window'][1] - 1],
+        'test_start': df.index[w['window'][2]],
+        'test_end': df.index[w['window'][3] - 1],
+        **w['params'],
+        **{name: value for name, value in w.items() if name.startswith(('train_', 'test_'))},
+    } for w in windows])
+    return WalkForwardResult(
+        strategy=strategy.name,
+        windows=table,
+        positions=pd.Series(held, index=index),
+        returns=pd.Series(returns, index=index),
+        equity=pd.Series(equity, index=index),
+        benchmark=pd.Series(initial_capital * close / close[0], index=index),
+        trades=trades,
+        stats=stats,
+    )
+
+
+def run_walk_forward(df: pd.DataFrame, strategy: Strategy, sets: Sequence[Params], train_bars: int,
+                     test_bars: int, initial_capital: float = 10_000.0,
+                     periods_per_year: int = TRADING_DAYS, **kwargs) -> WalkForwardResult:
+    """Walk-forward run to completion; keyword arguments are passed on to walk_forward"""
+    progress = None
+    for progress in walk_forward(df, strategy, sets, train_bars, test_bars, initial_capital=initial_capital,
+                                 periods_per_year=periods_per_year, **kwargs):
+        pass
+    return stitch_walk_forward(df, strategy, progress, initial_capital, periods_per_year)
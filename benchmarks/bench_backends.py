@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Indicator backend parity report and benchmark
+Times every installed backend (NumPy, pandas, TA-Lib, ta) per indicator on
+1k, 100k and 1M bars, reports how far each is from the NumPy reference and
+suggests the fastest backend that matches it for each indicator
+Run: python benchmarks/bench_backends.py
+"""
+
+import os
+import sys
+import timeit
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from indicators.backends import BACKENDS, parity_report
+
+
+def make_bars(n, seed=3):
+    """Random-walk OHLCV frame on a minute index"""
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 0.1, n))
+    spread = rng.random(n) * 0.2
+    return pd.DataFrame({
+        'Open': close,
+        'High': close + spread,
+        'Low': close - spread,
+        'Close': close,
+        'Volume': rng.integers(1_000, 1_000_000, n).astype(np.float64),
+    }, index=pd.date_range("2000-01-03", periods=n, freq="min"))
+
+
+def best_of(fn, repeat=3):
+    """Fastest of `repeat` runs in milliseconds"""
+    timer = timeit.Timer(fn)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number * 1000
+
+
+def main():
+    installed = [name for name, backend in BACKENDS.items() if backend.available]
+    missing = [name for name in BACKENDS if name not in installed]
+    print(f"Backends: {', '.join(installed)}" + (f" (not installed: {', '.join(missing)})" if missing else ""))
+
+    df = make_bars(100_000)
+    report = parity_report(df)
+    print("\nParity against numpy on 100,000 bars")
+    print(report.to_string(index=False, float_format=lambda x: f"{x:.2e}"))
+
+    timings = {}
+    for n in (1_000, 100_000, 1_000_000):
+        bars = make_bars(n)
+        print(f"\n{n:,} bars, milliseconds per indicator")
+        print(f"{'indicator':<13}" + "".join(f"{name:>10}" for name in installed))
+        for column in BACKENDS["numpy"].columns:
+            row = {}
+            for name in installed:
+                backend = BACKENDS[name]
+                if column in backend.columns:
+                    row[name] = best_of(lambda: backend.compute(bars, [column]))
+            timings[(n, column)] = row
+            print(f"{column:<13}" + "".join(f"{row[name]:>10.3f}" if name in row else f"{'-':>10}"
+                                            for name in installed))
+
+    # Fastest backend per indicator among those matching the reference at 1M bars;
+    # NumPy is kept unless another backend is clearly (20%) faster
+    matching = {(row.indicator, row.backend) for row in report.itertuples() if row.match}
+    overrides = []
+    print("\nFastest backend matching numpy (1,000,000 bars)")
+    for column in BACKENDS["numpy"].columns:
+        row = timings[(1_000_000, column)]
+        candidates = {name: ms for name, ms in row.items() if name == "numpy" or (column, name) in matching}
+        fastest = min(candidates, key=candidates.get)
+        if candidates[fastest] > 0.8 * candidates["numpy"]:
+            fastest = "numpy"
+        print(f"  {column:<13} {fastest:<8} {candidates[fastest]:>10.3f} ms")
+        if fastest != "numpy":
+            overrides.append(f"{column}={fastest}")
+    print(f"\nSTOCKS_INDICATOR_BACKEND={','.join(['numpy'] + overrides)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Vectorized backtester benchmark
+Runs every Strategy Tester strategy over 20 years of daily bars, checks the
+positions and equity against a plain bar-by-bar loop and times both the full
+backtest (indicators included) and the position/equity simulation alone
+Run: python benchmarks/bench_backtest.py
+"""
+
+import os
+import sys
+import timeit
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backtest import STRATEGIES, run_backtest, simulate, strategy_signals, target_positions
+
+COST = 0.001
+
+
+def make_daily_bars(years=20, seed=5):
+    """Geometric random-walk OHLCV frame on a business-day index"""
+    n = years * 252
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0.0003, 0.015, n)))
+    spread = close * rng.random(n) * 0.02
+    return pd.DataFrame({
+        'Open': close,
+        'High': close + spread,
+        'Low': close - spread,
+        'Close': close,
+        'Volume': rng.lognormal(13, 0.5, n),
+    }, index=pd.bdate_range("2005-01-03", periods=n))
+
+
+def loop_backtest(close, entries, exits, cost, initial_capital=10_000.0):
+    """Reference: one bar at a time, acting on signals at the close"""
+    held = np.zeros(len(close))
+    equity = np.zeros(len(close))
+    position, previous, value = 0.0, 0.0, initial_capital
+    for t in range(len(close)):
+        bar_return = close[t] / close[t - 1] - 1 if t else 0.0
+        value *= 1 + position * bar_return - cost * abs(position - previous)
+        held[t], equity[t], previous = position, value, position
+        if exits[t]:
+            position = 0.0
+        elif entries[t]:
+            position = 1.0
+    return held, equity
+
+
+def best_of(fn, repeat=5):
+    """Fastest of `repeat` runs in milliseconds"""
+    timer = timeit.Timer(fn)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number * 1000
+
+
+def main():
+    df = make_daily_bars()
+    close = df['Close'].to_numpy()
+    print(f"{len(df):,} daily bars (20 years), cost {COST:.2%} per trade")
+    print(f"{'strategy':<26} {'trades':>7} {'return':>9} {'sharpe':>7} {'backtest ms':>12} {'simulate ms':>12} {'loop ms':>9}")
+    for name, strategy in STRATEGIES.items():
+        result = run_backtest(df, strategy, cost=COST)
+        entries, exits = strategy_signals(df, strategy)
+        held, equity = loop_backtest(close, entries, exits, COST)
+        assert np.array_equal(held, result.positions.to_numpy()), f"{name}: positions differ"
+        assert np.allclose(equity, result.equity.to_numpy(), rtol=1e-10), f"{name}: equity differs"
+
+        full = best_of(lambda: run_backtest(df, strategy, cost=COST))
+        kernel = best_of(lambda: simulate(close, target_positions(entries, exits), COST))
+        loop = best_of(lambda: loop_backtest(close, entries, exits, COST), repeat=3)
+        stats = result.stats
+        print(f"{name:<26} {stats['trades']:>7} {stats['total_return']:>9.1%} {stats['sharpe']:>7.2f} "
+              f"{full:>12.2f} {kernel:>12.3f} {loop:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
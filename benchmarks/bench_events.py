@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Event-driven backtester benchmark
+Checks the event engine's fills against a plain bar-by-bar order simulation
+for every strategy and order setting on daily bars, then times it on 1M and
+5M minute bars
+Run: python benchmarks/bench_events.py
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backtest import STRATEGIES, run_event_backtest, simulate_orders, strategy_signals
+
+SETTINGS = [
+    dict(),
+    dict(stop_loss=0.03),
+    dict(take_profit=0.05),
+    dict(stop_loss=0.02, take_profit=0.04),
+    dict(order_type="limit", limit_offset=0.005, limit_bars=3),
+    dict(order_type="limit", limit_offset=0.01, limit_bars=5, stop_loss=0.03, take_profit=0.06),
+    dict(order_type="limit", limit_offset=0.03, limit_bars=20),
+]
+
+
+def make_bars(n, seed=7, freq="B", vol=0.015):
+    """Geometric random walk with gaps: open, high, low, close and volume"""
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, vol, n)))
+    open_ = np.concatenate(([100.0], close[:-1])) * np.exp(rng.normal(0, vol / 3, n))
+    high = np.maximum(open_, close) * (1 + rng.random(n) * vol)
+    low = np.minimum(open_, close) * (1 - rng.random(n) * vol)
+    return pd.DataFrame({
+        'Open': open_, 'High': high, 'Low': low, 'Close': close,
+        'Volume': rng.lognormal(10, 0.5, n),
+    }, index=pd.date_range("2000-01-03", periods=n, freq=freq))
+
+
+def loop_orders(o, h, l, c, entries, exits, order_type="market", limit_offset=0.0, limit_bars=1,
+                stop_loss=None, take_profit=None):
+    """Reference: every bar in turn, fills first, then the close's signals (ndarray indexing, no JIT)"""
+    n = len(c)
+    fills = []
+    position = order = None
+    exit_next = False
+    for t in range(n):
+        if position is None and order is not None:
+            kind, limit, expires = order
+            if kind == "market":
+                position, order, watch = [t, o[t]], None, t
+            elif l[t] <= limit:
+                position, order, watch = [t, min(o[t], limit)], None, t + 1
+            elif t >= expires:
+                order = None
+            if position is not None:
+                price = position[1]
+                stop = price * (1 - stop_loss) if stop_loss else -np.inf
+                target = price * (1 + take_profit) if take_profit else np.inf
+
+        if position is not None:
+            if exit_next:
+                fills.append((position[0], position[1], t, o[t], 1))
+                position, exit_next = None, False
+            elif t >= watch and l[t] <= stop:
+                fills.append((position[0], position[1], t, min(o[t], stop), 2))
+                position = None
+            elif t >= watch and h[t] >= target:
+                fills.append((position[0], position[1], t, max(o[t], target), 3))
+                position = None
+
+        if position is None and order is None and entries[t] and not exits[t] and t + 1 < n:
+            order = ("market", np.nan, t + 1) if order_type == "market" else \
+                ("limit", c[t] * (1 - limit_offset), min(n - 1, t + limit_bars))
+        elif order is not None and exits[t]:
+            order = None
+        elif position is not None and exits[t] and t < n - 1:
+            exit_next = True
+
+    if position is not None:
+        fills.append((position[0], position[1], n - 1, c[-1], 4))
+    return np.array(fills, dtype=np.float64).reshape(-1, 5)
+
+
+def main():
+    df = make_bars(5_040)
+    arrays = [df[name].to_numpy() for name in ('Open', 'High', 'Low', 'Close')]
+    checked = 0
+    for name, strategy in STRATEGIES.items():
+        entries, exits = strategy_signals(df, strategy)
+        for settings in SETTINGS:
+            ours = simulate_orders(*arrays, entries, exits, **settings)
+            reference = loop_orders(*arrays, entries, exits, **settings)
+            assert np.array_equal(ours, reference), f"{name} {settings}: fills differ"
+            checked += len(ours)
+    print(f"Fills match the bar-by-bar loop: {len(STRATEGIES)} strategies x {len(SETTINGS)} order settings, {checked:,} trades")
+
+    strategy = STRATEGIES["RSI Mean Reversion"]
+    settings = dict(stop_loss=0.002, take_profit=0.004)
+    print(f"\n{strategy.name} on minute bars, {settings}")
+    print(f"{'bars':>10} {'trades':>8} {'signals ms':>11} {'events ms':>10} {'backtest ms':>12} {'loop ms':>9}")
+    for n in (1_000_000, 5_000_000):
+        bars = make_bars(n, freq="min", vol=0.001)
+        arrays = [bars[name].to_numpy() for name in ('Open', 'High', 'Low', 'Close')]
+
+        started = time.perf_counter()
+        entries, exits = strategy_signals(bars, strategy)
+        signals_ms = (time.perf_counter() - started) * 1000
+        started = time.perf_counter()
+        fills = simulate_orders(*arrays, entries, exits, **settings)
+        events_ms = (time.perf_counter() - started) * 1000
+        started = time.perf_counter()
+        run_event_backtest(bars, strategy, **settings, periods_per_year=252 * 390)
+        backtest_ms = (time.perf_counter() - started) * 1000
+
+        loop_ms = "-"
+        if n <= 1_000_000:
+            started = time.perf_counter()
+            assert np.array_equal(loop_orders(*arrays, entries, exits, **settings), fills)
+            loop_ms = f"{(time.perf_counter() - started) * 1000:.0f}"
+        print(f"{n:>10,} {len(fills):>8,} {signals_ms:>11.0f} {events_ms:>10.0f} {backtest_ms:>12.0f} {loop_ms:>9}")
+
+
+if __name__ == "__main__":
+    main()
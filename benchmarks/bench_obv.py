@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+On-Balance Volume benchmark
+Compares the original bar-by-bar Python loop, the NumPy kernel and TA-Lib
+Run: python benchmarks/bench_obv.py
+"""
+
+import os
+import sys
+import timeit
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from indicators import obv
+
+# Try to import TA-Lib, skip it in the comparison if not available
+try:
+    import talib
+    TALIB_AVAILABLE = True
+except ImportError:
+    TALIB_AVAILABLE = False
+
+
+def obv_loop(close, volume):
+    """The original Python loop from advanced_app.py"""
+    result = [0]
+    for i in range(1, len(close)):
+        if close[i] > close[i-1]:
+            result.append(result[-1] + volume[i])
+        elif close[i] < close[i-1]:
+            result.append(result[-1] - volume[i])
+        else:
+            result.append(result[-1])
+    return result
+
+
+def make_series(n, seed=42):
+    """Random-walk closes (rounded to cents so flat bars occur) and volumes"""
+    rng = np.random.default_rng(seed)
+    close = np.round(100 + np.cumsum(rng.normal(0, 0.5, n)), 2)
+    volume = rng.integers(1_000, 1_000_000, n).astype(np.float64)
+    return close, volume
+
+
+def best_of(fn, repeat=5):
+    """Fastest of `repeat` runs in milliseconds"""
+    timer = timeit.Timer(fn)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number * 1000
+
+
+def main():
+    print("On-Balance Volume benchmark (best of 5, milliseconds)")
+    print(f"{'bars':>10} {'loop':>10} {'numpy':>10} {'talib':>10} {'vs loop':>9} {'vs talib':>9}")
+
+    for n in (2_520, 100_000, 1_000_000):  # 10y daily, ~1y of minutes, ~10y of minutes
+        close, volume = make_series(n)
+
+        # Same values as the loop; TA-Lib seeds the first bar with its volume
+        assert np.allclose(obv(close, volume), obv_loop(close, volume))
+        if TALIB_AVAILABLE:
+            assert np.allclose(obv(close, volume) + volume[0], talib.OBV(close, volume))
+
+        loop_ms = best_of(lambda: obv_loop(close, volume), repeat=3)
+        numpy_ms = best_of(lambda: obv(close, volume))
+        talib_ms = best_of(lambda: talib.OBV(close, volume)) if TALIB_AVAILABLE else float("nan")
+
+        print(f"{n:>10,} {loop_ms:>10.3f} {numpy_ms:>10.3f} {talib_ms:>10.3f} "
+              f"{loop_ms / numpy_ms:>8.0f}x {talib_ms / numpy_ms:>8.2f}x")
+
+    if not TALIB_AVAILABLE:
+        print("TA-Lib not installed; talib column skipped")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Parameter optimizer benchmark
+Checks every optimizer row against a separate run_backtest for each strategy's
+full grid on 20 years of daily bars, then times the search against a loop of
+run_backtest calls, and shows the size of a task with shared memory versus
+pickling the price arrays into every task
+Run: python benchmarks/bench_optimize.py
+"""
+
+import os
+import pickle
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backtest import STRATEGIES, run_backtest
+from backtest.optimize import PRICE_FIELDS, SEARCH_METRICS, optimize, parameter_sets
+from bench_backtest import COST, make_daily_bars
+
+
+def main():
+    df = make_daily_bars()
+    print(f"{len(df):,} daily bars, {os.cpu_count()} CPUs, cost {COST:.2%} per trade")
+    print(f"{'strategy':<26} {'sets':>5} {'search s':>9} {'loop s':>7} {'best sharpe':>12}")
+    for name, strategy in STRATEGIES.items():
+        sets = parameter_sets(strategy)
+        started = time.perf_counter()
+        results = optimize(df, strategy, cost=COST)
+        search = time.perf_counter() - started
+
+        started = time.perf_counter()
+        expected = {tuple(params.values()): run_backtest(df, strategy, params, cost=COST).stats for params in sets}
+        loop = time.perf_counter() - started
+
+        assert len(results) == len(sets), f"{name}: missing rows"
+        for row in results.to_dict('records'):
+            stats = expected[tuple(row[param] for param in strategy.params)]
+            for metric in SEARCH_METRICS:
+                assert np.isclose(row[metric], stats[metric], equal_nan=True), f"{name} {row}: {metric} differs"
+        print(f"{name:<26} {len(sets):>5} {search:>9.2f} {loop:>7.2f} {results['sharpe'].iloc[0]:>12.2f}")
+
+    sets = parameter_sets(STRATEGIES["Moving Average Crossover"])[:8]
+    prices = {field: df[field].to_numpy() for field in PRICE_FIELDS}
+    handle = ("psm_0123abcd", (len(PRICE_FIELDS), len(df)), PRICE_FIELDS)
+    shared = len(pickle.dumps((handle, sets)))
+    pickled = len(pickle.dumps((prices, sets)))
+    print(f"\nTask payload for 8 parameter sets: {shared:,} bytes shared vs {pickled:,} bytes pickled")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Walk-forward benchmark
+Checks the stitched out-of-sample equity of every strategy (2-year train,
+6-month test windows over 20 years of daily bars) against a plain bar-by-bar
+loop over each test window, then times the walk-forward run against
+recomputing indicators for every window and parameter set
+Run: python benchmarks/bench_walkforward.py
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backtest import STRATEGIES, run_backtest, strategy_signals
+from backtest.optimize import parameter_sets
+from backtest.walkforward import run_walk_forward, walk_forward_windows
+from bench_backtest import COST, loop_backtest, make_daily_bars
+
+TRAIN_BARS, TEST_BARS = 504, 126
+
+
+def main():
+    df = make_daily_bars()
+    close = df['Close'].to_numpy()
+    windows = walk_forward_windows(len(df), TRAIN_BARS, TEST_BARS)
+    print(f"{len(df):,} daily bars, {len(windows)} windows of {TRAIN_BARS} train + {TEST_BARS} test bars, "
+          f"{os.cpu_count()} CPUs")
+    print(f"{'strategy':<26} {'sets':>5} {'walk-forward s':>15} {'recompute s':>12} {'oos return':>11} {'oos sharpe':>11}")
+    for name, strategy in STRATEGIES.items():
+        sets = parameter_sets(strategy)
+        started = time.perf_counter()
+        result = run_walk_forward(df, strategy, sets, TRAIN_BARS, TEST_BARS, cost=COST)
+        walk = time.perf_counter() - started
+
+        # Reference: each window's chosen parameters traded bar by bar from flat, sold at the window's end
+        equity = []
+        value = 10_000.0
+        for (_, _, start, end), row in zip(windows, result.windows.to_dict('records')):
+            entries, exits = strategy_signals(df, strategy, {param: row[param] for param in strategy.params})
+            held, window_equity = loop_backtest(close[start:end], entries[start:end], exits[start:end], COST, value)
+            window_equity[-1] *= 1 - COST * held[-1]
+            equity.append(window_equity)
+            value = window_equity[-1]
+        assert np.allclose(np.concatenate(equity), result.equity.to_numpy(), rtol=1e-10), f"{name}: equity differs"
+
+        # Naive: every window backtests every parameter set on its own slice, recomputing indicators
+        started = time.perf_counter()
+        for train_start, train_end, _, _ in windows:
+            train = df.iloc[train_start:train_end]
+            for params in sets:
+                run_backtest(train, strategy, params, cost=COST)
+        recompute = time.perf_counter() - started
+
+        stats = result.stats
+        print(f"{name:<26} {len(sets):>5} {walk:>15.2f} {recompute:>12.2f} {stats['total_return']:>11.1%} "
+              f"{stats['sharpe']:>11.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Numba backend parity check and benchmark
+Checks the compiled kernels against the NumPy kernels and pandas on series
+with NaN gaps and on a (time x symbol) panel, then times both backends.
+Without Numba the same loops run as plain Python on short series, so parity
+is still checked and the timings are skipped.
+Run: python benchmarks/parity_jit.py
+"""
+
+import os
+import sys
+import timeit
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from indicators import core, jit
+
+
+@contextmanager
+def backend(enabled):
+    """Run indicators.core with the compiled kernels switched on or off"""
+    previous = jit.JIT_ENABLED
+    jit.JIT_ENABLED = enabled
+    try:
+        yield
+    finally:
+        jit.JIT_ENABLED = previous
+
+
+def make_prices(n, seed=7):
+    """High/low/close random walk with a leading gap and one missing bar"""
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 1, n))
+    spread = rng.random(n) * 2
+    high, low = close + spread, close - spread
+    for x in (high, low, close):
+        x[:5] = np.nan
+    close[n // 2] = np.nan
+    return high, low, close
+
+
+def wilder_reference(x, period):
+    """Wilder smoothing with pandas: simple-mean seed, then ewm(alpha=1/period, adjust=False)"""
+    seed = np.mean(x[:period])
+    tail = pd.Series(np.concatenate(([seed], x[period:])))
+    return np.concatenate((np.full(period - 1, np.nan), tail.ewm(alpha=1 / period, adjust=False).mean()))
+
+
+def kernels(high, low, close):
+    """Every kernel the compiled backend replaces, by name"""
+    return {
+        "ema_12": lambda: core.ema(close, 12),
+        "macd": lambda: np.stack(core.macd(close)),
+        "rsi_wilder": lambda: core.rsi(close, 14, method="wilder"),
+        "rolling_min_14": lambda: core.rolling_min(low, 14),
+        "rolling_max_14": lambda: core.rolling_max(high, 14),
+        "stochastic": lambda: np.stack(core.stochastic(high, low, close)),
+    }
+
+
+def check_parity(n):
+    high, low, close = make_prices(n)
+    panel = [np.column_stack([x, x[::-1]]) for x in (high, low, close)]
+
+    for label, series in (("series", (high, low, close)), ("panel", panel)):
+        with backend(False):
+            expected = {name: fn() for name, fn in kernels(*series).items()}
+        with backend(True):
+            actual = {name: fn() for name, fn in kernels(*series).items()}
+        for name in expected:
+            assert np.allclose(actual[name], expected[name], equal_nan=True, rtol=1e-9, atol=1e-9), (label, name)
+            print(f"  {label:<6} {name:<15} compiled == numpy")
+
+    # Against pandas directly, for the recursions pandas can express
+    clean = close[5:n // 2]
+    with backend(True):
+        assert np.allclose(core.ema(close, 12), pd.Series(close).ewm(span=12).mean(), equal_nan=True)
+        assert np.allclose(core.rolling_min(low, 14), pd.Series(low).rolling(14).min(), equal_nan=True)
+        assert np.allclose(core.rolling_max(high, 14), pd.Series(high).rolling(14).max(), equal_nan=True)
+        assert np.allclose(core.wilder_average(clean, 14), wilder_reference(clean, 14), equal_nan=True)
+    print("  series ema/min/max/wilder      compiled == pandas")
+
+
+def best_of(fn, repeat=5):
+    """Fastest of `repeat` runs in milliseconds"""
+    timer = timeit.Timer(fn)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number * 1000
+
+
+def benchmark():
+    print(f"\n{'kernel':<15} {'bars':>10} {'numpy ms':>10} {'numba ms':>10} {'speedup':>8}")
+    for n in (100_000, 1_000_000):
+        high, low, close = make_prices(n)
+        for name, fn in kernels(high, low, close).items():
+            with backend(True):
+                fn()  # compile outside the timing
+                numba_ms = best_of(fn)
+            with backend(False):
+                numpy_ms = best_of(fn)
+            print(f"{name:<15} {n:>10,} {numpy_ms:>10.3f} {numba_ms:>10.3f} {numpy_ms / numba_ms:>7.1f}x")
+
+
+def main():
+    # Pure-Python loops are slow, so keep the series short when Numba is missing
+    n = 100_000 if jit.NUMBA_AVAILABLE else 3_000
+    print(f"Parity on {n:,} bars ({'numba' if jit.NUMBA_AVAILABLE else 'python loops, numba not installed'})")
+    check_parity(n)
+
+    if jit.NUMBA_AVAILABLE:
+        benchmark()
+    else:
+        print("\nNumba not installed; benchmark skipped (pip install numba)")
+
+
+if __name__ == "__main__":
+    main()
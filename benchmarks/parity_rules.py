@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Rule expression parity check
+Evaluates rules the way the Signal History custom-rule box does (price frame
+plus the cached indicator frame as `known`) and checks the result against the
+same rules evaluated from prices alone and with a plain dict of arrays. The
+frame comes from the configured backend, so set STOCKS_INDICATOR_BACKEND
+(e.g. talib or pandas) to check that its columns do not leak into the rules
+Run: python benchmarks/parity_rules.py
+"""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from indicators import IndicatorCache
+from signals import SIGNAL_RULES, evaluate_rules
+
+RULES = [
+    'RSI(14) < 30 and Close > SMA(50)',
+    'CROSSES_ABOVE(MACD(12, 26, 9), MACD_SIGNAL(12, 26, 9))',
+    'Close < BB_LOWER(20, 2) or VOLUME_RATIO(20) > 1.5',
+] + list(SIGNAL_RULES.values())
+
+
+def make_bars(n=2_000, seed=3):
+    """Random-walk OHLCV frame on a business-day index"""
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.015, n)))
+    spread = close * rng.random(n) * 0.02
+    return pd.DataFrame({
+        'Open': close, 'High': close + spread, 'Low': close - spread, 'Close': close,
+        'Volume': rng.lognormal(13, 0.5, n),
+    }, index=pd.bdate_range("2015-01-01", periods=n))
+
+
+def main():
+    df = make_bars()
+    ind = IndicatorCache().frame("TEST", df)
+    expected = evaluate_rules(df, RULES)
+    for known in (ind, {name: ind[name].to_numpy() for name in ind.columns}):
+        values = evaluate_rules(df, RULES, known=known)
+        for rule in RULES:
+            assert np.array_equal(values[rule], expected[rule]), f"{type(known).__name__} known: {rule} differs"
+    print(f"{len(RULES)} rules match with a DataFrame and a dict of known indicator columns")
+
+
+if __name__ == "__main__":
+    main()
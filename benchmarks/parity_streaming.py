@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Streaming indicator parity check and benchmark
+Checks StreamingIndicators, seeded from part of a history and updated one bar
+at a time, against the NumPy kernels over the full history (series with NaN
+gaps included), then checks IndicatorCache's streamed refresh path (new
+bars appended to a cached history, then a live change to the latest bar)
+against a full recompute and times both. Streaming covers NumPy-backed
+columns only, so the cache runs on the numpy backend whatever is configured
+Run: python benchmarks/parity_streaming.py
+"""
+
+import os
+import sys
+import timeit
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from indicators import IndicatorCache, StreamingIndicators, indicator_values
+from indicators.streaming import STREAMING_COLUMNS
+
+FIELDS = ['High', 'Low', 'Close', 'Volume']
+
+
+def make_bars(n, seed=9, gaps=False):
+    """Random-walk OHLCV frame; with gaps, a few NaN bars in the middle"""
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.015, n)))
+    spread = close * rng.random(n) * 0.02
+    df = pd.DataFrame({
+        'Open': close, 'High': close + spread, 'Low': close - spread, 'Close': close,
+        'Volume': rng.lognormal(13, 0.5, n),
+    }, index=pd.bdate_range("2000-01-03", periods=n))
+    if gaps:
+        df.iloc[n // 2:n // 2 + 3] = np.nan
+    return df
+
+
+def check(got, expected, label):
+    for name in STREAMING_COLUMNS:
+        assert np.allclose(got[name], expected[name], rtol=1e-9, atol=1e-9, equal_nan=True), f"{label}: {name} differs"
+
+
+def main():
+    for gaps in (False, True):
+        df = make_bars(3_000, gaps=gaps)
+        for seeded in (0, 1, 30, 500):
+            state = StreamingIndicators.from_history(df.iloc[:seeded])
+            rows = [state.update(*df[FIELDS].iloc[i]) for i in range(seeded, len(df))]
+            got = {name: np.array([row[name] for row in rows]) for name in STREAMING_COLUMNS}
+            expected = {name: values[seeded:] for name, values in
+                        indicator_values(df, STREAMING_COLUMNS, "numpy").items()}
+            check(got, expected, f"seeded with {seeded} bars{' (NaN gaps)' if gaps else ''}")
+    print(f"StreamingIndicators matches the NumPy kernels for {len(STREAMING_COLUMNS)} columns")
+
+    print(f"\n{'bars':>10} {'recompute ms':>13} {'streamed ms':>12}")
+    for n in (1_000, 10_000, 100_000):
+        df = make_bars(n + 2)
+        live = df.copy()
+        live.iloc[-1, live.columns.get_loc('Close')] *= 1.01  # the latest bar moves during the session
+
+        cache = IndicatorCache()
+        cache.get("TEST", df.iloc[:n], STREAMING_COLUMNS, "numpy")
+        for frame in (df.iloc[:n + 1], df, live):
+            streamed = cache.get("TEST", frame, STREAMING_COLUMNS, "numpy")
+            check(streamed, indicator_values(frame, STREAMING_COLUMNS, "numpy"), f"{n} bars cache")
+        assert cache.streamed == 3 * len(STREAMING_COLUMNS), "refreshes were recomputed"
+        df = df.iloc[:n + 1]
+
+        recompute = min(timeit.repeat(lambda: indicator_values(df, STREAMING_COLUMNS, "numpy"), number=1, repeat=5))
+
+        def refresh():
+            cache.clear()
+            cache.get("TEST", df.iloc[:n], STREAMING_COLUMNS, "numpy")
+            started = timeit.default_timer()
+            cache.get("TEST", df, STREAMING_COLUMNS, "numpy")
+            return timeit.default_timer() - started
+        streamed = min(refresh() for _ in range(5))
+        print(f"{n:>10,} {recompute * 1000:>13.2f} {streamed * 1000:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+TA-Lib parity check for ATR, Williams %R, MFI, ADX and CCI
+Compares the NumPy kernels with TA-Lib on a random-walk series and times both
+Run: python benchmarks/parity_talib.py (requires TA-Lib)
+"""
+
+import os
+import sys
+import timeit
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from indicators import adx, atr, cci, mfi, williams_r
+
+# Try to import TA-Lib, nothing to compare against if not available
+try:
+    import talib
+    TALIB_AVAILABLE = True
+except ImportError:
+    TALIB_AVAILABLE = False
+
+
+def make_bars(n, seed=11):
+    """Random-walk high/low/close and volume; a geometric walk keeps prices positive"""
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    high = close * (1 + rng.random(n) * 0.02)
+    low = close * (1 - rng.random(n) * 0.02)
+    volume = rng.integers(1_000, 1_000_000, n).astype(np.float64)
+    return high, low, close, volume
+
+
+def pairs(high, low, close, volume):
+    """(NumPy kernel, TA-Lib function) per indicator, with the apps' periods"""
+    return {
+        "ATR": (lambda: atr(high, low, close, 14), lambda: talib.ATR(high, low, close, timeperiod=14)),
+        "Williams_R": (lambda: williams_r(high, low, close, 14), lambda: talib.WILLR(high, low, close, timeperiod=14)),
+        "MFI": (lambda: mfi(high, low, close, volume, 14), lambda: talib.MFI(high, low, close, volume, timeperiod=14)),
+        "ADX": (lambda: adx(high, low, close, 14)[0], lambda: talib.ADX(high, low, close, timeperiod=14)),
+        "CCI": (lambda: cci(high, low, close, 20), lambda: talib.CCI(high, low, close, timeperiod=20)),
+    }
+
+
+def best_of(fn, repeat=5):
+    """Fastest of `repeat` runs in milliseconds"""
+    timer = timeit.Timer(fn)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number * 1000
+
+
+def main():
+    if not TALIB_AVAILABLE:
+        print("TA-Lib not installed; nothing to compare against")
+        return
+
+    print(f"{'indicator':<11} {'bars':>10} {'max diff':>10} {'numpy ms':>10} {'talib ms':>10}")
+    for n in (2_520, 100_000):
+        for name, (numpy_fn, talib_fn) in pairs(*make_bars(n)).items():
+            ours, theirs = numpy_fn(), talib_fn()
+            assert np.array_equal(np.isnan(ours), np.isnan(theirs)), f"{name}: warm-up bars differ"
+            diff = np.nanmax(np.abs(ours - theirs))
+            assert diff < 1e-6, f"{name}: max difference {diff}"
+            print(f"{name:<11} {n:>10,} {diff:>10.1e} {best_of(numpy_fn):>10.3f} {best_of(talib_fn):>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,6 +7,8 @@ import numpy as np
 import yfinance as yf
 from datetime import datetime, timedelta
 
+from indicators import sma
+
 # Page configuration
 st.set_page_config(
     page_title="Advanced Stock Trading Education Hub",
@@ -458,8 +460,8 @@ elif page == "📈 Technical Analysis":
         dates = pd.date_range('2023-01-01', periods=100, freq='D')
         prices = 100 + np.cumsum(np.random.randn(100) * 0.5)
         df = pd.DataFrame({'Date': dates, 'Price': prices})
-        df['SMA_20'] = df['Price'].rolling(window=20).mean()
-        df['SMA_50'] = df['Price'].rolling(window=50).mean()
+        df['SMA_20'] = sma(df['Price'].values, 20)
+        df['SMA_50'] = sma(df['Price'].values, 50)
         
         fig = go.Figure()
         fig.add_trace(go.Scatter(x=df['Date'], y=df['Price'], name='Stock Price', line=dict(color='blue')))
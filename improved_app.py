@@ -4,13 +4,19 @@ import plotly.graph_objects as go
 import plotly.express as px
 from plotly.subplots import make_subplots
 import numpy as np
-import yfinance as yf
 from datetime import datetime, timedelta
 import requests
+import io
 import json
+from concurrent.futures import ProcessPoolExecutor
 import time
 from typing import Dict, List, Optional, Tuple
 
+from indicators import IndicatorCache
+from signals import evaluate_rules, signal_frame, signal_stats
+from screener import SCREEN_RULES, scan_universe
+from market_data import HistoryCache, MarketDataProvider, OHLCVStore, get_provider
+
 # Page configuration
 st.set_page_config(
     page_title="🚀 Advanced Stock Trading Education Hub",
@@ -138,135 +144,136 @@ if 'watchlist' not in st.session_state:
     st.session_state.watchlist = []
 if 'learning_progress' not in st.session_state:
     st.session_state.learning_progress = {}
+if 'screener_results' not in st.session_state:
+    st.session_state.screener_results = None
 if 'current_stock' not in st.session_state:
     st.session_state.current_stock = None
 
+# Market data source (Yahoo Finance, or recorded data when STOCKS_DATA_PROVIDER=replay)
+@st.cache_resource
+def get_market_data_provider() -> MarketDataProvider:
+    """Create the configured market data provider once per process"""
+    return get_provider()
+
+# One max-range series per symbol shared by every session in this server process,
+# backed by the persistent OHLCV store
+@st.cache_resource
+def get_history_cache() -> HistoryCache:
+    """Create the in-memory history cache once per process"""
+    return HistoryCache(OHLCVStore(), get_market_data_provider().history, ttl=300)
+
 # Enhanced data fetching with better error handling
-@st.cache_data(ttl=300)
-def get_stock_data(symbol: str, period: str = "1y") -> Tuple[Optional[pd.DataFrame], Optional[Dict]]:
-    """Enhanced stock data fetching with better error handling"""
+def get_price_history(symbol: str, period: str = "1y") -> Optional[pd.DataFrame]:
+    """Price history only; fundamentals are cached separately"""
     try:
         symbol = symbol.strip().upper()
-        stock = yf.Ticker(symbol)
-        
-        # Get historical data
-        hist = stock.history(period=period, progress=False)
-        if hist.empty:
-            return None, None
         
-        # Get stock info
-        info = stock.info
-        if not info or len(info) < 5:
-            info = {}
+        # Every period is a zero-copy slice of the cached full history
+        hist = get_history_cache().get(symbol, period)
+        if hist is None or hist.empty:
+            return None
         
-        return hist, info
+        return hist
     except Exception as e:
         st.error(f"Error fetching data for {symbol}: {str(e)}")
-        return None, None
+        return None
+
+# Fundamentals rarely change intraday, so they are kept for a day
+@st.cache_data(ttl=86400)
+def get_stock_info(symbol: str) -> Dict:
+    """Stock info (market cap, P/E, dividend yield), fetched only when displayed"""
+    try:
+        return get_market_data_provider().info(symbol.strip().upper())
+    except Exception as e:
+        st.warning(f"Could not fetch detailed info for {symbol}: {str(e)}")
+        return {}
+
+# Batched quotes for the portfolio valuation
+@st.cache_data(ttl=300)
+def get_last_prices(symbols: Tuple[str, ...]) -> Dict[str, float]:
+    """Last prices for all holdings in one multi-ticker request"""
+    try:
+        return get_market_data_provider().last_prices(symbols)
+    except Exception as e:
+        st.error(f"Error fetching quotes: {str(e)}")
+        return {}
+
+# Indicator columns computed once per symbol, bar and parameter set for every session
+@st.cache_resource
+def get_indicator_cache() -> IndicatorCache:
+    """Create the indicator cache once per process"""
+    return IndicatorCache()
+
+# Worker processes for the screener's indicator and signal computation, shared by every session
+@st.cache_resource
+def get_screener_pool() -> ProcessPoolExecutor:
+    """Create the screener process pool once per process"""
+    return ProcessPoolExecutor()
+
+DEFAULT_UNIVERSE = "AAPL MSFT GOOGL AMZN NVDA META TSLA BRK-B JPM V JNJ WMT PG MA HD XOM CVX KO PEP COST"
+
+def read_ticker_list(uploaded) -> List[str]:
+    """Tickers from an uploaded text file, or from the Symbol column of a CSV"""
+    text = uploaded.getvalue().decode("utf-8", errors="ignore")
+    header = [name.strip().lower() for name in text.split("\n", 1)[0].split(",")]
+    if 'symbol' in header:
+        table = pd.read_csv(io.StringIO(text))
+        return table.iloc[:, header.index('symbol')].dropna().astype(str).tolist()
+    return text.replace(",", " ").split()
+
+def screener_view(results: pd.DataFrame, only_matches: bool) -> pd.DataFrame:
+    """Screener rows to display, optionally only those matching at least one rule"""
+    if only_matches and not results.empty:
+        return results[results['matches'] > 0]
+    return results
 
 # Enhanced technical indicators
-def calculate_technical_indicators(df: pd.DataFrame) -> pd.DataFrame:
-    """Calculate comprehensive technical indicators"""
+def calculate_technical_indicators(symbol: str, df: pd.DataFrame, columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """The requested indicators (all by default) as a frame on the price index, reusing cached columns
+
+    The indicator frame wraps the cached arrays without copying, and the
+    cached history passed in is never modified.
+    """
     if df is None or df.empty:
-        return df
+        return pd.DataFrame()
     
     try:
-        prices = df['Close'].values
-        high = df['High'].values
-        low = df['Low'].values
-        volume = df['Volume'].values
-        
-        # Moving Averages
-        df['SMA_20'] = df['Close'].rolling(window=20).mean()
-        df['SMA_50'] = df['Close'].rolling(window=50).mean()
-        df['EMA_12'] = df['Close'].ewm(span=12).mean()
-        df['EMA_26'] = df['Close'].ewm(span=26).mean()
-        
-        # RSI
-        delta = df['Close'].diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
-        rs = gain / loss
-        df['RSI'] = 100 - (100 / (1 + rs))
-        
-        # MACD
-        df['MACD'] = df['EMA_12'] - df['EMA_26']
-        df['MACD_Signal'] = df['MACD'].ewm(span=9).mean()
-        df['MACD_Hist'] = df['MACD'] - df['MACD_Signal']
-        
-        # Bollinger Bands
-        df['BB_Middle'] = df['Close'].rolling(window=20).mean()
-        bb_std = df['Close'].rolling(window=20).std()
-        df['BB_Upper'] = df['BB_Middle'] + (bb_std * 2)
-        df['BB_Lower'] = df['BB_Middle'] - (bb_std * 2)
-        
-        # Volume indicators
-        df['Volume_SMA'] = df['Volume'].rolling(window=20).mean()
-        df['Volume_Ratio'] = df['Volume'] / df['Volume_SMA']
-        
-        return df
+        return get_indicator_cache().frame(symbol, df, columns)
     except Exception as e:
         st.error(f"Error calculating indicators: {str(e)}")
-        return df
+        return pd.DataFrame(index=df.index)
+
+# Indicator columns each consumer reads, so only those are computed
+CHART_COLUMNS = ['SMA_20', 'SMA_50', 'RSI', 'MACD', 'MACD_Signal', 'MACD_Hist']
+AI_ANALYSIS_COLUMNS = ['RSI', 'SMA_20', 'SMA_50', 'MACD', 'MACD_Signal', 'Volume_Ratio']
 
-# AI-powered analysis
-def ai_analysis(df: pd.DataFrame, symbol: str) -> List[str]:
-    """Enhanced AI analysis with multiple signals"""
+# AI-powered analysis: text for the last bar of the full-history signal arrays
+SIGNAL_MESSAGES = {
+    'rsi_overbought': "🔴 RSI overbought ({rsi:.1f}) - potential reversal",
+    'rsi_oversold': "🟢 RSI oversold ({rsi:.1f}) - potential bounce",
+    'rsi_neutral': "🟡 RSI neutral ({rsi:.1f})",
+    'strong_uptrend': "📈 Strong uptrend - price above both SMAs",
+    'strong_downtrend': "📉 Strong downtrend - price below both SMAs",
+    'trend_reversal': "🔄 Potential trend reversal",
+    'macd_bullish': "📊 MACD bullish - momentum building",
+    'macd_bearish': "📊 MACD bearish - momentum weakening",
+    'high_volume': "📊 High volume - strong conviction",
+    'low_volume': "📊 Low volume - weak conviction",
+    'uptrend_5d': "📈 Recent 5-day uptrend",
+    'downtrend_5d': "📉 Recent 5-day downtrend",
+}
+
+def ai_analysis(df: pd.DataFrame, ind: pd.DataFrame, symbol: str) -> List[str]:
+    """Enhanced AI analysis with multiple signals from price history and its indicator frame"""
     signals = []
     
     try:
-        current_price = df['Close'].iloc[-1]
-        
-        # RSI Analysis
-        if 'RSI' in df.columns:
-            current_rsi = df['RSI'].iloc[-1]
-            if not pd.isna(current_rsi):
-                if current_rsi > 70:
-                    signals.append(f"🔴 RSI overbought ({current_rsi:.1f}) - potential reversal")
-                elif current_rsi < 30:
-                    signals.append(f"🟢 RSI oversold ({current_rsi:.1f}) - potential bounce")
-                else:
-                    signals.append(f"🟡 RSI neutral ({current_rsi:.1f})")
-        
-        # Moving Average Analysis
-        if 'SMA_20' in df.columns and 'SMA_50' in df.columns:
-            sma_20 = df['SMA_20'].iloc[-1]
-            sma_50 = df['SMA_50'].iloc[-1]
-            
-            if not pd.isna(sma_20) and not pd.isna(sma_50):
-                if current_price > sma_20 > sma_50:
-                    signals.append("📈 Strong uptrend - price above both SMAs")
-                elif current_price < sma_20 < sma_50:
-                    signals.append("📉 Strong downtrend - price below both SMAs")
-                elif current_price > sma_20 and sma_20 < sma_50:
-                    signals.append("🔄 Potential trend reversal")
-        
-        # MACD Analysis
-        if 'MACD' in df.columns and 'MACD_Signal' in df.columns:
-            macd = df['MACD'].iloc[-1]
-            macd_signal = df['MACD_Signal'].iloc[-1]
-            
-            if not pd.isna(macd) and not pd.isna(macd_signal):
-                if macd > macd_signal:
-                    signals.append("📊 MACD bullish - momentum building")
-                else:
-                    signals.append("📊 MACD bearish - momentum weakening")
-        
-        # Volume Analysis
-        if 'Volume_Ratio' in df.columns:
-            vol_ratio = df['Volume_Ratio'].iloc[-1]
-            if vol_ratio > 1.5:
-                signals.append("📊 High volume - strong conviction")
-            elif vol_ratio < 0.5:
-                signals.append("📊 Low volume - weak conviction")
-        
-        # Price trend analysis
-        if len(df) >= 5:
-            recent_prices = df['Close'].tail(5)
-            if recent_prices.iloc[-1] > recent_prices.iloc[0]:
-                signals.append("📈 Recent 5-day uptrend")
-            else:
-                signals.append("📉 Recent 5-day downtrend")
+        # Every rule is evaluated over the whole history; the text describes the last bar
+        last = signal_frame(df, ind).iloc[-1]
+        rsi = ind['RSI'].iloc[-1] if 'RSI' in ind.columns else None
+        for name, message in SIGNAL_MESSAGES.items():
+            if last.get(name, False):
+                signals.append(message.format(rsi=rsi))
         
         if not signals:
             signals.append("🤔 No clear signals - consider longer timeframe")
@@ -283,6 +290,7 @@ page = st.sidebar.selectbox(
     [
         "🏠 Dashboard",
         "📊 Real-Time Analysis",
+        "🔎 Market Screener",
         "🎯 Options Masterclass",
         "📈 Technical Analysis",
         "💰 Strategy Builder",
@@ -347,12 +355,11 @@ if page == "🏠 Dashboard":
         if st.button("Analyze", type="primary"):
             if symbol:
                 with st.spinner("Fetching data..."):
-                    hist, info = get_stock_data(symbol)
+                    hist = get_price_history(symbol)
                     if hist is not None and not hist.empty:
                         st.session_state.current_stock = {
                             'symbol': symbol,
-                            'data': hist,
-                            'info': info
+                            'data': hist
                         }
                         st.success(f"✅ {symbol} data loaded successfully!")
                     else:
@@ -378,10 +385,9 @@ elif page == "📊 Real-Time Analysis":
     if st.session_state.current_stock:
         symbol = st.session_state.current_stock['symbol']
         df = st.session_state.current_stock['data']
-        info = st.session_state.current_stock['info']
         
-        # Calculate technical indicators
-        df = calculate_technical_indicators(df)
+        # Calculate the technical indicators the chart and AI analysis use
+        ind = calculate_technical_indicators(symbol, df, list(dict.fromkeys(CHART_COLUMNS + AI_ANALYSIS_COLUMNS)))
         
         # Stock overview
         col1, col2, col3, col4 = st.columns(4)
@@ -399,6 +405,9 @@ elif page == "📊 Real-Time Analysis":
             </div>
             """, unsafe_allow_html=True)
         
+        # Fundamentals are only requested here, where the metric cards render them
+        info = get_stock_info(symbol)
+        
         with col2:
             if info and 'marketCap' in info:
                 market_cap = info['marketCap'] / 1e9
@@ -450,23 +459,23 @@ elif page == "📊 Real-Time Analysis":
             name='Price'
         ), row=1, col=1)
         
-        if 'SMA_20' in df.columns:
-            fig.add_trace(go.Scatter(x=df.index, y=df['SMA_20'], name='SMA 20', line=dict(color='orange')), row=1, col=1)
-        if 'SMA_50' in df.columns:
-            fig.add_trace(go.Scatter(x=df.index, y=df['SMA_50'], name='SMA 50', line=dict(color='red')), row=1, col=1)
+        if 'SMA_20' in ind.columns:
+            fig.add_trace(go.Scatter(x=df.index, y=ind['SMA_20'], name='SMA 20', line=dict(color='orange')), row=1, col=1)
+        if 'SMA_50' in ind.columns:
+            fig.add_trace(go.Scatter(x=df.index, y=ind['SMA_50'], name='SMA 50', line=dict(color='red')), row=1, col=1)
         
         # RSI
-        if 'RSI' in df.columns:
-            fig.add_trace(go.Scatter(x=df.index, y=df['RSI'], name='RSI', line=dict(color='purple')), row=2, col=1)
+        if 'RSI' in ind.columns:
+            fig.add_trace(go.Scatter(x=df.index, y=ind['RSI'], name='RSI', line=dict(color='purple')), row=2, col=1)
             fig.add_hline(y=70, line_dash="dash", line_color="red", row=2, col=1)
             fig.add_hline(y=30, line_dash="dash", line_color="green", row=2, col=1)
         
         # MACD
-        if 'MACD' in df.columns and 'MACD_Signal' in df.columns:
-            fig.add_trace(go.Scatter(x=df.index, y=df['MACD'], name='MACD', line=dict(color='blue')), row=3, col=1)
-            fig.add_trace(go.Scatter(x=df.index, y=df['MACD_Signal'], name='Signal', line=dict(color='red')), row=3, col=1)
-            if 'MACD_Hist' in df.columns:
-                fig.add_trace(go.Bar(x=df.index, y=df['MACD_Hist'], name='Histogram'), row=3, col=1)
+        if 'MACD' in ind.columns and 'MACD_Signal' in ind.columns:
+            fig.add_trace(go.Scatter(x=df.index, y=ind['MACD'], name='MACD', line=dict(color='blue')), row=3, col=1)
+            fig.add_trace(go.Scatter(x=df.index, y=ind['MACD_Signal'], name='Signal', line=dict(color='red')), row=3, col=1)
+            if 'MACD_Hist' in ind.columns:
+                fig.add_trace(go.Bar(x=df.index, y=ind['MACD_Hist'], name='Histogram'), row=3, col=1)
         
         # Volume
         fig.add_trace(go.Bar(x=df.index, y=df['Volume'], name='Volume'), row=4, col=1)
@@ -477,7 +486,7 @@ elif page == "📊 Real-Time Analysis":
         # AI Analysis
         st.markdown('<h3 class="subsection-header">🤖 AI-Powered Analysis</h3>', unsafe_allow_html=True)
         
-        signals = ai_analysis(df, symbol)
+        signals = ai_analysis(df, ind, symbol)
         
         st.markdown("""
         <div class="ai-box">
@@ -487,10 +496,102 @@ elif page == "📊 Real-Time Analysis":
         
         for signal in signals:
             st.markdown(f"• {signal}")
+        
+        # When each signal fired over the loaded history, and how the next 5 days went
+        with st.expander("📅 Signal History"):
+            history = signal_frame(df, ind)
+            custom_rule = st.text_input("Custom rule:", placeholder="RSI(14) < 30 and Close > SMA(50)")
+            if custom_rule:
+                try:
+                    history[custom_rule] = evaluate_rules(df, [custom_rule], known=ind)[custom_rule]
+                except ValueError as e:
+                    st.error(f"Invalid rule: {e}")
+            chosen = st.selectbox("Signal:", list(history.columns),
+                                  index=len(history.columns) - 1 if custom_rule in history else 0)
+            fired = history[chosen].to_numpy()
+            
+            signal_fig = go.Figure()
+            signal_fig.add_trace(go.Scatter(x=df.index, y=df['Close'], name='Close', line=dict(color='gray')))
+            signal_fig.add_trace(go.Scatter(x=df.index[fired], y=df['Close'].to_numpy()[fired], mode='markers',
+                                            name=chosen, marker=dict(color='orange', size=6)))
+            signal_fig.update_layout(height=350, title=f"{chosen} over the last {len(df)} sessions")
+            st.plotly_chart(signal_fig, use_container_width=True)
+            
+            stats = signal_stats(history, df['Close'])
+            st.dataframe(stats.style.format({'avg_forward_return': '{:.2%}', 'hit_rate': '{:.0%}'}, na_rep='-'),
+                         use_container_width=True)
     
     else:
         st.info("Please load a stock from the Dashboard first!")
 
+# Market Screener
+elif page == "🔎 Market Screener":
+    st.markdown('<h1 class="section-header">🔎 Market Screener</h1>', unsafe_allow_html=True)
+    st.markdown("Scan a whole list of tickers for RSI extremes, SMA-stack trends and volume spikes.")
+    
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        tickers = st.text_area("Tickers (separated by commas, spaces or new lines):", value=DEFAULT_UNIVERSE, height=120)
+        uploaded = st.file_uploader("Or upload a ticker list (one per line, or a CSV with a Symbol column):", type=["csv", "txt"])
+    with col2:
+        period = st.selectbox("History:", ["6mo", "1y", "2y"], index=1)
+        only_matches = st.checkbox("Only show matches", value=False)
+        extra_rule = st.text_input("Extra rule:", placeholder="RSI(14) < 30 and Close > SMA(50)")
+    
+    symbols = tickers.replace(",", " ").split()
+    if uploaded is not None:
+        symbols += read_ticker_list(uploaded)
+    
+    run_screen = st.button("Run Screen", type="primary")
+    if run_screen and not symbols:
+        st.warning("Enter at least one ticker to screen")
+    elif run_screen:
+        rules = dict(SCREEN_RULES)
+        if extra_rule:
+            rules['extra_rule'] = extra_rule
+        
+        # Resolved here: the loader runs on worker threads, outside the Streamlit script. It reads the
+        # store directly so a large scan does not evict the history cache; the store refreshes each
+        # symbol once at a time, shared with the cache's loads
+        store, fetch = get_history_cache().store, get_market_data_provider().history
+        load = lambda s: store.get_history(s, period, fetch)
+        
+        progress_bar = st.progress(0.0)
+        status = st.empty()
+        table = st.empty()
+        shown = -1
+        try:
+            for progress in scan_universe(symbols, load, rules, workers=get_screener_pool()):
+                progress_bar.progress(progress.done / max(progress.total, 1))
+                status.text(f"Loaded {progress.loaded}/{progress.total} · screened {len(progress.rows)} · "
+                            f"failed {len(progress.failed)}")
+                # Partial results, redrawn only when a chunk has come back
+                if len(progress.rows) != shown:
+                    shown = len(progress.rows)
+                    table.dataframe(screener_view(progress.frame(), only_matches), use_container_width=True, hide_index=True)
+            st.session_state.screener_results = (progress.frame(), progress.failed)
+            table.empty()
+        except ValueError as e:
+            st.error(f"Invalid rule: {e}")
+    
+    if st.session_state.screener_results is not None:
+        results, failed = st.session_state.screener_results
+        st.dataframe(screener_view(results, only_matches), use_container_width=True, hide_index=True)
+        if failed:
+            with st.expander(f"⚠️ {len(failed)} symbols could not be screened"):
+                st.dataframe(pd.DataFrame(list(failed.items()), columns=['symbol', 'reason']), hide_index=True)
+        
+        if not results.empty:
+            chosen = st.selectbox("Open in Real-Time Analysis:", list(results['symbol']))
+            if st.button("Analyze"):
+                hist = get_price_history(chosen)
+                if hist is not None and not hist.empty:
+                    st.session_state.current_stock = {
+                        'symbol': chosen,
+                        'data': hist
+                    }
+                    st.success(f"✅ {chosen} loaded - open Real-Time Analysis")
+
 # Portfolio Simulator
 elif page == "📋 Portfolio Simulator":
     st.markdown('<h1 class="section-header">📋 Portfolio Simulator</h1>', unsafe_allow_html=True)
@@ -503,7 +604,7 @@ elif page == "📋 Portfolio Simulator":
         col1, col2 = st.columns(2)
         
         with col1:
-            symbol = st.text_input("Stock Symbol:", value="AAPL").upper()
+            symbol = st.text_input("Stock Symbol:", value="AAPL").strip().upper()
             shares = st.number_input("Number of Shares:", min_value=1, value=100)
             price = st.number_input("Purchase Price:", min_value=0.01, value=150.0)
             
@@ -547,10 +648,14 @@ elif page == "📋 Portfolio Simulator":
             total_current_value = 0
             total_cost = 0
             
+            # One request for every holding instead of one per position
+            last_prices = get_last_prices(tuple(sorted(st.session_state.portfolio)))
+            
             for symbol, position in st.session_state.portfolio.items():
-                hist, info = get_stock_data(symbol, "1d")
-                if hist is not None and not hist.empty:
-                    current_price = hist['Close'].iloc[-1]
+                # Quotes come back keyed by the normalized ticker
+                ticker = symbol.strip().upper()
+                if ticker in last_prices:
+                    current_price = last_prices[ticker]
                     current_value = position['shares'] * current_price
                     gain_loss = current_value - position['total_cost']
                     gain_loss_pct = (gain_loss / position['total_cost']) * 100
@@ -0,0 +1,67 @@
+"""
+Technical indicator library shared by the Streamlit apps
+Indicators are vectorized NumPy kernels over plain arrays, with pandas,
+TA-Lib and `ta` backends selectable per column
+"""
+
+from indicators.core import (
+    adx,
+    atr,
+    bollinger_bands,
+    cci,
+    ema,
+    macd,
+    mfi,
+    obv,
+    rolling_std,
+    rsi,
+    sma,
+    stochastic,
+    true_range,
+    volume_ratio,
+    wilder_average,
+    williams_r,
+)
+from indicators.graph import IndicatorGraph
+from indicators.backends import BACKENDS, TA_AVAILABLE, TALIB_AVAILABLE, get_backend, parity_report
+from indicators.technical import calculate_technical_indicators, indicator_frame, indicator_values
+from indicators.streaming import StreamingIndicators
+from indicators.panel import build_panel, calculate_panel_indicators
+from indicators.cache import IndicatorCache
+from indicators.sweep import bollinger_sweep, rolling_std_sweep, rsi_sweep, sma_sweep
+
+__all__ = [
+    "adx",
+    "atr",
+    "bollinger_bands",
+    "cci",
+    "ema",
+    "macd",
+    "mfi",
+    "obv",
+    "rolling_std",
+    "rsi",
+    "sma",
+    "stochastic",
+    "true_range",
+    "volume_ratio",
+    "wilder_average",
+    "williams_r",
+    "IndicatorGraph",
+    "BACKENDS",
+    "TA_AVAILABLE",
+    "TALIB_AVAILABLE",
+    "get_backend",
+    "parity_report",
+    "calculate_technical_indicators",
+    "indicator_frame",
+    "indicator_values",
+    "StreamingIndicators",
+    "build_panel",
+    "calculate_panel_indicators",
+    "IndicatorCache",
+    "bollinger_sweep",
+    "rolling_std_sweep",
+    "rsi_sweep",
+    "sma_sweep",
+]
@@ -0,0 +1,281 @@
+"""
+Indicator backends
+The indicator columns can come from the NumPy indicator graph, the apps'
+original pandas rolling/ewm formulas, TA-Lib or the `ta` package. Backends
+are registered by name; STOCKS_INDICATOR_BACKEND picks the default ("auto"
+is TA-Lib when installed, NumPy otherwise) and can route single columns
+elsewhere, e.g. "numpy,RSI=talib,ATR=talib". Columns a backend does not
+provide come from NumPy.
+"""
+
+import os
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Mapping, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from indicators.graph import COLUMNS, IndicatorGraph
+
+# Try to import TA-Lib, fallback to the NumPy kernels if not available
+try:
+    import talib
+    TALIB_AVAILABLE = True
+except ImportError:
+    TALIB_AVAILABLE = False
+
+# Try to import the ta package, its backend is unavailable otherwise
+try:
+    import ta
+    TA_AVAILABLE = True
+except ImportError:
+    TA_AVAILABLE = False
+
+Values = Dict[str, np.ndarray]
+# Column names -> function of the OHLCV frame returning one array/Series per name
+Groups = Dict[Tuple[str, ...], Callable[[pd.DataFrame], object]]
+
+
+@dataclass(frozen=True)
+class IndicatorBackend:
+    """A named way of computing some of the indicator columns"""
+    name: str
+    columns: Tuple[str, ...]
+    compute: Callable[[pd.DataFrame, List[str]], Values]
+    available: bool = True
+
+
+def _grouped(groups: Callable[[], Groups]) -> Callable[[pd.DataFrame, List[str]], Values]:
+    """Compute function calling each multi-output group (e.g. MACD's three lines) once"""
+    def compute(df: pd.DataFrame, names: List[str]) -> Values:
+        values = {}
+        for group, fn in groups().items():
+            if any(name in names for name in group):
+                result = fn(df)
+                outputs = result if isinstance(result, (list, tuple)) else [result]
+                values.update(zip(group, (np.asarray(v, dtype=np.float64) for v in outputs)))
+        return {name: values[name] for name in names}
+    return compute
+
+
+def _numpy(df: pd.DataFrame, names: List[str]) -> Values:
+    return IndicatorGraph(df).compute(names)
+
+
+def _pandas_groups() -> Groups:
+    """The pandas formulas the apps used before the shared indicator library"""
+    def rsi(df):
+        delta = df['Close'].diff()
+        gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
+        loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
+        return 100 - (100 / (1 + gain / loss))
+
+    def macd(df):
+        line = df['Close'].ewm(span=12).mean() - df['Close'].ewm(span=26).mean()
+        signal = line.ewm(span=9).mean()
+        return [line, signal, line - signal]
+
+    def bollinger(df):
+        middle = df['Close'].rolling(window=20).mean()
+        width = df['Close'].rolling(window=20).std() * 2
+        return [middle + width, middle, middle - width]
+
+    def stochastic(df):
+        lowest_low = df['Low'].rolling(window=14).min()
+        highest_high = df['High'].rolling(window=14).max()
+        k_percent = 100 * ((df['Close'] - lowest_low) / (highest_high - lowest_low))
+        return [k_percent, k_percent.rolling(window=3).mean()]
+
+    def volume(df):
+        volume_sma = df['Volume'].rolling(window=20).mean()
+        return [volume_sma, df['Volume'] / volume_sma]
+
+    def true_range(df):
+        prev_close = df['Close'].shift()
+        return pd.concat([df['High'] - df['Low'], (df['High'] - prev_close).abs(),
+                          (df['Low'] - prev_close).abs()], axis=1).max(axis=1, skipna=False)
+
+    def williams_r(df):
+        highest_high = df['High'].rolling(window=14).max()
+        lowest_low = df['Low'].rolling(window=14).min()
+        return -100 * (highest_high - df['Close']) / (highest_high - lowest_low)
+
+    return {
+        ('RSI',): rsi,
+        ('SMA_20',): lambda df: df['Close'].rolling(window=20).mean(),
+        ('SMA_50',): lambda df: df['Close'].rolling(window=50).mean(),
+        ('EMA_12',): lambda df: df['Close'].ewm(span=12).mean(),
+        ('EMA_26',): lambda df: df['Close'].ewm(span=26).mean(),
+        ('MACD', 'MACD_Signal', 'MACD_Hist'): macd,
+        ('BB_Upper', 'BB_Middle', 'BB_Lower'): bollinger,
+        ('STOCH_K', 'STOCH_D'): stochastic,
+        ('OBV',): lambda df: (np.sign(df['Close'].diff()).fillna(0) * df['Volume']).cumsum(),
+        ('Volume_SMA', 'Volume_Ratio'): volume,
+        ('ATR',): lambda df: true_range(df).ewm(alpha=1 / 14, adjust=False).mean(),
+        ('Williams_R',): williams_r,
+    }
+
+
+def _talib_groups() -> Groups:
+    def call(fn, *fields, **kwargs):
+        return lambda df: fn(*(df[field].to_numpy(dtype='float64') for field in fields), **kwargs)
+
+    return {
+        ('RSI',): call(talib.RSI, 'Close', timeperiod=14),
+        ('SMA_20',): call(talib.SMA, 'Close', timeperiod=20),
+        ('SMA_50',): call(talib.SMA, 'Close', timeperiod=50),
+        ('EMA_12',): call(talib.EMA, 'Close', timeperiod=12),
+        ('EMA_26',): call(talib.EMA, 'Close', timeperiod=26),
+        ('MACD', 'MACD_Signal', 'MACD_Hist'): call(talib.MACD, 'Close'),
+        ('BB_Upper', 'BB_Middle', 'BB_Lower'): call(talib.BBANDS, 'Close', timeperiod=20),
+        ('STOCH_K', 'STOCH_D'): call(talib.STOCH, 'High', 'Low', 'Close'),
+        ('OBV',): call(talib.OBV, 'Close', 'Volume'),
+        ('ATR',): call(talib.ATR, 'High', 'Low', 'Close', timeperiod=14),
+        ('Williams_R',): call(talib.WILLR, 'High', 'Low', 'Close', timeperiod=14),
+        ('MFI',): call(talib.MFI, 'High', 'Low', 'Close', 'Volume', timeperiod=14),
+        ('ADX',): call(talib.ADX, 'High', 'Low', 'Close', timeperiod=14),
+        ('CCI',): call(talib.CCI, 'High', 'Low', 'Close', timeperiod=20),
+    }
+
+
+def _ta_groups() -> Groups:
+    def macd(df):
+        indicator = ta.trend.MACD(df['Close'], window_slow=26, window_fast=12, window_sign=9)
+        return [indicator.macd(), indicator.macd_signal(), indicator.macd_diff()]
+
+    def bollinger(df):
+        indicator = ta.volatility.BollingerBands(df['Close'], window=20, window_dev=2)
+        return [indicator.bollinger_hband(), indicator.bollinger_mavg(), indicator.bollinger_lband()]
+
+    def stochastic(df):
+        indicator = ta.momentum.StochasticOscillator(df['High'], df['Low'], df['Close'], window=14, smooth_window=3)
+        return [indicator.stoch(), indicator.stoch_signal()]
+
+    return {
+        ('RSI',): lambda df: ta.momentum.RSIIndicator(df['Close'], window=14).rsi(),
+        ('SMA_20',): lambda df: ta.trend.SMAIndicator(df['Close'], window=20).sma_indicator(),
+        ('SMA_50',): lambda df: ta.trend.SMAIndicator(df['Close'], window=50).sma_indicator(),
+        ('EMA_12',): lambda df: ta.trend.EMAIndicator(df['Close'], window=12).ema_indicator(),
+        ('EMA_26',): lambda df: ta.trend.EMAIndicator(df['Close'], window=26).ema_indicator(),
+        ('MACD', 'MACD_Signal', 'MACD_Hist'): macd,
+        ('BB_Upper', 'BB_Middle', 'BB_Lower'): bollinger,
+        ('STOCH_K', 'STOCH_D'): stochastic,
+        ('OBV',): lambda df: ta.volume.OnBalanceVolumeIndicator(df['Close'], df['Volume']).on_balance_volume(),
+        ('ATR',): lambda df: ta.volatility.AverageTrueRange(df['High'], df['Low'], df['Close'], window=14)
+                             .average_true_range(),
+        ('Williams_R',): lambda df: ta.momentum.WilliamsRIndicator(df['High'], df['Low'], df['Close'], lbp=14)
+                                    .williams_r(),
+        ('MFI',): lambda df: ta.volume.MFIIndicator(df['High'], df['Low'], df['Close'], df['Volume'], window=14)
+                             .money_flow_index(),
+        ('ADX',): lambda df: ta.trend.ADXIndicator(df['High'], df['Low'], df['Close'], window=14).adx(),
+        ('CCI',): lambda df: ta.trend.CCIIndicator(df['High'], df['Low'], df['Close'], window=20).cci(),
+    }
+
+
+def _columns_of(groups: Callable[[], Groups], available: bool) -> Tuple[str, ...]:
+    """Column names a grouped backend provides (none if its library is not installed)"""
+    if not available:
+        return ()
+    return tuple(name for group in groups() for name in group)
+
+
+BACKENDS: Dict[str, IndicatorBackend] = {}
+
+
+def register_backend(backend: IndicatorBackend) -> None:
+    """Add or replace a backend by name"""
+    BACKENDS[backend.name] = backend
+
+
+register_backend(IndicatorBackend("numpy", tuple(COLUMNS), _numpy))
+register_backend(IndicatorBackend("pandas", _columns_of(_pandas_groups, True), _grouped(_pandas_groups)))
+register_backend(IndicatorBackend("talib", _columns_of(_talib_groups, TALIB_AVAILABLE),
+                                  _grouped(_talib_groups), TALIB_AVAILABLE))
+register_backend(IndicatorBackend("ta", _columns_of(_ta_groups, TA_AVAILABLE), _grouped(_ta_groups), TA_AVAILABLE))
+
+
+def parse_backend_config(spec: str) -> Tuple[str, Dict[str, str]]:
+    """Split "numpy,RSI=talib" into the default backend and per-column overrides"""
+    default, overrides = "auto", {}
+    for part in (p.strip() for p in spec.split(",")):
+        if not part:
+            continue
+        if "=" in part:
+            column, name = (s.strip() for s in part.split("=", 1))
+            overrides[column] = name
+        else:
+            default = part
+    return default, overrides
+
+
+DEFAULT_BACKEND, BACKEND_OVERRIDES = parse_backend_config(os.environ.get("STOCKS_INDICATOR_BACKEND", "auto"))
+
+
+def get_backend(name: Optional[str] = None) -> IndicatorBackend:
+    """Backend by name ("auto" or None resolves to the configured default)"""
+    name = name or DEFAULT_BACKEND
+    if name == "auto":
+        name = "talib" if TALIB_AVAILABLE else "numpy"
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown indicator backend: {name}")
+    backend = BACKENDS[name]
+    if not backend.available:
+        raise ValueError(f"Indicator backend {name} is not installed")
+    return backend
+
+
+def backend_for(column: str, backend: Optional[str] = None) -> str:
+    """Name of the backend that computes a column
+
+    An explicit backend applies to every column; otherwise the configured
+    per-column override or default is used. Columns the chosen backend
+    lacks fall back to NumPy.
+    """
+    chosen = get_backend(backend or BACKEND_OVERRIDES.get(column))
+    return chosen.name if column in chosen.columns else "numpy"
+
+
+def compute_indicators(df: pd.DataFrame, names: Iterable[str], backend: Optional[str] = None) -> Values:
+    """Arrays for the named columns, calling each backend once for its share of them"""
+    names = list(names)
+    by_backend: Dict[str, List[str]] = {}
+    for name in names:
+        by_backend.setdefault(backend_for(name, backend), []).append(name)
+    values = {}
+    for name, columns in by_backend.items():
+        values.update(BACKENDS[name].compute(df, columns))
+    return {name: values[name] for name in names}
+
+
+def parity_report(df: pd.DataFrame, columns: Optional[Iterable[str]] = None,
+                  backends: Optional[Iterable[str]] = None, reference: str = "numpy",
+                  tolerance: float = 1e-6) -> pd.DataFrame:
+    """How far each installed backend is from the reference, column by column
+
+    max_abs_diff compares bars where both have values; warmup_bars counts
+    bars where only one of them does (e.g. RSI's first bar in the pandas
+    formula, or a different ATR seed length).
+    """
+    names = list(COLUMNS) if columns is None else list(columns)
+    candidates: Mapping[str, IndicatorBackend] = {
+        name: BACKENDS[name] for name in (backends or BACKENDS)
+        if name != reference and BACKENDS[name].available
+    }
+    expected = BACKENDS[reference].compute(df, names)
+    rows = []
+    for name, backend in candidates.items():
+        own = [col for col in names if col in backend.columns]
+        actual = backend.compute(df, own)
+        for col in own:
+            a, b = actual[col], expected[col]
+            both = ~np.isnan(a) & ~np.isnan(b)
+            diff = float(np.max(np.abs(a[both] - b[both]))) if both.any() else np.nan
+            warmup = int(np.count_nonzero(np.isnan(a) != np.isnan(b)))
+            rows.append({
+                'indicator': col,
+                'backend': name,
+                'max_abs_diff': diff,
+                'warmup_bars': warmup,
+                'match': bool(warmup == 0 and (np.isnan(diff) or diff <= tolerance)),
+            })
+    return pd.DataFrame(rows, columns=['indicator', 'backend', 'max_abs_diff', 'warmup_bars', 'match'])
@@ -0,0 +1,189 @@
+"""
+Memoized indicator columns
+Indicator arrays are cached per (symbol, last bar timestamp, row count,
+last close, parameters, backend), so a Streamlit rerun over unchanged history reuses
+them instead of recomputing. When a refresh only changes or appends the
+latest bar, the NumPy columns that indicators.streaming covers are extended
+from a saved streaming state instead of recomputed over the whole history
+(columns another backend computes, e.g. TA-Lib's RSI, MACD, Bollinger Bands
+and ATR, are always recomputed).
+The price frame is only read, never written, so it can stay shared between
+sessions; indicators come back as their own column block on the same index.
+"""
+
+import copy
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Hashable, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from indicators.graph import COLUMNS
+from indicators.backends import backend_for
+from indicators.streaming import STREAMING_COLUMNS, StreamingIndicators
+from indicators.technical import as_indicator_frame, indicator_values
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+@dataclass
+class _Stream:
+    """Streaming state after every bar but the latest of a history, with the columns up to there"""
+    bars: int
+    last: Hashable          # timestamp of the last bar folded into the state
+    close: float            # its close, to notice a re-adjusted history
+    state: StreamingIndicators
+    values: Dict[str, np.ndarray]
+
+    @classmethod
+    def seed(cls, df: pd.DataFrame, computed: Dict[str, np.ndarray]) -> "_Stream":
+        """State before df's latest bar, keeping the computed columns up to there"""
+        return cls(
+            bars=len(df) - 1,
+            last=df.index[-2],
+            close=df['Close'].iat[-2],
+            state=StreamingIndicators.from_history(df.iloc[:-1]),
+            values={name: np.asarray(values[:-1], dtype=np.float64) for name, values in computed.items()},
+        )
+
+    def covers(self, df: pd.DataFrame, bars: int) -> bool:
+        return (self.bars == bars and len(df) > bars and df.index[bars - 1] == self.last
+                and df['Close'].iat[bars - 1] == self.close)
+
+    def advance(self, df: pd.DataFrame) -> None:
+        """Fold the bar after `bars` into the state"""
+        row = df.iloc[self.bars]
+        latest = self.state.update(row['High'], row['Low'], row['Close'], row['Volume'])
+        self.values = {name: np.append(values, latest[name]) for name, values in self.values.items()}
+        self.bars += 1
+        self.last, self.close = df.index[self.bars - 1], row['Close']
+
+
+class IndicatorCache:
+    """Process-wide LRU of indicator arrays, capped by entry count and total bytes"""
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES, max_entries: int = 4096, max_streams: int = 64):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.max_streams = max_streams
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.streamed = 0
+        self._arrays = OrderedDict()  # key -> read-only ndarray
+        self._streams = OrderedDict()  # (symbol, first bar) -> _Stream
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(symbol: str, df: pd.DataFrame, name: str, backend: Optional[str] = None) -> Tuple[Hashable, ...]:
+        """Cache key: a new bar or a different window length changes the last timestamp or row count,
+        and a live update of today's bar changes its close"""
+        # The graph node spells out the indicator's parameters (periods, multipliers)
+        return (symbol.strip().upper(), df.index[-1], len(df), float(df['Close'].iat[-1]),
+                COLUMNS[name], backend_for(name, backend))
+
+    def get(self, symbol: str, df: pd.DataFrame, columns: Optional[Iterable[str]] = None,
+            backend: Optional[str] = None) -> Dict[str, np.ndarray]:
+        """Indicator arrays for df, computing only the columns not cached yet
+
+        The returned arrays are read-only because other sessions share them.
+        """
+        if df is None or df.empty:
+            return {}
+        names = list(COLUMNS) if columns is None else list(columns)
+        unknown = [name for name in names if name not in COLUMNS]
+        if unknown:
+            raise ValueError(f"Unknown indicator columns: {', '.join(unknown)}")
+
+        keys = {name: self.key(symbol, df, name, backend) for name in names}
+        values = {}
+        with self._lock:
+            for name, key in keys.items():
+                if key in self._arrays:
+                    self._arrays.move_to_end(key)
+                    values[name] = self._arrays[key]
+            self.hits += len(values)
+            self.misses += len(names) - len(values)
+
+        missing = [name for name in names if name not in values]
+        streamable = [name for name in missing if name in STREAMING_COLUMNS and backend_for(name, backend) == "numpy"]
+        if streamable:
+            with self._lock:
+                extended = self._extend(symbol, df, streamable)
+                for name, array in extended.items():
+                    self._put(keys[name], array)
+            values.update(extended)
+            missing = [name for name in names if name not in values]
+        if missing:
+            computed = indicator_values(df, missing, backend)
+            for name in missing:
+                array = np.asarray(computed[name], dtype=np.float64)
+                array.setflags(write=False)
+                values[name] = array
+            seeded = [name for name in streamable if name in missing]
+            stream = _Stream.seed(df, {name: computed[name] for name in seeded}) if seeded and len(df) > 1 else None
+            with self._lock:
+                for name in missing:
+                    self._put(keys[name], values[name])
+                if stream is not None:
+                    self._keep(symbol, df, stream)
+
+        return {name: values[name] for name in names}
+
+    def _extend(self, symbol: str, df: pd.DataFrame, names: List[str]) -> Dict[str, np.ndarray]:
+        """Columns for df from the symbol's streaming state when df only adds or changes its latest bar"""
+        stream = self._streams.get((symbol.strip().upper(), df.index[0]))
+        if stream is None or not (stream.covers(df, len(df) - 1) or stream.covers(df, len(df) - 2)):
+            return {}
+        if stream.bars == len(df) - 2:
+            stream.advance(df)  # a new bar: the previous latest bar is final now
+        latest = copy.deepcopy(stream.state).update(*(df[field].iat[-1] for field in ('High', 'Low', 'Close', 'Volume')))
+        extended = {}
+        for name in names:
+            if name in stream.values:
+                array = np.append(stream.values[name], latest[name])
+                array.setflags(write=False)
+                extended[name] = array
+        self.streamed += len(extended)
+        return extended
+
+    def _keep(self, symbol: str, df: pd.DataFrame, stream: _Stream) -> None:
+        """Save a symbol's streaming state, adding columns to a state already at the same bar"""
+        key = (symbol.strip().upper(), df.index[0])
+        current = self._streams.get(key)
+        if current is not None and current.covers(df, stream.bars):
+            current.values.update(stream.values)
+        else:
+            self._streams[key] = stream
+        self._streams.move_to_end(key)
+        while len(self._streams) > self.max_streams:
+            self._streams.popitem(last=False)
+
+    def frame(self, symbol: str, df: pd.DataFrame, columns: Optional[Iterable[str]] = None,
+              backend: Optional[str] = None) -> pd.DataFrame:
+        """Cached indicator columns as a separate frame on df's index, without copying
+
+        Price columns stay in df; join the two only where a consumer needs both.
+        """
+        if df is None or df.empty:
+            return pd.DataFrame(index=None if df is None else df.index)
+        return as_indicator_frame(df.index, self.get(symbol, df, columns, backend))
+
+    def _put(self, key: Tuple[Hashable, ...], array: np.ndarray) -> None:
+        if key in self._arrays:
+            self.nbytes -= self._arrays.pop(key).nbytes
+        self._arrays[key] = array
+        self.nbytes += array.nbytes
+        while self._arrays and (len(self._arrays) > self.max_entries or self.nbytes > self.max_bytes):
+            self.nbytes -= self._arrays.popitem(last=False)[1].nbytes
+
+    def __len__(self) -> int:
+        return len(self._arrays)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._arrays.clear()
+            self._streams.clear()
+            self.nbytes = 0
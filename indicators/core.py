@@ -0,0 +1,371 @@
+"""
+Vectorized NumPy indicator kernels
+Every kernel works along axis 0 (time) and returns float64 arrays of the
+input's shape, so a 1-D series and a (time x symbol) panel go through the
+same code. Warm-up bars are NaN, and a NaN input makes every window
+containing it NaN, which matches pandas rolling/ewm defaults. The recursive
+and rolling-extreme kernels switch to compiled loops from indicators.jit when
+Numba is installed.
+"""
+
+from typing import Tuple
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from indicators import jit
+
+
+def _as_float(values) -> np.ndarray:
+    return np.asarray(values, dtype=np.float64)
+
+
+def _first_valid(x: np.ndarray) -> np.ndarray:
+    """First non-NaN value along axis 0 (0 for columns with none)"""
+    valid = ~np.isnan(x)
+    first = np.take_along_axis(x, np.argmax(valid, axis=0)[np.newaxis], axis=0)[0]
+    return np.where(valid.any(axis=0), first, 0.0)
+
+
+def _leading_gap(x: np.ndarray) -> np.ndarray:
+    """Number of leading NaN bars per column (the full length for all-NaN columns)"""
+    valid = ~np.isnan(x)
+    return np.where(valid.any(axis=0), np.argmax(valid, axis=0), len(x))
+
+
+def _by_leading_gap(kernel, arrays, *args):
+    """Run a kernel separately on each group of panel columns that start on the same bar
+
+    Kernels seeded at a fixed bar after the leading gap (Wilder averages)
+    need this when symbols in a panel start trading on different dates.
+    Returns None for 1-D inputs and panels whose columns all start together.
+    """
+    gaps = _leading_gap(arrays[0])
+    if arrays[0].ndim == 1 or (gaps == gaps[0]).all():
+        return None
+    results = None
+    for gap in np.unique(gaps):
+        columns = gaps == gap
+        part = kernel(*(a[:, columns] for a in arrays), *args)
+        parts = part if isinstance(part, tuple) else (part,)
+        if results is None:
+            results = tuple(np.full(arrays[0].shape, np.nan) for _ in parts)
+        for result, values in zip(results, parts):
+            result[:, columns] = values
+    return results if isinstance(part, tuple) else results[0]
+
+
+def decay_filter(x: np.ndarray, decay: float, init: float = 0.0) -> np.ndarray:
+    """First-order recursion y[t] = x[t] + decay * y[t-1] with y[-1] = init
+
+    Evaluated in closed form block by block (cumulative sums scaled by
+    decay**-i), so the only Python loop is over blocks of several hundred
+    to tens of thousands of bars. Blocks are sized to keep decay**-i finite.
+    """
+    x = _as_float(x)
+    n = len(x)
+    out = np.empty(x.shape)
+    if n == 0:
+        return out
+    if jit.JIT_ENABLED:
+        return jit.decay_filter(x, decay, init)
+    if decay <= 0:
+        out[:] = x
+        out[0] += decay * init
+        return out
+
+    block = n if decay >= 1 else max(1, min(n, int(600 / -np.log(decay))))
+    scale = (decay ** -np.arange(block, dtype=np.float64)).reshape((block,) + (1,) * (x.ndim - 1))
+    carry = init
+    for start in range(0, n, block):
+        chunk = x[start:start + block]
+        p = scale[:len(chunk)]
+        y = (np.cumsum(chunk * p, axis=0) + decay * carry) / p
+        out[start:start + len(chunk)] = y
+        carry = y[-1]
+    return out
+
+
+def _window_sums(x: np.ndarray, period: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Centered per-window sums, valid counts and the center for windows ending at bar period-1 onwards"""
+    valid = ~np.isnan(x)
+    # Centering on the first valid value keeps the cumulative sums small
+    center = _first_valid(x)
+    filled = np.where(valid, x - center, 0.0)
+    zeros = np.zeros((1,) + x.shape[1:])
+    cs = np.concatenate((zeros, np.cumsum(filled, axis=0)))
+    cnt = np.concatenate((zeros, np.cumsum(valid, axis=0)))
+    return cs[period:] - cs[:-period], cnt[period:] - cnt[:-period], center
+
+
+def sma(values, period: int) -> np.ndarray:
+    """Simple moving average"""
+    x = _as_float(values)
+    out = np.full(x.shape, np.nan)
+    if period < 1:
+        raise ValueError("period must be >= 1")
+    if len(x) < period:
+        return out
+    sums, counts, center = _window_sums(x, period)
+    out[period - 1:] = np.where(counts == period, sums / period + center, np.nan)
+    return out
+
+
+def rolling_std(values, period: int, ddof: int = 1) -> np.ndarray:
+    """Rolling standard deviation (sample by default, like pandas)"""
+    x = _as_float(values)
+    out = np.full(x.shape, np.nan)
+    if len(x) < period or period <= ddof:
+        return out
+    # Per-window sums of squares (einsum avoids materializing the windows),
+    # centered so the subtraction below does not lose precision
+    windows = sliding_window_view(x - _first_valid(x), period, axis=0)
+    mean = windows.sum(axis=-1) / period
+    squares = np.einsum("...j,...j->...", windows, windows) - period * mean * mean
+    out[period - 1:] = np.sqrt(np.maximum(squares, 0.0) / (period - ddof))
+    return out
+
+
+def rolling_min(values, period: int) -> np.ndarray:
+    x = _as_float(values)
+    out = np.full(x.shape, np.nan)
+    if len(x) < period:
+        return out
+    if jit.JIT_ENABLED:
+        return jit.rolling_min(x, period)
+    out[period - 1:] = sliding_window_view(x, period, axis=0).min(axis=-1)
+    return out
+
+
+def rolling_max(values, period: int) -> np.ndarray:
+    x = _as_float(values)
+    out = np.full(x.shape, np.nan)
+    if len(x) < period:
+        return out
+    if jit.JIT_ENABLED:
+        return jit.rolling_max(x, period)
+    out[period - 1:] = sliding_window_view(x, period, axis=0).max(axis=-1)
+    return out
+
+
+def ema(values, span: int) -> np.ndarray:
+    """Exponential moving average, identical to pandas ``Series.ewm(span=span).mean()``"""
+    x = _as_float(values)
+    decay = 1.0 - 2.0 / (span + 1)
+    valid = ~np.isnan(x)
+
+    # Adjusted EMA: decayed sum of values over decayed count of values
+    num = decay_filter(np.where(valid, x, 0.0), decay)
+    den = decay_filter(valid.astype(np.float64), decay)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        out = num / den
+    out[den == 0] = np.nan
+    return out
+
+
+def wilder_average(values, period: int) -> np.ndarray:
+    """Wilder smoothing seeded with the simple mean of the first `period` values
+
+    Leading NaN bars (e.g. the first price change, or a symbol that starts
+    later than the rest of a panel) are skipped before seeding.
+    """
+    x = _as_float(values)
+    ragged = _by_leading_gap(wilder_average, (x,), period)
+    if ragged is not None:
+        return ragged
+    out = np.full(x.shape, np.nan)
+    start = int(np.max(_leading_gap(x))) if len(x) else 0
+    seed_end = start + period
+    if len(x) < seed_end:
+        return out
+    seed = x[start:seed_end].mean(axis=0)
+    out[seed_end - 1] = seed
+    out[seed_end:] = decay_filter(x[seed_end:] / period, (period - 1) / period, init=seed)
+    return out
+
+
+def rsi(close, period: int = 14, method: str = "sma") -> np.ndarray:
+    """Relative Strength Index
+
+    method="sma" averages gains and losses with a simple rolling mean (the
+    apps' original pandas formula); method="wilder" uses Wilder smoothing
+    seeded with the first simple average, as TA-Lib does.
+    """
+    c = _as_float(close)
+    out = np.full(c.shape, np.nan)
+    if len(c) <= period:
+        return out
+    delta = np.empty(c.shape)
+    delta[0] = np.nan
+    np.subtract(c[1:], c[:-1], out=delta[1:])
+    gains = np.where(delta > 0, delta, 0.0)
+    losses = np.where(delta < 0, -delta, 0.0)
+    gains[np.isnan(delta)] = np.nan
+    losses[np.isnan(delta)] = np.nan
+
+    if method == "sma":
+        avg_gain = sma(gains, period)
+        avg_loss = sma(losses, period)
+    elif method == "wilder":
+        avg_gain = wilder_average(gains, period)
+        avg_loss = wilder_average(losses, period)
+    else:
+        raise ValueError(f"Unknown RSI method: {method}")
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        rs = avg_gain / avg_loss
+        out = 100 - (100 / (1 + rs))
+    return out
+
+
+def macd(close, fast: int = 12, slow: int = 26, signal: int = 9) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """MACD line, signal line and histogram from pandas-style EMAs"""
+    c = _as_float(close)
+    macd_line = ema(c, fast) - ema(c, slow)
+    signal_line = ema(macd_line, signal)
+    return macd_line, signal_line, macd_line - signal_line
+
+
+def bollinger_bands(close, period: int = 20, num_std: float = 2.0) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Upper band, middle band (SMA) and lower band"""
+    middle = sma(close, period)
+    width = rolling_std(close, period) * num_std
+    return middle + width, middle, middle - width
+
+
+def stochastic(high, low, close, k_period: int = 14, d_period: int = 3) -> Tuple[np.ndarray, np.ndarray]:
+    """Stochastic Oscillator %K and its %D simple moving average"""
+    lowest_low = rolling_min(low, k_period)
+    highest_high = rolling_max(high, k_period)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        k_percent = 100 * ((_as_float(close) - lowest_low) / (highest_high - lowest_low))
+    return k_percent, sma(k_percent, d_period)
+
+
+def obv(close, volume) -> np.ndarray:
+    """On-Balance Volume: cumulative volume signed by the close-to-close direction
+
+    Starts at 0 on the first bar; unchanged (or NaN) closes add nothing.
+    """
+    close = _as_float(close)
+    volume = _as_float(volume)
+    out = np.zeros(close.shape)
+    if len(close) > 1:
+        direction = np.nan_to_num(np.sign(np.diff(close, axis=0)))
+        flow = np.where(direction != 0, direction * volume[1:], 0.0)
+        np.cumsum(flow, axis=0, out=out[1:])
+    return out
+
+
+def volume_ratio(volume, period: int = 20) -> Tuple[np.ndarray, np.ndarray]:
+    """Volume moving average and the current volume relative to it"""
+    v = _as_float(volume)
+    average = sma(v, period)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return average, v / average
+
+
+def _previous(x: np.ndarray) -> np.ndarray:
+    """x shifted one bar later along axis 0, NaN on the first bar"""
+    out = np.empty(x.shape)
+    out[:1] = np.nan
+    out[1:] = x[:-1]
+    return out
+
+
+def true_range(high, low, close) -> np.ndarray:
+    """Largest of high-low and the gaps from the previous close; NaN on the first bar like TA-Lib"""
+    high, low, close = _as_float(high), _as_float(low), _as_float(close)
+    prev_close = _previous(close)
+    return np.maximum(high - low, np.maximum(np.abs(high - prev_close), np.abs(low - prev_close)))
+
+
+def atr(high, low, close, period: int = 14) -> np.ndarray:
+    """Average True Range: Wilder-smoothed true range, first value on bar `period`"""
+    return wilder_average(true_range(high, low, close), period)
+
+
+def williams_r(high, low, close, period: int = 14) -> np.ndarray:
+    """Williams %R: close relative to the highest high over `period` bars, from 0 down to -100"""
+    highest_high = rolling_max(high, period)
+    lowest_low = rolling_min(low, period)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return -100 * ((highest_high - _as_float(close)) / (highest_high - lowest_low))
+
+
+def mfi(high, low, close, volume, period: int = 14) -> np.ndarray:
+    """Money Flow Index: RSI-like ratio of up-bar to total money flow over `period` bars"""
+    typical = (_as_float(high) + _as_float(low) + _as_float(close)) / 3
+    flow = typical * _as_float(volume)
+    change = typical - _previous(typical)
+    positive = np.where(change > 0, flow, 0.0)
+    negative = np.where(change < 0, flow, 0.0)
+    positive[np.isnan(change)] = np.nan
+    negative[np.isnan(change)] = np.nan
+    # Sums over the window are the means times period, which cancels in the ratio
+    up = sma(positive, period)
+    total = up + sma(negative, period)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return 100 * up / total
+
+
+def adx(high, low, close, period: int = 14) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Average Directional Index with its +DI and -DI lines, seeded the way TA-Lib does
+
+    Directional movement and true range are Wilder running sums seeded with
+    bars 1..period-1, so the DI lines start on bar period-1; ADX averages the
+    first `period` DX values from bar `period` and starts on bar 2*period-1.
+    """
+    high, low, close = _as_float(high), _as_float(low), _as_float(close)
+    ragged = _by_leading_gap(adx, (high, low, close), period)
+    if ragged is not None:
+        return ragged
+    out = [np.full(high.shape, np.nan) for _ in range(3)]
+    gap = int(np.max(_leading_gap(close))) if len(close) else 0
+    if gap:
+        # Seed on the first traded bar rather than the first row
+        for result, values in zip(out, adx(high[gap:], low[gap:], close[gap:], period)):
+            result[gap:] = values
+        return tuple(out)
+    first_adx = 2 * period - 1
+    if len(high) <= first_adx:
+        return tuple(out)
+
+    up = high - _previous(high)
+    down = _previous(low) - low
+    plus_dm = np.where((up > down) & (up > 0), up, 0.0)
+    minus_dm = np.where((down > up) & (down > 0), down, 0.0)
+    decay = (period - 1) / period
+
+    def running_sum(x):
+        total = np.full(x.shape, np.nan)
+        seed = x[1:period].sum(axis=0)
+        total[period - 1] = seed
+        total[period:] = decay_filter(x[period:], decay, init=seed)
+        return total
+
+    tr = running_sum(true_range(high, low, close))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        plus_di = 100 * running_sum(plus_dm) / tr
+        minus_di = 100 * running_sum(minus_dm) / tr
+        dx = 100 * np.abs(plus_di - minus_di) / (plus_di + minus_di)
+
+    adx_line = out[0]
+    seed = dx[period:first_adx + 1].mean(axis=0)
+    adx_line[first_adx] = seed
+    adx_line[first_adx + 1:] = decay_filter(dx[first_adx + 1:] / period, decay, init=seed)
+    return adx_line, plus_di, minus_di
+
+
+def cci(high, low, close, period: int = 20) -> np.ndarray:
+    """Commodity Channel Index: typical price distance from its SMA in units of mean absolute deviation"""
+    typical = (_as_float(high) + _as_float(low) + _as_float(close)) / 3
+    out = np.full(typical.shape, np.nan)
+    if len(typical) < period:
+        return out
+    windows = sliding_window_view(typical, period, axis=0)
+    mean = windows.mean(axis=-1)
+    deviation = np.abs(windows - mean[..., np.newaxis]).mean(axis=-1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        out[period - 1:] = (typical[period - 1:] - mean) / (0.015 * deviation)
+    return out
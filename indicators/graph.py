@@ -0,0 +1,211 @@
+"""
+Indicator dependency graph
+Every indicator column is an expression over shared intermediate nodes
+(rolling mean, rolling std, EMA, ...). Nodes are plain tuples, so identical
+sub-expressions are the same node: SMA_20 and BB_Middle are one rolling
+pass, and EMA_12/EMA_26 feed MACD directly. Only the nodes needed for the
+requested columns are evaluated, each at most once.
+"""
+
+from typing import Callable, Dict, Iterable, Mapping, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from indicators import core
+
+Node = Tuple
+
+OPEN = ("input", "Open")
+CLOSE = ("input", "Close")
+HIGH = ("input", "High")
+LOW = ("input", "Low")
+VOLUME = ("input", "Volume")
+
+
+def _ratio(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return a / b
+
+
+def _rsi_from_averages(avg_gain: np.ndarray, avg_loss: np.ndarray) -> np.ndarray:
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return 100 - (100 / (1 + avg_gain / avg_loss))
+
+
+def _shift(x: np.ndarray, periods: int) -> np.ndarray:
+    """Values from `periods` bars earlier along axis 0 (NaN before the first)"""
+    out = np.full(np.shape(x), np.nan)
+    if periods < len(out):
+        out[periods:] = x[:len(out) - periods]
+    return out
+
+
+def _gains(close: np.ndarray, sign: float) -> np.ndarray:
+    delta = np.empty(close.shape)
+    delta[:1] = np.nan
+    np.subtract(close[1:], close[:-1], out=delta[1:])
+    delta *= sign
+    return np.where(np.isnan(delta), np.nan, np.maximum(delta, 0.0))
+
+
+# op name -> kernel; node arguments are evaluated before the kernel is called
+OPS: Dict[str, Callable[..., np.ndarray]] = {
+    "sma": core.sma,
+    "std": core.rolling_std,
+    "ema": core.ema,
+    "min": core.rolling_min,
+    "max": core.rolling_max,
+    "gain": lambda close: _gains(close, 1.0),
+    "loss": lambda close: _gains(close, -1.0),
+    "rsi": _rsi_from_averages,
+    "add": np.add,
+    "sub": np.subtract,
+    "div": _ratio,
+    "scale": np.multiply,
+    "stoch_k": lambda close, lowest, highest: 100 * _ratio(close - lowest, highest - lowest),
+    "obv": core.obv,
+    "williams_r": lambda close, lowest, highest: -100 * _ratio(highest - close, highest - lowest),
+    "true_range": core.true_range,
+    "wilder": core.wilder_average,
+    "mfi": core.mfi,
+    "adx": lambda high, low, close, period: core.adx(high, low, close, period)[0],
+    "cci": core.cci,
+    "shift": _shift,
+    # Comparisons and boolean logic for rule expressions (signals.rules);
+    # ordered comparisons against NaN (warm-up bars) are False
+    "lt": np.less,
+    "le": np.less_equal,
+    "gt": np.greater,
+    "ge": np.greater_equal,
+    "eq": np.equal,
+    "ne": np.not_equal,
+    "and": np.logical_and,
+    "or": np.logical_or,
+    "not": np.logical_not,
+    "neg": np.negative,
+}
+
+
+def sma_node(src: Node, period: int) -> Node:
+    return ("sma", src, period)
+
+
+def ema_node(src: Node, span: int) -> Node:
+    return ("ema", src, span)
+
+
+def rsi_node(period: int = 14) -> Node:
+    return ("rsi", sma_node(("gain", CLOSE), period), sma_node(("loss", CLOSE), period))
+
+
+def macd_nodes(fast: int = 12, slow: int = 26, signal: int = 9) -> Tuple[Node, Node, Node]:
+    line = ("sub", ema_node(CLOSE, fast), ema_node(CLOSE, slow))
+    signal_line = ema_node(line, signal)
+    return line, signal_line, ("sub", line, signal_line)
+
+
+def bollinger_nodes(period: int = 20, num_std: float = 2.0) -> Tuple[Node, Node, Node]:
+    middle = sma_node(CLOSE, period)
+    width = ("scale", ("std", CLOSE, period), num_std)
+    return ("add", middle, width), middle, ("sub", middle, width)
+
+
+def stochastic_nodes(k_period: int = 14, d_period: int = 3) -> Tuple[Node, Node]:
+    k_percent = ("stoch_k", CLOSE, ("min", LOW, k_period), ("max", HIGH, k_period))
+    return k_percent, sma_node(k_percent, d_period)
+
+
+def williams_r_node(period: int = 14) -> Node:
+    # Same rolling extremes as the Stochastic %K of that period
+    return ("williams_r", CLOSE, ("min", LOW, period), ("max", HIGH, period))
+
+
+def atr_node(period: int = 14) -> Node:
+    return ("wilder", ("true_range", HIGH, LOW, CLOSE), period)
+
+
+_MACD, _MACD_SIGNAL, _MACD_HIST = macd_nodes()
+_BB_UPPER, _BB_MIDDLE, _BB_LOWER = bollinger_nodes()
+_STOCH_K, _STOCH_D = stochastic_nodes()
+
+# Column name -> node, matching calculate_technical_indicators
+COLUMNS: Dict[str, Node] = {
+    'RSI': rsi_node(14),
+    'SMA_20': sma_node(CLOSE, 20),
+    'SMA_50': sma_node(CLOSE, 50),
+    'EMA_12': ema_node(CLOSE, 12),
+    'EMA_26': ema_node(CLOSE, 26),
+    'MACD': _MACD,
+    'MACD_Signal': _MACD_SIGNAL,
+    'MACD_Hist': _MACD_HIST,
+    'BB_Upper': _BB_UPPER,
+    'BB_Middle': _BB_MIDDLE,
+    'BB_Lower': _BB_LOWER,
+    'STOCH_K': _STOCH_K,
+    'STOCH_D': _STOCH_D,
+    'OBV': ("obv", CLOSE, VOLUME),
+    'Volume_SMA': sma_node(VOLUME, 20),
+    'Volume_Ratio': ("div", VOLUME, sma_node(VOLUME, 20)),
+    'ATR': atr_node(14),
+    'Williams_R': williams_r_node(14),
+    'MFI': ("mfi", HIGH, LOW, CLOSE, VOLUME, 14),
+    'ADX': ("adx", HIGH, LOW, CLOSE, 14),
+    'CCI': ("cci", HIGH, LOW, CLOSE, 20),
+}
+
+
+class IndicatorGraph:
+    """Lazily evaluates indicator nodes over OHLCV inputs, memoizing every node
+
+    Inputs are an OHLCV DataFrame or a mapping of field name to array; 2-D
+    (time x symbol) arrays evaluate every symbol in the same pass. `known`
+    seeds the memo with indicator columns computed elsewhere (e.g. from
+    IndicatorCache), keyed by column name, so they are not recomputed. Only
+    columns the configured backend takes from NumPy are seeded; the rest
+    (e.g. TA-Lib's RSI) use other formulas than the graph's nodes.
+    """
+
+    def __init__(self, inputs: Union[pd.DataFrame, Mapping[str, np.ndarray]],
+                 known: Optional[Union[pd.DataFrame, Mapping[str, np.ndarray]]] = None):
+        from indicators.backends import backend_for  # backends builds on this module
+
+        self.inputs = inputs
+        self._values: Dict[Node, np.ndarray] = {}
+        for name, values in ({} if known is None else known).items():
+            if name in COLUMNS and backend_for(name) == "numpy":
+                self._values[COLUMNS[name]] = np.asarray(values, dtype=np.float64)
+
+    def evaluate(self, node: Node) -> np.ndarray:
+        """Value of a node, computing its dependencies first (each only once)"""
+        if node in self._values:
+            return self._values[node]
+
+        op, *args = node
+        if op == "input":
+            if args[0] not in self.inputs:
+                raise ValueError(f"Missing required price data columns: {args[0]}")
+            value = np.asarray(self.inputs[args[0]], dtype=np.float64)
+        else:
+            inputs = [self.evaluate(arg) if isinstance(arg, tuple) else arg for arg in args]
+            value = OPS[op](*inputs)
+        self._values[node] = value
+        return value
+
+    def compute(self, columns: Optional[Iterable[str]] = None) -> Dict[str, np.ndarray]:
+        """Arrays for the requested indicator columns (all columns by default)"""
+        names = list(COLUMNS) if columns is None else list(columns)
+        unknown = [name for name in names if name not in COLUMNS]
+        if unknown:
+            raise ValueError(f"Unknown indicator columns: {', '.join(unknown)}")
+        return {name: self.evaluate(COLUMNS[name]) for name in names}
+
+    @property
+    def evaluated(self) -> int:
+        """Number of distinct nodes computed so far (inputs included)"""
+        return len(self._values)
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by memoized node values"""
+        return sum(np.asarray(value).nbytes for value in self._values.values())
@@ -0,0 +1,92 @@
+"""
+Optional Numba-compiled kernels
+Bar-by-bar versions of the recursive (EMA, Wilder smoothing) and rolling
+extreme (Stochastic) kernels. indicators.core uses them automatically when
+Numba is installed, unless STOCKS_NUMBA=0 is set; otherwise the NumPy
+implementations run. Without Numba these functions still work as plain
+(slow) Python, which keeps the parity check runnable everywhere.
+"""
+
+import os
+
+import numpy as np
+
+# Try to import Numba, fallback to the NumPy kernels if not available
+try:
+    import numba
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+JIT_ENABLED = NUMBA_AVAILABLE and os.environ.get("STOCKS_NUMBA", "1") != "0"
+
+
+def _jit(fn):
+    """Compile with Numba when it is installed, otherwise keep the Python function"""
+    if NUMBA_AVAILABLE:
+        return numba.njit(cache=True, nogil=True)(fn)
+    return fn
+
+
+@_jit
+def _decay_filter(x, decay, init, out):
+    # x and out are (time x columns), init is one starting value per column
+    carry = init.copy()
+    for i in range(x.shape[0]):
+        for j in range(x.shape[1]):
+            carry[j] = x[i, j] + decay * carry[j]
+            out[i, j] = carry[j]
+
+
+@_jit
+def _rolling_extreme(x, period, sign, out):
+    # Monotonic deque of bar indices per column: O(n) whatever the period.
+    # sign=1 tracks the maximum, sign=-1 the minimum; a NaN blanks every
+    # window containing it, like the NumPy and pandas versions.
+    n, m = x.shape
+    queue = np.empty(n, np.int64)
+    for j in range(m):
+        head = 0
+        tail = 0
+        last_nan = -1
+        for i in range(n):
+            value = x[i, j]
+            if value != value:
+                last_nan = i
+            else:
+                while tail > head and sign * x[queue[tail - 1], j] <= sign * value:
+                    tail -= 1
+                queue[tail] = i
+                tail += 1
+            while tail > head and queue[head] <= i - period:
+                head += 1
+            if i >= period - 1 and last_nan <= i - period:
+                out[i, j] = x[queue[head], j]
+
+
+def _columns(x: np.ndarray) -> np.ndarray:
+    """View any array as contiguous (time x columns) float64"""
+    return np.ascontiguousarray(x, dtype=np.float64).reshape(len(x), -1)
+
+
+def decay_filter(x: np.ndarray, decay: float, init=0.0) -> np.ndarray:
+    """y[t] = x[t] + decay * y[t-1] with y[-1] = init, one bar at a time"""
+    values = _columns(x)
+    out = np.empty(values.shape)
+    start = np.array(np.broadcast_to(np.asarray(init, dtype=np.float64), x.shape[1:])).reshape(-1)
+    _decay_filter(values, float(decay), start, out)
+    return out.reshape(x.shape)
+
+
+def rolling_min(x: np.ndarray, period: int) -> np.ndarray:
+    values = _columns(x)
+    out = np.full(values.shape, np.nan)
+    _rolling_extreme(values, int(period), -1.0, out)
+    return out.reshape(x.shape)
+
+
+def rolling_max(x: np.ndarray, period: int) -> np.ndarray:
+    values = _columns(x)
+    out = np.full(values.shape, np.nan)
+    _rolling_extreme(values, int(period), 1.0, out)
+    return out.reshape(x.shape)
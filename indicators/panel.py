@@ -0,0 +1,51 @@
+"""
+Multi-symbol panel indicators
+Computes the standard indicator set for a (time x symbol) matrix per price
+field in one vectorized pass, instead of once per symbol DataFrame.
+"""
+
+from typing import Dict, Iterable, Mapping, Optional
+
+import numpy as np
+import pandas as pd
+
+from indicators.graph import COLUMNS, IndicatorGraph
+
+PANEL_FIELDS = ['Open', 'High', 'Low', 'Close', 'Volume']
+
+
+def build_panel(histories: Mapping[str, pd.DataFrame]) -> Dict[str, pd.DataFrame]:
+    """(time x symbol) matrices per OHLCV field from per-symbol histories
+
+    Dates are the union of all histories; a symbol missing a date gets NaN.
+    """
+    frames = {symbol: df for symbol, df in histories.items() if df is not None and not df.empty}
+    if not frames:
+        return {}
+    index = frames[next(iter(frames))].index
+    for df in frames.values():
+        index = index.union(df.index)
+    fields = [field for field in PANEL_FIELDS if all(field in df.columns for df in frames.values())]
+
+    # Fill preallocated matrices column by column instead of aligning Series
+    matrices = {field: np.full((len(index), len(frames)), np.nan) for field in fields}
+    for j, df in enumerate(frames.values()):
+        rows = index.get_indexer(df.index)
+        for field in fields:
+            matrices[field][rows, j] = df[field].to_numpy(dtype='float64')
+    return {field: pd.DataFrame(matrix, index=index, columns=list(frames)) for field, matrix in matrices.items()}
+
+
+def calculate_panel_indicators(panel: Mapping[str, pd.DataFrame],
+                               columns: Optional[Iterable[str]] = None) -> Dict[str, pd.DataFrame]:
+    """Indicator matrices keyed by the calculate_technical_indicators column names
+
+    `panel` maps 'Close', 'High', 'Low' and 'Volume' to (time x symbol)
+    DataFrames sharing one index and column order; only the fields the
+    requested columns depend on are required.
+    """
+    close = panel['Close']
+    names = list(COLUMNS) if columns is None else list(columns)
+    graph = IndicatorGraph({field: frame.to_numpy(dtype='float64') for field, frame in panel.items()})
+    values = graph.compute(names)
+    return {name: pd.DataFrame(values[name], index=close.index, columns=close.columns) for name in names}
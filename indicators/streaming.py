@@ -0,0 +1,403 @@
+"""
+Streaming indicator state for live updates
+Each indicator keeps rolling sums, EMA numerators/denominators or Wilder
+averages and updates in constant time when a bar is appended, producing the
+same values as the vectorized kernels in indicators.core. States are seeded
+from existing history with `from_history`, which only replays the trailing
+window (EMA and Wilder states are taken from the vectorized recursions).
+"""
+
+import math
+from collections import deque
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from indicators import core
+
+NAN = float("nan")
+
+# Running sums are rebuilt from the window this often to stop rounding drift
+_RESYNC_EVERY = 10_000
+
+
+class RollingStats:
+    """Rolling mean and sample standard deviation over a fixed window"""
+
+    __slots__ = ("period", "window", "center", "total", "total_sq", "nans", "updates")
+
+    def __init__(self, period: int):
+        self.period = period
+        self.window = deque(maxlen=period)
+        self.center = None
+        self.total = 0.0
+        self.total_sq = 0.0
+        self.nans = 0
+        self.updates = 0
+
+    @classmethod
+    def from_history(cls, values, period: int) -> "RollingStats":
+        state = cls(period)
+        for value in np.asarray(values, dtype=np.float64)[-period:]:
+            state.update(value)
+        return state
+
+    def _add(self, value: float, sign: float) -> None:
+        if math.isnan(value):
+            self.nans += 1 if sign > 0 else -1
+        else:
+            shifted = value - self.center
+            self.total += sign * shifted
+            self.total_sq += sign * shifted * shifted
+
+    def update(self, value: float) -> float:
+        value = float(value)
+        if self.center is None and not math.isnan(value):
+            self.center = value
+        if len(self.window) == self.period:
+            self._add(self.window[0], -1.0)
+        self.window.append(value)
+        if self.center is not None:
+            self._add(value, 1.0)
+        elif math.isnan(value):
+            self.nans += 1
+
+        self.updates += 1
+        if self.updates % _RESYNC_EVERY == 0:
+            self._resync()
+        return self.mean
+
+    def _resync(self) -> None:
+        self.total = self.total_sq = 0.0
+        self.nans = 0
+        for value in self.window:
+            self._add(value, 1.0)
+
+    @property
+    def ready(self) -> bool:
+        return len(self.window) == self.period and self.nans == 0
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.period + self.center if self.ready else NAN
+
+    @property
+    def std(self) -> float:
+        if not self.ready or self.period < 2:
+            return NAN
+        squares = self.total_sq - self.total * self.total / self.period
+        return math.sqrt(max(squares, 0.0) / (self.period - 1))
+
+
+class RollingExtreme:
+    """Rolling minimum or maximum with a monotonic deque (amortized O(1))"""
+
+    __slots__ = ("period", "is_max", "candidates", "index", "last_nan")
+
+    def __init__(self, period: int, is_max: bool):
+        self.period = period
+        self.is_max = is_max
+        self.candidates = deque()  # (index, value), values monotonic
+        self.index = -1
+        self.last_nan = -period - 1
+
+    @classmethod
+    def from_history(cls, values, period: int, is_max: bool) -> "RollingExtreme":
+        state = cls(period, is_max)
+        for value in np.asarray(values, dtype=np.float64)[-period:]:
+            state.update(value)
+        return state
+
+    def update(self, value: float) -> float:
+        value = float(value)
+        self.index += 1
+        if math.isnan(value):
+            self.last_nan = self.index
+        else:
+            while self.candidates and (
+                self.candidates[-1][1] <= value if self.is_max else self.candidates[-1][1] >= value
+            ):
+                self.candidates.pop()
+            self.candidates.append((self.index, value))
+        while self.candidates and self.candidates[0][0] <= self.index - self.period:
+            self.candidates.popleft()
+        return self.value
+
+    @property
+    def value(self) -> float:
+        if self.index < self.period - 1 or self.last_nan > self.index - self.period or not self.candidates:
+            return NAN
+        return self.candidates[0][1]
+
+
+class EMA:
+    """Adjusted exponential moving average (pandas ``ewm(span=...).mean()``)"""
+
+    __slots__ = ("decay", "num", "den")
+
+    def __init__(self, span: int):
+        self.decay = 1.0 - 2.0 / (span + 1)
+        self.num = 0.0
+        self.den = 0.0
+
+    @classmethod
+    def from_history(cls, values, span: int) -> "EMA":
+        state = cls(span)
+        x = np.asarray(values, dtype=np.float64)
+        if len(x):
+            valid = ~np.isnan(x)
+            state.num = core.decay_filter(np.where(valid, x, 0.0), state.decay)[-1]
+            state.den = core.decay_filter(valid.astype(np.float64), state.decay)[-1]
+        return state
+
+    def update(self, value: float) -> float:
+        value = float(value)
+        self.num *= self.decay
+        self.den *= self.decay
+        if not math.isnan(value):
+            self.num += value
+            self.den += 1.0
+        return self.value
+
+    @property
+    def value(self) -> float:
+        return self.num / self.den if self.den else NAN
+
+
+class WilderAverage:
+    """Wilder smoothing seeded with the simple mean of the first `period` values"""
+
+    __slots__ = ("period", "seed", "value")
+
+    def __init__(self, period: int):
+        self.period = period
+        self.seed = []
+        self.value = NAN
+
+    @classmethod
+    def from_history(cls, values, period: int) -> "WilderAverage":
+        state = cls(period)
+        x = np.asarray(values, dtype=np.float64)
+        averages = core.wilder_average(x, period)
+        if len(x) and not np.isnan(averages[-1]):
+            state.seed = None
+            state.value = float(averages[-1])
+        else:
+            state.seed = [float(v) for v in x if not np.isnan(v)]
+        return state
+
+    def update(self, value: float) -> float:
+        value = float(value)
+        if self.seed is not None:
+            self.seed.append(value)
+            if len(self.seed) == self.period:
+                self.value = sum(self.seed) / self.period
+                self.seed = None
+        else:
+            self.value = (self.value * (self.period - 1) + value) / self.period
+        return self.value
+
+
+class RSI:
+    """Relative Strength Index from the latest close-to-close changes"""
+
+    __slots__ = ("period", "method", "prev_close", "gain", "loss")
+
+    def __init__(self, period: int = 14, method: str = "sma"):
+        if method not in ("sma", "wilder"):
+            raise ValueError(f"Unknown RSI method: {method}")
+        self.period = period
+        self.method = method
+        self.prev_close = None
+        average = RollingStats if method == "sma" else WilderAverage
+        self.gain = average(period)
+        self.loss = average(period)
+
+    @classmethod
+    def from_history(cls, close, period: int = 14, method: str = "sma") -> "RSI":
+        state = cls(period, method)
+        c = np.asarray(close, dtype=np.float64)
+        if len(c) == 0:
+            return state
+        if method == "wilder":
+            delta = np.diff(c)
+            state.gain = WilderAverage.from_history(np.maximum(delta, 0.0), period)
+            state.loss = WilderAverage.from_history(np.maximum(-delta, 0.0), period)
+            state.prev_close = float(c[-1])
+        else:
+            for value in c[-(period + 1):]:
+                state.update(value)
+        return state
+
+    def update(self, close: float) -> float:
+        close = float(close)
+        if self.prev_close is not None:
+            delta = close - self.prev_close
+            self.gain.update(delta if delta > 0 else (NAN if math.isnan(delta) else 0.0))
+            self.loss.update(-delta if delta < 0 else (NAN if math.isnan(delta) else 0.0))
+        self.prev_close = close
+        return self.value
+
+    @property
+    def value(self) -> float:
+        gain = self.gain.mean if self.method == "sma" else self.gain.value
+        loss = self.loss.mean if self.method == "sma" else self.loss.value
+        if math.isnan(gain) or math.isnan(loss) or (gain == 0 and loss == 0):
+            return NAN
+        if loss == 0:
+            return 100.0
+        return 100 - 100 / (1 + gain / loss)
+
+
+class MACD:
+    """MACD line, signal line and histogram"""
+
+    __slots__ = ("fast", "slow", "signal")
+
+    def __init__(self, fast: int = 12, slow: int = 26, signal: int = 9):
+        self.fast = EMA(fast)
+        self.slow = EMA(slow)
+        self.signal = EMA(signal)
+
+    @classmethod
+    def from_history(cls, close, fast: int = 12, slow: int = 26, signal: int = 9) -> "MACD":
+        state = cls(fast, slow, signal)
+        state.fast = EMA.from_history(close, fast)
+        state.slow = EMA.from_history(close, slow)
+        macd_line = core.ema(close, fast) - core.ema(close, slow)
+        state.signal = EMA.from_history(macd_line, signal)
+        return state
+
+    def update(self, close: float) -> tuple:
+        line = self.fast.update(close) - self.slow.update(close)
+        signal = self.signal.update(line)
+        return line, signal, line - signal
+
+
+class Stochastic:
+    """Stochastic Oscillator %K and %D"""
+
+    __slots__ = ("lowest", "highest", "d")
+
+    def __init__(self, k_period: int = 14, d_period: int = 3):
+        self.lowest = RollingExtreme(k_period, is_max=False)
+        self.highest = RollingExtreme(k_period, is_max=True)
+        self.d = RollingStats(d_period)
+
+    @classmethod
+    def from_history(cls, high, low, close, k_period: int = 14, d_period: int = 3) -> "Stochastic":
+        state = cls(k_period, d_period)
+        state.lowest = RollingExtreme.from_history(low, k_period, is_max=False)
+        state.highest = RollingExtreme.from_history(high, k_period, is_max=True)
+        k_percent, _ = core.stochastic(high, low, close, k_period, d_period)
+        state.d = RollingStats.from_history(k_percent, d_period)
+        return state
+
+    def update(self, high: float, low: float, close: float) -> tuple:
+        lowest = self.lowest.update(low)
+        highest = self.highest.update(high)
+        span = highest - lowest
+        k_percent = 100 * (close - lowest) / span if span else NAN
+        return k_percent, self.d.update(k_percent)
+
+
+class OBV:
+    """On-Balance Volume running total"""
+
+    __slots__ = ("prev_close", "total")
+
+    def __init__(self):
+        self.prev_close = None
+        self.total = 0.0
+
+    @classmethod
+    def from_history(cls, close, volume) -> "OBV":
+        state = cls()
+        if len(close):
+            state.total = float(core.obv(close, volume)[-1])
+            state.prev_close = float(close[-1])
+        return state
+
+    def update(self, close: float, volume: float) -> float:
+        if self.prev_close is not None:
+            if close > self.prev_close:
+                self.total += volume
+            elif close < self.prev_close:
+                self.total -= volume
+        self.prev_close = close
+        return self.total
+
+
+# Columns StreamingIndicators.update returns (indicators.graph names, default parameters)
+STREAMING_COLUMNS = (
+    'RSI', 'SMA_20', 'SMA_50', 'EMA_12', 'EMA_26', 'MACD', 'MACD_Signal', 'MACD_Hist',
+    'BB_Upper', 'BB_Middle', 'BB_Lower', 'STOCH_K', 'STOCH_D', 'OBV', 'Volume_SMA', 'Volume_Ratio',
+)
+
+
+class StreamingIndicators:
+    """The standard indicator set updated one bar at a time
+
+    Produces the columns of the NumPy path of calculate_technical_indicators.
+    """
+
+    __slots__ = ("rsi", "sma_20", "sma_50", "ema_12", "ema_26", "macd", "stochastic", "obv", "volume")
+
+    def __init__(self):
+        self.rsi = RSI(14)
+        self.sma_20 = RollingStats(20)
+        self.sma_50 = RollingStats(50)
+        self.ema_12 = EMA(12)
+        self.ema_26 = EMA(26)
+        self.macd = MACD()
+        self.stochastic = Stochastic()
+        self.obv = OBV()
+        self.volume = RollingStats(20)
+
+    @classmethod
+    def from_history(cls, df: Optional[pd.DataFrame]) -> "StreamingIndicators":
+        """Seed every indicator from an OHLCV DataFrame"""
+        state = cls()
+        if df is None or df.empty:
+            return state
+        close = df['Close'].to_numpy(dtype='float64')
+        high = df['High'].to_numpy(dtype='float64')
+        low = df['Low'].to_numpy(dtype='float64')
+        volume = df['Volume'].to_numpy(dtype='float64')
+        state.rsi = RSI.from_history(close, 14)
+        state.sma_20 = RollingStats.from_history(close, 20)
+        state.sma_50 = RollingStats.from_history(close, 50)
+        state.ema_12 = EMA.from_history(close, 12)
+        state.ema_26 = EMA.from_history(close, 26)
+        state.macd = MACD.from_history(close)
+        state.stochastic = Stochastic.from_history(high, low, close)
+        state.obv = OBV.from_history(close, volume)
+        state.volume = RollingStats.from_history(volume, 20)
+        return state
+
+    def update(self, high: float, low: float, close: float, volume: float) -> Dict[str, float]:
+        """Append one bar and return the latest value of every indicator"""
+        sma_20 = self.sma_20.update(close)
+        bb_width = 2 * self.sma_20.std
+        macd_line, macd_signal, macd_hist = self.macd.update(close)
+        stoch_k, stoch_d = self.stochastic.update(high, low, close)
+        volume_sma = self.volume.update(volume)
+        return {
+            'RSI': self.rsi.update(close),
+            'SMA_20': sma_20,
+            'SMA_50': self.sma_50.update(close),
+            'EMA_12': self.ema_12.update(close),
+            'EMA_26': self.ema_26.update(close),
+            'MACD': macd_line,
+            'MACD_Signal': macd_signal,
+            'MACD_Hist': macd_hist,
+            'BB_Upper': sma_20 + bb_width,
+            'BB_Middle': sma_20,
+            'BB_Lower': sma_20 - bb_width,
+            'STOCH_K': stoch_k,
+            'STOCH_D': stoch_d,
+            'OBV': self.obv.update(close, volume),
+            'Volume_SMA': volume_sma,
+            'Volume_Ratio': volume / volume_sma if volume_sma else NAN,
+        }
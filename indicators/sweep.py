@@ -0,0 +1,89 @@
+"""
+Parameter sweeps over many window lengths at once
+Each sweep builds its cumulative sums once and reads every window length
+from them, returning a (time x window) matrix whose column k is the
+indicator for windows[k]. Wrap it as pd.DataFrame(matrix, index=df.index,
+columns=windows) for heatmaps or to pick the best setting.
+"""
+
+from typing import Iterable, Tuple
+
+import numpy as np
+
+from indicators.core import _as_float, _first_valid
+
+
+def _windows(windows: Iterable[int]) -> np.ndarray:
+    w = np.asarray(list(windows), dtype=np.int64)
+    if w.ndim != 1 or len(w) == 0:
+        raise ValueError("windows must be a non-empty sequence of window lengths")
+    if (w < 1).any():
+        raise ValueError("window lengths must be >= 1")
+    return w
+
+
+def _prefix_sums(x: np.ndarray, power: int = 1) -> Tuple[np.ndarray, np.ndarray]:
+    """Running sums of the centered values (or their squares) and of the valid-value count, starting at 0"""
+    valid = ~np.isnan(x)
+    filled = np.where(valid, x - _first_valid(x), 0.0) ** power
+    return np.concatenate(([0.0], np.cumsum(filled))), np.concatenate(([0], np.cumsum(valid)))
+
+
+def _window_totals(prefix: np.ndarray, windows: np.ndarray) -> np.ndarray:
+    """Sum over the trailing window ending at every bar, for every window length (NaN before it fills)"""
+    # Filled window by window into a (window x time) buffer so every write is
+    # contiguous; the transpose is the (time x window) view callers get
+    out = np.full((len(windows), len(prefix) - 1), np.nan)
+    for row, w in zip(out, windows):
+        np.subtract(prefix[w:], prefix[:-w], out=row[w - 1:])
+    return out.T
+
+
+def sma_sweep(values, windows: Iterable[int]) -> np.ndarray:
+    """Simple moving averages for every window length, matching core.sma column by column"""
+    x = _as_float(values)
+    w = _windows(windows)
+    sums, counts = _prefix_sums(x)
+    totals = _window_totals(sums, w)
+    full = _window_totals(counts.astype(np.float64), w) == w
+    return np.where(full, totals / w + _first_valid(x), np.nan)
+
+
+def rolling_std_sweep(values, windows: Iterable[int], ddof: int = 1) -> np.ndarray:
+    """Rolling standard deviations for every window length (sample by default)
+
+    Uses running sums of squares centered on the first value, which is
+    accurate to about 1e-8 relative for price series; core.rolling_std is
+    exact to rounding for a single window.
+    """
+    x = _as_float(values)
+    w = _windows(windows)
+    sums, counts = _prefix_sums(x)
+    squares, _ = _prefix_sums(x, power=2)
+    totals = _window_totals(sums, w)
+    full = _window_totals(counts.astype(np.float64), w) == w
+    with np.errstate(invalid="ignore", divide="ignore"):
+        variance = (_window_totals(squares, w) - totals * totals / w) / (w - ddof)
+    return np.where(full & (w > ddof), np.sqrt(np.maximum(variance, 0.0)), np.nan)
+
+
+def bollinger_sweep(close, windows: Iterable[int], num_std: float = 2.0) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Upper, middle and lower Bollinger Bands for every window length"""
+    w = _windows(windows)
+    middle = sma_sweep(close, w)
+    width = rolling_std_sweep(close, w) * num_std
+    return middle + width, middle, middle - width
+
+
+def rsi_sweep(close, windows: Iterable[int]) -> np.ndarray:
+    """RSI (simple-mean gains and losses, as core.rsi's default) for every window length"""
+    c = _as_float(close)
+    delta = np.empty(c.shape)
+    delta[:1] = np.nan
+    np.subtract(c[1:], c[:-1], out=delta[1:])
+    gains = np.where(np.isnan(delta), np.nan, np.maximum(delta, 0.0))
+    losses = np.where(np.isnan(delta), np.nan, np.maximum(-delta, 0.0))
+
+    w = _windows(windows)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return 100 - (100 / (1 + sma_sweep(gains, w) / sma_sweep(losses, w)))
@@ -0,0 +1,65 @@
+"""
+Standard indicator set used by the apps' charts and AI analysis
+"""
+
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+from indicators.backends import compute_indicators
+from indicators.graph import COLUMNS
+
+REQUIRED_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Volume']
+
+
+def indicator_values(df: pd.DataFrame, columns: Optional[Iterable[str]] = None,
+                     backend: Optional[str] = None) -> Dict[str, np.ndarray]:
+    """Arrays for the requested indicator columns (all by default), leaving df untouched
+
+    Only the requested columns are computed; the NumPy backend evaluates
+    them through the indicator graph so shared intermediates run once.
+    backend names one of indicators.backends.BACKENDS for every column
+    (default: the STOCKS_INDICATOR_BACKEND configuration). Backends differ
+    in places, e.g. TA-Lib's RSI uses Wilder smoothing and its Bollinger
+    Bands the population standard deviation; see parity_report.
+    """
+    missing = [col for col in REQUIRED_COLUMNS if col not in df.columns]
+    if missing:
+        raise ValueError(f"Missing required price data columns: {', '.join(missing)}")
+
+    names = list(COLUMNS) if columns is None else list(columns)
+    unknown = [name for name in names if name not in COLUMNS]
+    if unknown:
+        raise ValueError(f"Unknown indicator columns: {', '.join(unknown)}")
+
+    return compute_indicators(df, names, backend)
+
+
+def as_indicator_frame(index: pd.Index, values: Dict[str, np.ndarray]) -> pd.DataFrame:
+    """Wrap indicator arrays as a DataFrame on the price index without copying them
+
+    Each array stays its own block, so the frame is a view of the arrays
+    rather than a consolidated copy.
+    """
+    return pd.DataFrame(values, index=index, copy=False)
+
+
+def indicator_frame(df: pd.DataFrame, columns: Optional[Iterable[str]] = None,
+                    backend: Optional[str] = None) -> pd.DataFrame:
+    """Indicator columns as their own frame sharing df's index; df is not modified"""
+    if df is None or df.empty:
+        return pd.DataFrame(index=None if df is None else df.index)
+    return as_indicator_frame(df.index, indicator_values(df, columns, backend))
+
+
+def calculate_technical_indicators(df: pd.DataFrame, columns: Optional[Iterable[str]] = None,
+                                   backend: Optional[str] = None) -> pd.DataFrame:
+    """Copy of an OHLCV DataFrame with the indicator columns added; df is not modified
+
+    See indicator_values for the column selection and backends.
+    """
+    if df is None or df.empty:
+        return df
+
+    return df.assign(**indicator_values(df, columns, backend))
@@ -0,0 +1,33 @@
+"""
+Market data helpers shared by the Streamlit apps
+Keeps Yahoo Finance access and local persistence out of the page scripts
+"""
+
+from market_data.store import OHLCVStore, slice_period
+from market_data.yahoo import fetch_history, fetch_info, fetch_last_prices
+from market_data.providers import (
+    MarketDataProvider,
+    ReplayProvider,
+    YahooProvider,
+    get_provider,
+)
+from market_data.coalesce import CoalescingProvider, SingleFlight
+from market_data.health import HealthMonitor, HealthStatus
+from market_data.cache import HistoryCache
+
+__all__ = [
+    "OHLCVStore",
+    "slice_period",
+    "fetch_history",
+    "fetch_info",
+    "fetch_last_prices",
+    "MarketDataProvider",
+    "ReplayProvider",
+    "YahooProvider",
+    "get_provider",
+    "CoalescingProvider",
+    "SingleFlight",
+    "HealthMonitor",
+    "HealthStatus",
+    "HistoryCache",
+]
@@ -0,0 +1,59 @@
+"""
+In-memory cache of full-range history per symbol
+Each symbol is held once at maximum range; every period ("1d", "1y", ...)
+is answered by slicing that series with iloc, which shares the underlying
+arrays instead of copying them.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+import pandas as pd
+
+from market_data.coalesce import SingleFlight
+from market_data.store import HistoryFetcher, OHLCVStore, slice_period
+
+
+class HistoryCache:
+    """Process-wide LRU of max-range daily series, refreshed after `ttl` seconds"""
+
+    def __init__(self, store: OHLCVStore, fetch: HistoryFetcher, ttl: float = 300, max_symbols: int = 256):
+        self.store = store
+        self.fetch = fetch
+        self.ttl = ttl
+        self.max_symbols = max_symbols
+        self._series = OrderedDict()  # symbol -> (loaded_at, DataFrame)
+        self._lock = threading.Lock()
+        self._flight = SingleFlight()
+
+    def _load(self, symbol: str) -> Optional[pd.DataFrame]:
+        df = self.store.refresh(symbol, self.fetch)
+        if df is None or df.empty:
+            return None
+        with self._lock:
+            self._series[symbol] = (time.monotonic(), df)
+            self._series.move_to_end(symbol)
+            while len(self._series) > self.max_symbols:
+                self._series.popitem(last=False)
+        return df
+
+    def full(self, symbol: str) -> Optional[pd.DataFrame]:
+        """The cached max-range series for a symbol, refreshed if stale"""
+        symbol = symbol.strip().upper()
+        with self._lock:
+            entry = self._series.get(symbol)
+            if entry is not None:
+                self._series.move_to_end(symbol)
+        if entry is not None and time.monotonic() - entry[0] < self.ttl:
+            return entry[1]
+        return self._flight.do(symbol, lambda: self._load(symbol))
+
+    def get(self, symbol: str, period: str = "1y") -> Optional[pd.DataFrame]:
+        """A period window that shares memory with the cached full series"""
+        return slice_period(self.full(symbol), period)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._series.clear()
@@ -0,0 +1,93 @@
+"""
+Request coalescing (single-flight) for upstream market data calls
+Streamlit serves every session from threads of one process, so concurrent
+cache misses for the same key can wait on a single in-flight request.
+"""
+
+import threading
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional
+
+import pandas as pd
+
+from market_data.providers import MarketDataProvider
+
+
+class _Call:
+    """One in-flight request and the outcome shared with its waiters"""
+
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Runs at most one call per key at a time; concurrent callers share its result
+
+    Callers wait at most `timeout` seconds for the call in flight, then make
+    their own call, so one stuck upstream request cannot block every session.
+    """
+
+    def __init__(self, timeout: Optional[float] = 30.0):
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """Call fn, or wait for the identical call already running and return its result"""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+
+        if not leader:
+            if not call.done.wait(self.timeout):
+                return fn()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+    def in_flight(self) -> int:
+        """Number of requests currently running"""
+        with self._lock:
+            return len(self._calls)
+
+
+class CoalescingProvider(MarketDataProvider):
+    """Wraps a provider so identical concurrent requests reach upstream once"""
+
+    def __init__(self, provider: MarketDataProvider):
+        self.provider = provider
+        self.name = provider.name
+        self.flight = SingleFlight()
+
+    def history(self, symbol: str, period: Optional[str] = None, start: Optional[str] = None) -> pd.DataFrame:
+        return self.flight.do(
+            ("history", symbol, period, start),
+            lambda: self.provider.history(symbol, period=period, start=start),
+        )
+
+    def info(self, symbol: str) -> Dict:
+        return self.flight.do(("info", symbol), lambda: self.provider.info(symbol))
+
+    def last_prices(self, symbols: Iterable[str]) -> Dict[str, float]:
+        symbols = tuple(sorted(symbols))
+        return self.flight.do(("last_prices", symbols), lambda: self.provider.last_prices(symbols))
+
+    def check(self) -> bool:
+        return self.flight.do(("check",), self.provider.check)
@@ -0,0 +1,96 @@
+"""
+Process-wide background health monitor for the market data provider
+A daemon thread probes the provider on its own schedule; page renders only
+read the cached status and never wait on the network.
+"""
+
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Optional
+
+from market_data.providers import MarketDataProvider
+
+
+@dataclass(frozen=True)
+class HealthStatus:
+    """Snapshot of the latest probe plus statistics over recent probes"""
+
+    ok: Optional[bool]  # None until the first probe has finished
+    message: str
+    checked_at: Optional[float]
+    latency_ms: Optional[float]
+    avg_latency_ms: Optional[float]
+    error_rate: float
+    probes: int
+
+
+class HealthMonitor:
+    """Probes a provider every `interval` seconds in a background thread"""
+
+    def __init__(self, provider: MarketDataProvider, interval: float = 60, window: int = 20):
+        self.provider = provider
+        self.interval = interval
+        self._results = deque(maxlen=window)  # (ok, latency_ms, error)
+        self._checked_at = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self) -> "HealthMonitor":
+        """Start probing in the background (a no-op if already running)"""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="market-data-health", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self.probe()
+            self._stop.wait(self.interval)
+
+    def probe(self) -> None:
+        """Run one probe now and record its outcome"""
+        started = time.perf_counter()
+        try:
+            ok, error = self.provider.check(), None
+        except Exception as e:
+            ok, error = False, str(e)
+        latency_ms = (time.perf_counter() - started) * 1000
+        with self._lock:
+            self._results.append((ok, latency_ms, error))
+            self._checked_at = time.time()
+
+    def status(self) -> HealthStatus:
+        """Cached status for page renders"""
+        name = self.provider.name
+        with self._lock:
+            results = list(self._results)
+            checked_at = self._checked_at
+
+        if not results:
+            return HealthStatus(None, f"⏳ Checking {name} connection...", None, None, None, 0.0, 0)
+
+        ok, latency_ms, error = results[-1]
+        if ok:
+            message = f"✅ {name} connection successful"
+        elif error:
+            message = f"❌ {name} connection failed: {error}"
+        else:
+            message = f"❌ No data received from {name}"
+
+        failures = sum(1 for result in results if not result[0])
+        return HealthStatus(
+            ok=ok,
+            message=message,
+            checked_at=checked_at,
+            latency_ms=latency_ms,
+            avg_latency_ms=sum(result[1] for result in results) / len(results),
+            error_rate=failures / len(results),
+            probes=len(results),
+        )
@@ -0,0 +1,130 @@
+"""
+Market data providers
+Every app routes history, info and quote requests through a provider so the
+data source can be swapped (live Yahoo Finance, recorded files on disk, or a
+different vendor) without touching the page scripts.
+"""
+
+import json
+import os
+from abc import ABC, abstractmethod
+from typing import Dict, Iterable, Optional
+
+import pandas as pd
+
+from market_data import yahoo
+from market_data.store import DEFAULT_STORE_DIR, OHLCVStore, slice_period
+
+
+class MarketDataProvider(ABC):
+    """Interface the apps use for every market data request"""
+
+    name = "provider"
+
+    @abstractmethod
+    def history(self, symbol: str, period: Optional[str] = None, start: Optional[str] = None) -> pd.DataFrame:
+        """Daily OHLCV bars either for a yfinance period string or from a start date"""
+
+    @abstractmethod
+    def info(self, symbol: str) -> Dict:
+        """Company fundamentals, an empty dict when unavailable"""
+
+    def last_prices(self, symbols: Iterable[str]) -> Dict[str, float]:
+        """Last close for many symbols (providers override this with a batched request)"""
+        prices = {}
+        for symbol in symbols:
+            hist = self.history(symbol, period="5d")
+            if hist is not None and not hist.empty:
+                prices[symbol] = float(hist["Close"].iloc[-1])
+        return prices
+
+    def check(self) -> bool:
+        """True if the provider can currently serve data"""
+        hist = self.history("AAPL", period="5d")
+        return hist is not None and not hist.empty
+
+
+class YahooProvider(MarketDataProvider):
+    """Live data from Yahoo Finance via yfinance"""
+
+    name = "Yahoo Finance"
+
+    def history(self, symbol: str, period: Optional[str] = None, start: Optional[str] = None) -> pd.DataFrame:
+        return yahoo.fetch_history(symbol, period=period, start=start)
+
+    def info(self, symbol: str) -> Dict:
+        return yahoo.fetch_info(symbol)
+
+    def last_prices(self, symbols: Iterable[str]) -> Dict[str, float]:
+        return yahoo.fetch_last_prices(symbols)
+
+
+class ReplayProvider(MarketDataProvider):
+    """Serves recorded OHLCV and info from disk, with no network access
+
+    History files use the OHLCVStore layout, so a store directory filled by
+    a live session can be replayed directly. Info is read from
+    ``<SYMBOL>.info.json`` next to the history file.
+    """
+
+    name = "Replay"
+
+    def __init__(self, root: str = DEFAULT_STORE_DIR):
+        self.store = OHLCVStore(root)
+
+    def info_path(self, symbol: str) -> str:
+        base, _ = os.path.splitext(self.store.path(symbol))
+        return f"{base}.info.json"
+
+    def history(self, symbol: str, period: Optional[str] = None, start: Optional[str] = None) -> pd.DataFrame:
+        hist = self.store.load(symbol)
+        if hist is None:
+            return pd.DataFrame()
+        if start is not None:
+            return hist.iloc[hist.index.searchsorted(pd.Timestamp(start, tz=hist.index.tz)):]
+        return slice_period(hist, period or "max")
+
+    def info(self, symbol: str) -> Dict:
+        try:
+            with open(self.info_path(symbol), encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def check(self) -> bool:
+        return any(name.endswith((".parquet", ".pkl")) for name in os.listdir(self.store.root))
+
+    def record(self, symbols: Iterable[str], source: MarketDataProvider) -> None:
+        """Capture full history and info for symbols from another provider"""
+        for symbol in symbols:
+            symbol = symbol.strip().upper()
+            hist = source.history(symbol, period="max")
+            if hist is not None and not hist.empty:
+                self.store.save(symbol, hist)
+            with open(self.info_path(symbol), "w", encoding="utf-8") as f:
+                json.dump(source.info(symbol), f, default=str)
+
+
+PROVIDERS = {
+    "yahoo": YahooProvider,
+    "replay": ReplayProvider,
+}
+
+
+def get_provider(name: Optional[str] = None, coalesce: bool = True) -> MarketDataProvider:
+    """Provider selected by name or the STOCKS_DATA_PROVIDER environment variable
+
+    By default the provider is wrapped so concurrent identical requests from
+    different sessions share one upstream call.
+    """
+    # Imported here because the coalescing wrapper subclasses MarketDataProvider
+    from market_data.coalesce import CoalescingProvider
+
+    name = (name or os.environ.get("STOCKS_DATA_PROVIDER", "yahoo")).lower()
+    if name not in PROVIDERS:
+        raise ValueError(f"Unknown market data provider: {name}")
+    if name == "replay":
+        provider = ReplayProvider(os.environ.get("STOCKS_REPLAY_DIR", DEFAULT_STORE_DIR))
+    else:
+        provider = PROVIDERS[name]()
+    return CoalescingProvider(provider) if coalesce else provider
@@ -0,0 +1,207 @@
+"""
+Persistent per-symbol OHLCV store with incremental refresh
+Full daily history is kept on disk (Parquet when pyarrow is installed) and
+only the bars after the last stored timestamp are requested from upstream.
+"""
+
+import logging
+import os
+import re
+import tempfile
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+# Try to import pyarrow for Parquet files, fallback to pickle if not available
+try:
+    import pyarrow  # noqa: F401
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STORE_DIR = os.environ.get(
+    "STOCKS_DATA_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".market_data"),
+)
+
+# Calendar offsets for the yfinance period strings longer than a few days
+_PERIOD_OFFSETS = {
+    "1mo": pd.DateOffset(months=1),
+    "3mo": pd.DateOffset(months=3),
+    "6mo": pd.DateOffset(months=6),
+    "1y": pd.DateOffset(years=1),
+    "2y": pd.DateOffset(years=2),
+    "5y": pd.DateOffset(years=5),
+    "10y": pd.DateOffset(years=10),
+}
+
+HistoryFetcher = Callable[..., pd.DataFrame]
+
+
+def slice_period(df: Optional[pd.DataFrame], period: str) -> Optional[pd.DataFrame]:
+    """Return the trailing window of a daily history matching a yfinance period string
+
+    Windows are positional iloc slices, so they share memory with df.
+    """
+    if df is None or df.empty:
+        return df
+    if period == "max":
+        # Still a new frame (sharing the same arrays) so callers never alias the source
+        return df.iloc[:]
+
+    if period.endswith("d") and period[:-1].isdigit():
+        # "1d"/"5d" count trading sessions, which are rows in a daily series
+        return df.iloc[-int(period[:-1]):]
+
+    last = df.index[-1]
+    if period == "ytd":
+        start = last.replace(month=1, day=1, hour=0, minute=0, second=0, microsecond=0)
+        return df.iloc[df.index.searchsorted(start, side="left"):]
+    if period not in _PERIOD_OFFSETS:
+        raise ValueError(f"Unsupported period: {period}")
+
+    start = last - _PERIOD_OFFSETS[period]
+    return df.iloc[df.index.searchsorted(start, side="right"):]
+
+
+def readjusted(stored: pd.DataFrame, fresh: pd.DataFrame, rtol: float = 1e-6) -> bool:
+    """True if fresh bars are on a different split/dividend adjustment than the stored ones"""
+    # Completed sessions both frames have should match exactly
+    common = fresh.index.intersection(stored.index[:-1])
+    if len(common) and not np.allclose(fresh.loc[common, 'Close'], stored.loc[common, 'Close'], rtol=rtol):
+        return True
+    # A split or dividend the stored history does not know about yet
+    for column in ('Stock Splits', 'Dividends'):
+        if column in fresh.columns:
+            known = stored[column].reindex(fresh.index) if column in stored.columns else None
+            new = fresh[column].fillna(0).ne(0)
+            if known is not None:
+                new &= known.fillna(0).eq(0)
+            if new.any():
+                return True
+    return False
+
+
+class OHLCVStore:
+    """Keeps full daily history per symbol on disk and tops it up incrementally"""
+
+    def __init__(self, root: str = DEFAULT_STORE_DIR, max_age: float = 300, lock_timeout: float = 30):
+        self.root = root
+        self.max_age = max_age
+        self.lock_timeout = lock_timeout
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+        os.makedirs(self.root, exist_ok=True)
+
+    def path(self, symbol: str) -> str:
+        """File path for a symbol (symbols like ^GSPC are made filesystem safe)"""
+        name = re.sub(r"[^A-Z0-9._-]", "_", symbol.strip().upper())
+        ext = "parquet" if PARQUET_AVAILABLE else "pkl"
+        return os.path.join(self.root, f"{name}.{ext}")
+
+    def load(self, symbol: str) -> Optional[pd.DataFrame]:
+        """Read the stored history for a symbol, or None if nothing is stored"""
+        path = self.path(symbol)
+        if not os.path.exists(path):
+            return None
+        try:
+            if PARQUET_AVAILABLE:
+                return pd.read_parquet(path)
+            return pd.read_pickle(path)
+        except Exception as e:
+            logger.warning("Discarding unreadable history file %s: %s", path, e)
+            return None
+
+    def save(self, symbol: str, df: pd.DataFrame) -> None:
+        """Write history atomically so concurrent sessions never read a partial file"""
+        path = self.path(symbol)
+        # A temp file per call: sessions are threads of one process and may save the same symbol at once
+        fd, tmp_path = tempfile.mkstemp(dir=self.root, prefix=os.path.basename(path) + ".", suffix=".tmp")
+        os.close(fd)
+        try:
+            if PARQUET_AVAILABLE:
+                df.to_parquet(tmp_path)
+            else:
+                df.to_pickle(tmp_path)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+
+    def is_fresh(self, symbol: str) -> bool:
+        """True if the stored file was refreshed less than max_age seconds ago"""
+        try:
+            return time.time() - os.path.getmtime(self.path(symbol)) < self.max_age
+        except OSError:
+            return False
+
+    def refresh(self, symbol: str, fetch: HistoryFetcher) -> Optional[pd.DataFrame]:
+        """Bring the stored history up to date and return the full series
+
+        The first call downloads the whole history; later calls only request
+        bars from the session before the last stored one onwards (the last bar
+        may have been stored while the session was still open). Upstream
+        prices are split and dividend adjusted, so when the overlapping bar
+        no longer matches or a new split or dividend appears, the whole
+        history is downloaded again instead of mixing adjustment bases.
+        Concurrent refreshes of a symbol (screener threads, sessions) run one
+        at a time, so the later ones are served from the file just written.
+        """
+        symbol = symbol.strip().upper()
+        # One refresh per symbol at a time; the others then find the fresh file
+        # (a refresh stuck upstream only holds them up for lock_timeout seconds)
+        lock = self._symbol_lock(symbol)
+        locked = lock.acquire(timeout=self.lock_timeout)
+        try:
+            return self._refresh(symbol, fetch)
+        finally:
+            if locked:
+                lock.release()
+
+    def _symbol_lock(self, symbol: str) -> threading.Lock:
+        with self._locks_guard:
+            return self._locks.setdefault(symbol, threading.Lock())
+
+    def _refresh(self, symbol: str, fetch: HistoryFetcher) -> Optional[pd.DataFrame]:
+        stored = self.load(symbol)
+
+        if stored is not None and not stored.empty and self.is_fresh(symbol):
+            return stored
+
+        try:
+            if stored is None or stored.empty:
+                fresh = fetch(symbol, period="max")
+                if fresh is None or fresh.empty:
+                    return None
+                combined = fresh
+            else:
+                # Overlap one completed session so a re-adjusted history can be detected
+                since = stored.index[-2] if len(stored) > 1 else stored.index[-1]
+                fresh = fetch(symbol, start=since.strftime("%Y-%m-%d"))
+                if fresh is None or fresh.empty:
+                    combined = stored
+                elif readjusted(stored, fresh):
+                    logger.info("Adjusted prices for %s changed, downloading the full history", symbol)
+                    combined = fetch(symbol, period="max")
+                    if combined is None or combined.empty:
+                        return stored
+                else:
+                    combined = pd.concat([stored.loc[stored.index < fresh.index[0]], fresh])
+                    combined = combined[~combined.index.duplicated(keep="last")]
+        except Exception as e:
+            if stored is None or stored.empty:
+                raise
+            logger.warning("Serving stored history for %s, refresh failed: %s", symbol, e)
+            return stored
+
+        self.save(symbol, combined)
+        return combined
+
+    def get_history(self, symbol: str, period: str, fetch: HistoryFetcher) -> Optional[pd.DataFrame]:
+        """Refresh a symbol and return the window for a yfinance period string"""
+        return slice_period(self.refresh(symbol, fetch), period)
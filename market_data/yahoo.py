@@ -0,0 +1,43 @@
+"""
+Thin Yahoo Finance wrappers used by the market data layer
+"""
+
+from typing import Dict, Iterable, Optional
+
+import pandas as pd
+import yfinance as yf
+
+
+def fetch_history(symbol: str, period: Optional[str] = None, start: Optional[str] = None) -> pd.DataFrame:
+    """Download daily OHLCV bars either for a period or from a start date"""
+    stock = yf.Ticker(symbol)
+    if start is not None:
+        return stock.history(start=start, progress=False)
+    return stock.history(period=period or "max", progress=False)
+
+
+def fetch_last_prices(symbols: Iterable[str], period: str = "5d") -> Dict[str, float]:
+    """Last closing price for many symbols with a single multi-ticker download"""
+    tickers = sorted({s.strip().upper() for s in symbols if s and s.strip()})
+    if not tickers:
+        return {}
+
+    data = yf.download(tickers, period=period, group_by="column", threads=True, progress=False)
+    if data is None or data.empty:
+        return {}
+
+    close = data["Close"]
+    if isinstance(close, pd.Series):
+        # A single ticker comes back with flat columns
+        close = close.to_frame(tickers[0])
+
+    last = close.ffill().iloc[-1]
+    return {symbol: float(price) for symbol, price in last.items() if pd.notna(price)}
+
+
+def fetch_info(symbol: str) -> Dict:
+    """Company fundamentals (market cap, P/E, dividend yield, ...)"""
+    info = yf.Ticker(symbol).info
+    if not info or len(info) < 5:  # Basic validation
+        return {}
+    return info
@@ -0,0 +1,15 @@
+"""
+Multi-symbol screening for the Streamlit apps
+Loads a universe of tickers in parallel and evaluates the signal rules on
+each, streaming rows back as they are ready
+"""
+
+from screener.scan import REPORT_COLUMNS, SCREEN_RULES, ScanProgress, scan_universe, screen_symbols
+
+__all__ = [
+    "REPORT_COLUMNS",
+    "SCREEN_RULES",
+    "ScanProgress",
+    "scan_universe",
+    "screen_symbols",
+]
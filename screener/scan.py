@@ -0,0 +1,140 @@
+"""
+Parallel universe screener
+Scans hundreds to thousands of symbols with the AI analysis rules: histories
+are loaded on a bounded thread pool (network and disk bound), and indicators
+and signals are computed in chunks on a process pool (CPU bound). Progress
+and rows are yielded as chunks complete, so callers can show partial
+results while the scan is still running.
+"""
+
+from concurrent.futures import FIRST_COMPLETED, Executor, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from indicators.graph import IndicatorGraph
+from signals.engine import SIGNAL_RULES
+from signals.rules import compile_rule, evaluate_rules
+
+# Default screen: RSI extremes, SMA-stack trends and volume spikes
+SCREEN_RULES = {name: SIGNAL_RULES[name] for name in
+                ('rsi_oversold', 'rsi_overbought', 'strong_uptrend', 'strong_downtrend', 'high_volume')}
+
+# Indicator values reported for every symbol next to the rule columns
+REPORT_COLUMNS = ['RSI', 'SMA_20', 'SMA_50', 'Volume_Ratio']
+
+PRICE_FIELDS = ('Open', 'High', 'Low', 'Close', 'Volume')
+
+Prices = Dict[str, np.ndarray]
+
+
+@dataclass
+class ScanProgress:
+    """Running state of a scan; `rows` grows as chunks complete"""
+
+    total: int
+    loaded: int = 0
+    rows: List[Dict] = field(default_factory=list)
+    failed: Dict[str, str] = field(default_factory=dict)  # symbol -> reason
+
+    @property
+    def done(self) -> int:
+        return len(self.rows) + len(self.failed)
+
+    def frame(self) -> pd.DataFrame:
+        """Rows so far, strongest matches first"""
+        df = pd.DataFrame(self.rows)
+        if df.empty:
+            return df
+        return df.sort_values(['matches', 'symbol'], ascending=[False, True], ignore_index=True)
+
+
+def _prices(df: pd.DataFrame) -> Prices:
+    """Plain arrays for the worker processes (cheaper to pickle than a frame)"""
+    prices = {name: df[name].to_numpy(dtype=np.float64) for name in PRICE_FIELDS if name in df.columns}
+    prices['date'] = np.asarray(df.index[-1:])
+    return prices
+
+
+def screen_symbols(chunk: List[Tuple[str, Prices]], rules: Mapping[str, str]) -> Tuple[List[Dict], Dict[str, str]]:
+    """Last-bar indicator values and rule matches for a chunk of symbols (runs in a worker process)"""
+    rows, failed = [], {}
+    for symbol, prices in chunk:
+        try:
+            close = prices['Close']
+            graph = IndicatorGraph(prices)
+            values = graph.compute(REPORT_COLUMNS)
+            matches = {name: bool(fired[-1]) for name, fired in evaluate_rules(graph, rules).items()}
+            row = {
+                'symbol': symbol,
+                'date': pd.Timestamp(prices['date'][0]),
+                'close': float(close[-1]),
+                'change_pct': float(close[-1] / close[-2] - 1) * 100 if len(close) > 1 else np.nan,
+            }
+            row.update({name: float(values[name][-1]) for name in REPORT_COLUMNS})
+            row.update(matches)
+            row['matches'] = sum(matches.values())
+            rows.append(row)
+        except Exception as e:
+            failed[symbol] = str(e)
+    return rows, failed
+
+
+def scan_universe(symbols: Iterable[str], load: Callable[[str], Optional[pd.DataFrame]],
+                  rules: Optional[Mapping[str, str]] = None, max_workers: int = 16,
+                  workers: Optional[Executor] = None, chunk_size: int = 50) -> Iterator[ScanProgress]:
+    """Screen every symbol, yielding the progress each time a load or a chunk finishes
+
+    `rules` maps column names to rule expressions (signals.rules).
+    `load(symbol)` returns the symbol's price history and runs on at most
+    `max_workers` threads. Loaded symbols are sent in chunks of `chunk_size`
+    to `workers` (a process pool created for the scan if not given).
+    Closing the generator early cancels the loads that have not started.
+    """
+    symbols = list(dict.fromkeys(s.strip().upper() for s in symbols if s.strip()))
+    rules = dict(SCREEN_RULES if rules is None else rules)
+    for expression in rules.values():
+        compile_rule(expression)  # invalid rules fail here, not in every worker
+
+    progress = ScanProgress(total=len(symbols))
+    own_workers = workers is None
+    workers = ProcessPoolExecutor() if own_workers else workers
+    loaders = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="screener-load")
+    loading = {loaders.submit(load, symbol): symbol for symbol in symbols}
+    computing = set()
+    chunk = []
+
+    try:
+        while loading or computing or chunk:
+            if chunk and (len(chunk) >= chunk_size or not loading):
+                computing.add(workers.submit(screen_symbols, chunk, rules))
+                chunk = []
+            done, _ = wait(set(loading) | computing, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future in computing:
+                    computing.discard(future)
+                    rows, failed = future.result()
+                    progress.rows.extend(rows)
+                    progress.failed.update(failed)
+                    continue
+
+                symbol = loading.pop(future)
+                progress.loaded += 1
+                try:
+                    df = future.result()
+                except Exception as e:
+                    progress.failed[symbol] = str(e)
+                    continue
+                if df is None or df.empty or 'Close' not in df.columns:
+                    progress.failed[symbol] = "no data"
+                else:
+                    chunk.append((symbol, _prices(df)))
+            yield progress
+    finally:
+        for future in loading:
+            future.cancel()
+        loaders.shutdown(wait=False)
+        if own_workers:
+            workers.shutdown(wait=False)
@@ -0,0 +1,28 @@
+"""
+Trading signals shared by the Streamlit apps
+Rules are evaluated over the full price history as boolean arrays; the AI
+analysis text describes the last bar
+"""
+
+from signals.rules import RuleError, compile_rule, evaluate_panel_rules, evaluate_rules
+from signals.engine import (
+    SIGNAL_DIRECTION,
+    SIGNAL_INPUTS,
+    SIGNAL_RULES,
+    signal_arrays,
+    signal_frame,
+    signal_stats,
+)
+
+__all__ = [
+    "RuleError",
+    "SIGNAL_DIRECTION",
+    "SIGNAL_INPUTS",
+    "SIGNAL_RULES",
+    "compile_rule",
+    "evaluate_panel_rules",
+    "evaluate_rules",
+    "signal_arrays",
+    "signal_frame",
+    "signal_stats",
+]
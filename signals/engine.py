@@ -0,0 +1,122 @@
+"""
+Vectorized signal engine
+Evaluates the AI analysis rules (RSI thresholds, SMA stack, MACD cross,
+Bollinger breach, volume ratio, 5-day trend), written as rule expressions,
+on every bar at once, so the same rules that produce today's signal list can
+be charted over the whole history and scored by what the price did next.
+"""
+
+from typing import Dict, Mapping, Optional
+
+import numpy as np
+import pandas as pd
+
+from signals.rules import evaluate_rules
+
+# Thresholds shared by every app's AI analysis
+RSI_OVERBOUGHT = 70
+RSI_OVERSOLD = 30
+HIGH_VOLUME_RATIO = 1.5
+LOW_VOLUME_RATIO = 0.5
+TREND_DAYS = 5
+
+# Signal name -> rule expression (see signals.rules), in the order the analysis reports them
+SIGNAL_RULES = {
+    'rsi_overbought': f'RSI > {RSI_OVERBOUGHT}',
+    'rsi_oversold': f'RSI < {RSI_OVERSOLD}',
+    'rsi_neutral': f'{RSI_OVERSOLD} <= RSI <= {RSI_OVERBOUGHT}',
+    'strong_uptrend': 'Close > SMA_20 and SMA_20 > SMA_50',
+    'strong_downtrend': 'Close < SMA_20 and SMA_20 < SMA_50',
+    'trend_reversal': 'Close > SMA_20 and SMA_20 < SMA_50',
+    'macd_bullish': 'MACD > MACD_Signal',
+    'macd_bearish': 'MACD <= MACD_Signal',
+    'above_upper_band': 'Close > BB_Upper',
+    'below_lower_band': 'Close < BB_Lower',
+    'within_bands': 'BB_Lower <= Close <= BB_Upper',
+    'high_volume': f'Volume_Ratio > {HIGH_VOLUME_RATIO}',
+    'low_volume': f'Volume_Ratio < {LOW_VOLUME_RATIO}',
+    # Close against the close TREND_DAYS-1 bars earlier (the first bar of the last TREND_DAYS)
+    'uptrend_5d': f'Close > PREV(Close, {TREND_DAYS - 1})',
+    'downtrend_5d': f'Close <= PREV(Close, {TREND_DAYS - 1})',
+}
+
+# Signal name -> indicator columns its rule reads; signals are only evaluated
+# when the app computed those columns
+SIGNAL_INPUTS = {
+    'rsi_overbought': ('RSI',),
+    'rsi_oversold': ('RSI',),
+    'rsi_neutral': ('RSI',),
+    'strong_uptrend': ('SMA_20', 'SMA_50'),
+    'strong_downtrend': ('SMA_20', 'SMA_50'),
+    'trend_reversal': ('SMA_20', 'SMA_50'),
+    'macd_bullish': ('MACD', 'MACD_Signal'),
+    'macd_bearish': ('MACD', 'MACD_Signal'),
+    'above_upper_band': ('BB_Upper', 'BB_Lower'),
+    'below_lower_band': ('BB_Upper', 'BB_Lower'),
+    'within_bands': ('BB_Upper', 'BB_Lower'),
+    'high_volume': ('Volume_Ratio',),
+    'low_volume': ('Volume_Ratio',),
+    'uptrend_5d': (),
+    'downtrend_5d': (),
+}
+
+# Expected price direction after each signal (True = up); neutral signals are absent
+SIGNAL_DIRECTION = {
+    'rsi_overbought': False,
+    'rsi_oversold': True,
+    'strong_uptrend': True,
+    'strong_downtrend': False,
+    'trend_reversal': True,
+    'macd_bullish': True,
+    'macd_bearish': False,
+    'above_upper_band': False,
+    'below_lower_band': True,
+    'uptrend_5d': True,
+    'downtrend_5d': False,
+}
+
+
+def signal_arrays(close, indicators: Mapping[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """Boolean array per signal over the full history
+
+    Signals whose indicator columns are missing from `indicators` are left
+    out; a signal is False wherever one of its inputs is NaN (warm-up bars).
+    """
+    rules = {name: SIGNAL_RULES[name] for name, columns in SIGNAL_INPUTS.items()
+             if all(column in indicators for column in columns)}
+    return evaluate_rules({'Close': close}, rules, known=indicators)
+
+
+def signal_frame(df: pd.DataFrame, indicators: pd.DataFrame) -> pd.DataFrame:
+    """Boolean signal columns on the price index, from the price frame and its indicator frame"""
+    values = {name: indicators[name].to_numpy() for name in indicators.columns}
+    return pd.DataFrame(signal_arrays(df['Close'].to_numpy(), values), index=df.index)
+
+
+def signal_stats(signals: pd.DataFrame, close: pd.Series, horizon: int = TREND_DAYS,
+                 direction: Optional[Mapping[str, bool]] = None) -> pd.DataFrame:
+    """How often each signal fired and what the price did over the next `horizon` bars
+
+    hit_rate is the share of firings followed by a move in the signal's
+    direction (up for bullish signals, down for bearish ones); neutral
+    signals have no hit rate.
+    """
+    direction = SIGNAL_DIRECTION if direction is None else direction
+    forward = close.shift(-horizon).to_numpy() / close.to_numpy() - 1
+    scored = ~np.isnan(forward)
+    rows = []
+    for name in signals.columns:
+        fired = signals[name].to_numpy() & scored
+        moves = forward[fired]
+        hit_rate = np.nan
+        if name in direction and len(moves):
+            hit_rate = float(np.mean(moves > 0) if direction[name] else np.mean(moves < 0))
+        rows.append({
+            'signal': name,
+            'fired': int(signals[name].sum()),
+            'last_fired': signals.index[signals[name].to_numpy()][-1] if signals[name].any() else None,
+            'avg_forward_return': float(moves.mean()) if len(moves) else np.nan,
+            'hit_rate': hit_rate,
+        })
+    return pd.DataFrame(rows, columns=['signal', 'fired', 'last_fired', 'avg_forward_return', 'hit_rate'])
+
@@ -0,0 +1,218 @@
+"""
+Rule expressions
+A small language for signal rules such as "RSI(14) < 30 and Close > SMA(50)".
+Each rule is parsed once into indicator graph nodes; rules evaluated
+together share one IndicatorGraph, so a sub-expression that appears in many
+rules (SMA(50), Close > SMA(200), ...) is computed once per call, and on a
+(time x symbol) panel once for every symbol at the same time.
+
+Syntax: comparisons (<, <=, >, >=, ==, !=, chained as in Python), and/or/not,
++ - * / and numbers; price fields Open, High, Low, Close, Volume; indicator
+column names (RSI, SMA_20, MACD_Signal, BB_Upper, Volume_Ratio, ...); and the
+functions in FUNCTIONS plus CROSSES_ABOVE(a, b) / CROSSES_BELOW(a, b).
+"""
+
+import ast
+from functools import lru_cache
+from typing import Dict, Iterable, Mapping, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from indicators.graph import (
+    CLOSE, COLUMNS, HIGH, LOW, OPEN, VOLUME, IndicatorGraph, Node,
+    atr_node, bollinger_nodes, ema_node, macd_nodes, rsi_node, sma_node,
+    stochastic_nodes, williams_r_node,
+)
+
+Rules = Union[Mapping[str, str], Iterable[str]]
+
+PRICES = {'Open': OPEN, 'High': HIGH, 'Low': LOW, 'Close': CLOSE, 'Volume': VOLUME}
+
+# Function name -> (takes a leading series argument, parameter defaults, node builder).
+# Series functions default to Close: SMA(50) is SMA(Close, 50). Integer defaults
+# mark window lengths, which must be whole numbers.
+FUNCTIONS = {
+    'SMA': (True, (20,), sma_node),
+    'EMA': (True, (20,), ema_node),
+    'STD': (True, (20,), lambda src, period: ("std", src, period)),
+    'HIGHEST': (True, (20,), lambda src, period: ("max", src, period)),
+    'LOWEST': (True, (20,), lambda src, period: ("min", src, period)),
+    'PREV': (True, (1,), lambda src, periods: ("shift", src, periods)),
+    'RSI': (False, (14,), rsi_node),
+    'MACD': (False, (12, 26, 9), lambda *args: macd_nodes(*args)[0]),
+    'MACD_SIGNAL': (False, (12, 26, 9), lambda *args: macd_nodes(*args)[1]),
+    'MACD_HIST': (False, (12, 26, 9), lambda *args: macd_nodes(*args)[2]),
+    'BB_UPPER': (False, (20, 2.0), lambda *args: bollinger_nodes(*args)[0]),
+    'BB_MIDDLE': (False, (20, 2.0), lambda *args: bollinger_nodes(*args)[1]),
+    'BB_LOWER': (False, (20, 2.0), lambda *args: bollinger_nodes(*args)[2]),
+    'STOCH_K': (False, (14, 3), lambda *args: stochastic_nodes(*args)[0]),
+    'STOCH_D': (False, (14, 3), lambda *args: stochastic_nodes(*args)[1]),
+    'WILLIAMS_R': (False, (14,), williams_r_node),
+    'ATR': (False, (14,), atr_node),
+    'MFI': (False, (14,), lambda period: ("mfi", HIGH, LOW, CLOSE, VOLUME, period)),
+    'ADX': (False, (14,), lambda period: ("adx", HIGH, LOW, CLOSE, period)),
+    'CCI': (False, (20,), lambda period: ("cci", HIGH, LOW, CLOSE, period)),
+    'OBV': (False, (), lambda: COLUMNS['OBV']),
+    'VOLUME_RATIO': (False, (20,), lambda period: ("div", VOLUME, sma_node(VOLUME, period))),
+}
+
+_COMPARISONS = {ast.Lt: "lt", ast.LtE: "le", ast.Gt: "gt", ast.GtE: "ge", ast.Eq: "eq", ast.NotEq: "ne"}
+_ARITHMETIC = {ast.Add: "add", ast.Sub: "sub", ast.Mult: "scale", ast.Div: "div"}
+_FOLD = {"add": lambda a, b: a + b, "sub": lambda a, b: a - b,
+         "scale": lambda a, b: a * b, "div": lambda a, b: a / b}
+
+# Compiled values are (node or number, kind) with kind "number", "series" or "bool"
+Compiled = Tuple[Union[Node, float], str]
+
+
+class RuleError(ValueError):
+    """Rule expression that cannot be parsed or compiled"""
+
+
+def _prev(value: Compiled) -> Union[Node, float]:
+    node, kind = value
+    return node if kind == "number" else ("shift", node, 1)
+
+
+def _call(node: ast.Call) -> Compiled:
+    name = node.func.id if isinstance(node.func, ast.Name) else None
+    if name not in FUNCTIONS and name not in ('CROSSES_ABOVE', 'CROSSES_BELOW'):
+        raise RuleError(f"Unknown function: {name or type(node.func).__name__}")
+    if node.keywords:
+        raise RuleError(f"{name}() takes positional arguments only")
+    args = [_compile(arg) for arg in node.args]
+
+    if name in ('CROSSES_ABOVE', 'CROSSES_BELOW'):
+        if len(args) != 2 or any(kind == "bool" for _, kind in args) or all(kind == "number" for _, kind in args):
+            raise RuleError(f"{name}() takes two series (or a series and a number)")
+        (a, _), (b, _) = args
+        now, before = ("gt", "le") if name == 'CROSSES_ABOVE' else ("lt", "ge")
+        return ("and", (now, a, b), (before, _prev(args[0]), _prev(args[1]))), "bool"
+
+    takes_source, defaults, builder = FUNCTIONS[name]
+
+    source = []
+    if takes_source:
+        source = [CLOSE]
+        if args and args[0][1] == "series":
+            source = [args.pop(0)[0]]
+    if any(kind != "number" for _, kind in args) or len(args) > len(defaults):
+        raise RuleError(f"{name}() takes {'an optional series and ' if takes_source else ''}"
+                        f"up to {len(defaults)} number(s)")
+
+    params = [value for value, _ in args] + list(defaults[len(args):])
+    for value, default in zip(params, defaults):
+        if value <= 0 or (isinstance(default, int) and value != int(value)):
+            raise RuleError(f"{name}() parameters must be positive{' whole numbers' if isinstance(default, int) else ''}")
+    params = [int(value) if isinstance(default, int) else float(value) for value, default in zip(params, defaults)]
+    return builder(*source, *params), "series"
+
+
+def _compile(node: ast.AST) -> Compiled:
+    if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)) and not isinstance(node.value, bool):
+        return float(node.value), "number"
+    if isinstance(node, ast.Constant):
+        raise RuleError(f"Unsupported value: {node.value!r}")
+
+    if isinstance(node, ast.Name):
+        if node.id in PRICES:
+            return PRICES[node.id], "series"
+        if node.id in COLUMNS:
+            return COLUMNS[node.id], "series"
+        raise RuleError(f"Unknown name: {node.id}")
+
+    if isinstance(node, ast.Call):
+        return _call(node)
+
+    if isinstance(node, ast.UnaryOp):
+        value, kind = _compile(node.operand)
+        if isinstance(node.op, ast.Not):
+            if kind != "bool":
+                raise RuleError("'not' needs a condition")
+            return ("not", value), "bool"
+        if isinstance(node.op, (ast.USub, ast.UAdd)) and kind != "bool":
+            if isinstance(node.op, ast.UAdd):
+                return value, kind
+            return (-value, kind) if kind == "number" else (("neg", value), kind)
+
+    if isinstance(node, ast.BinOp) and type(node.op) in _ARITHMETIC:
+        (left, left_kind), (right, right_kind) = _compile(node.left), _compile(node.right)
+        if "bool" in (left_kind, right_kind):
+            raise RuleError("Arithmetic needs numbers or series, not conditions")
+        op = _ARITHMETIC[type(node.op)]
+        if left_kind == right_kind == "number":
+            try:
+                return _FOLD[op](left, right), "number"
+            except ZeroDivisionError:
+                raise RuleError("Division by zero") from None
+        return (op, left, right), "series"
+
+    if isinstance(node, ast.Compare):
+        operands = [_compile(operand) for operand in [node.left] + node.comparators]
+        if any(kind == "bool" for _, kind in operands):
+            raise RuleError("Comparisons need numbers or series, not conditions")
+        result = None
+        for op, (left, left_kind), (right, right_kind) in zip(node.ops, operands, operands[1:]):
+            if type(op) not in _COMPARISONS:
+                raise RuleError(f"Unsupported comparison: {type(op).__name__}")
+            if left_kind == right_kind == "number":
+                raise RuleError("Comparison between two numbers")
+            test = (_COMPARISONS[type(op)], left, right)
+            result = test if result is None else ("and", result, test)
+        return result, "bool"
+
+    if isinstance(node, ast.BoolOp):
+        values = [_compile(value) for value in node.values]
+        if any(kind != "bool" for _, kind in values):
+            raise RuleError("'and'/'or' need conditions on both sides")
+        op = "and" if isinstance(node.op, ast.And) else "or"
+        result = values[0][0]
+        for value, _ in values[1:]:
+            result = (op, result, value)
+        return result, "bool"
+
+    raise RuleError(f"Unsupported syntax: {type(node).__name__}")
+
+
+@lru_cache(maxsize=4096)
+def compile_rule(expression: str) -> Node:
+    """Graph node for a rule expression; raises RuleError if it is not a valid condition"""
+    try:
+        tree = ast.parse(expression.strip(), mode="eval")
+    except SyntaxError as e:
+        raise RuleError(f"Invalid rule syntax: {e.msg}") from None
+    node, kind = _compile(tree.body)
+    if kind != "bool":
+        raise RuleError("A rule must be a condition (a comparison, or conditions joined by and/or)")
+    return node
+
+
+def _named(rules: Rules) -> Dict[str, str]:
+    return dict(rules) if isinstance(rules, Mapping) else {rule: rule for rule in rules}
+
+
+def evaluate_rules(inputs: Union[pd.DataFrame, Mapping[str, np.ndarray], IndicatorGraph], rules: Rules,
+                   known: Optional[Union[pd.DataFrame, Mapping[str, np.ndarray]]] = None) -> Dict[str, np.ndarray]:
+    """Boolean array per rule over the full history
+
+    `rules` maps names to expressions (a plain list of expressions is named
+    by the expressions themselves). Inputs are an OHLCV frame or a mapping of
+    field arrays, 2-D for a (time x symbol) panel; `known` passes indicator
+    columns already computed (e.g. from IndicatorCache) by column name; only
+    those the configured backend takes from NumPy are used, so a rule means
+    the same formula whichever backend filled the indicator frame.
+    Every node shared between rules is evaluated once; pass an IndicatorGraph
+    as `inputs` to also share nodes across calls (parameter searches).
+    """
+    graph = inputs if isinstance(inputs, IndicatorGraph) else IndicatorGraph(inputs, known)
+    with np.errstate(invalid="ignore"):
+        return {name: graph.evaluate(compile_rule(expression)) for name, expression in _named(rules).items()}
+
+
+def evaluate_panel_rules(panel: Mapping[str, pd.DataFrame], rules: Rules) -> Dict[str, pd.DataFrame]:
+    """Rules over a panel from indicators.build_panel, as (time x symbol) boolean frames"""
+    reference = next(iter(panel.values()))
+    values = evaluate_rules({field: frame.to_numpy() for field, frame in panel.items()}, rules)
+    return {name: pd.DataFrame(matrix, index=reference.index, columns=reference.columns)
+            for name, matrix in values.items()}